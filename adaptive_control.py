@@ -0,0 +1,185 @@
+"""
+Contrôle adaptatif du débit (AIMD): taille des lots, pauses et concurrence par compte et par endpoint
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Issue d'une requête du point de vue du contrôleur
+OUTCOME_OK = 'ok'
+OUTCOME_SLOW = 'slow'
+OUTCOME_ERROR = 'error'
+OUTCOME_THROTTLED = 'throttled'
+
+class AimdValue:
+    """Valeur réglée en AIMD: augmentation additive, diminution multiplicative, bornée"""
+    
+    def __init__(self, value: float, minimum: float, maximum: float, step: float, factor: float = 0.5):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.step = step
+        self.factor = factor
+        self.value = min(maximum, max(minimum, value))
+    
+    def increase(self):
+        """Augmentation additive (après une requête saine)"""
+        self.value = min(self.maximum, self.value + self.step)
+    
+    def decrease(self):
+        """Diminution multiplicative (après un signal de surcharge)"""
+        self.value = max(self.minimum, self.value * self.factor)
+
+class EndpointState:
+    """État du contrôleur pour un endpoint: taille de lot, pause et statistiques récentes"""
+    
+    def __init__(self, settings: Dict):
+        self.settings = settings
+        self.batch = None
+        self.delay = None
+        self.latency = None
+        self.counts = {OUTCOME_OK: 0, OUTCOME_SLOW: 0, OUTCOME_ERROR: 0, OUTCOME_THROTTLED: 0}
+    
+    def get_batch(self, maximum: int) -> AimdValue:
+        """Taille de lot de l'endpoint, initialisée au maximum autorisé par l'API"""
+        if self.batch is None or self.batch.maximum != maximum:
+            self.batch = AimdValue(maximum, self.settings['min_batch_size'], maximum,
+                                   self.settings['batch_increase_step'])
+        return self.batch
+    
+    def get_delay(self, base: float, minimum: float) -> float:
+        """Pause courante de l'endpoint, initialisée à la pause de base"""
+        if self.delay is None:
+            self.delay = base
+        self.delay = max(minimum, self.delay)
+        return self.delay
+    
+    def record(self, outcome: str, duration: float):
+        """Ajuste lot et pause selon l'issue d'une requête"""
+        self.counts[outcome] += 1
+        
+        # Moyenne mobile exponentielle de la latence
+        self.latency = duration if self.latency is None else 0.8 * self.latency + 0.2 * duration
+        
+        if outcome == OUTCOME_OK:
+            if self.batch:
+                self.batch.increase()
+            if self.delay is not None:
+                self.delay = max(0.0, self.delay - self.settings['delay_decrease_step'])
+        elif outcome == OUTCOME_SLOW:
+            # Réponses lentes: des pages plus petites répondent plus vite, la pause est maintenue
+            if self.batch:
+                self.batch.decrease()
+        else:
+            if self.batch:
+                self.batch.decrease()
+            if outcome == OUTCOME_THROTTLED and self.delay is not None:
+                self.delay = min(self.settings['max_delay_seconds'],
+                                 max(self.delay * 2, self.settings['throttle_delay_seconds']))
+    
+    def get_summary(self) -> Dict:
+        """État de l'endpoint pour les statistiques"""
+        return {
+            'batch_size': int(self.batch.value) if self.batch else None,
+            'delay_seconds': round(self.delay, 3) if self.delay is not None else None,
+            'latency_seconds': round(self.latency, 3) if self.latency is not None else None,
+            'requests': dict(self.counts)
+        }
+
+class AdaptiveController:
+    """Contrôleur AIMD d'un compte, alimenté par les événements de requête du client API
+    
+    Tant que l'API répond vite et sans erreur, lots, débit et concurrence augmentent
+    progressivement; un 429 les coupe de moitié (et double la pause de l'endpoint).
+    """
+    
+    DEFAULT_SETTINGS = {
+        'latency_target_seconds': 2.0,
+        'min_batch_size': 5,
+        'batch_increase_step': 5,
+        'delay_decrease_step': 0.05,
+        'throttle_delay_seconds': 1.0,
+        'max_delay_seconds': 30.0,
+        'max_concurrency': 4
+    }
+    
+    def __init__(self, account: str, settings: Optional[Dict] = None):
+        self.account = account
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        
+        self.endpoints = {}
+        self.concurrency = AimdValue(1, 1, self.settings['max_concurrency'], 1)
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.slot_available = threading.Condition(self.lock)
+    
+    @classmethod
+    def from_config(cls, account: str, adaptive_control: Dict) -> 'AdaptiveController':
+        """Construit le contrôleur à partir de la section adaptive_control de la configuration"""
+        settings = {key: value for key, value in adaptive_control.items() if key in cls.DEFAULT_SETTINGS}
+        return cls(account, settings)
+    
+    def get_endpoint(self, endpoint: str) -> EndpointState:
+        """Retourne (en le créant si besoin) l'état d'un endpoint"""
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointState(self.settings)
+        return self.endpoints[endpoint]
+    
+    def classify(self, event: Dict) -> str:
+        """Classe l'issue d'une requête (événement du client API)"""
+        # Seul un 429 signale une limitation; un 5xx est une erreur transitoire ordinaire
+        if event['status'] == 429:
+            return OUTCOME_THROTTLED
+        if event['error'] is not None:
+            # Les erreurs définitives (404, 403...) ne disent rien de la charge de l'API
+            return OUTCOME_ERROR if event['retryable'] else OUTCOME_OK
+        if event['duration'] > self.settings['latency_target_seconds']:
+            return OUTCOME_SLOW
+        return OUTCOME_OK
+    
+    def on_api_request(self, event: Dict):
+        """Écouteur du client API: ajuste le contrôleur après chaque requête"""
+        outcome = self.classify(event)
+        
+        with self.lock:
+            self.get_endpoint(event['endpoint']).record(outcome, event['duration'])
+            
+            if outcome == OUTCOME_OK:
+                self.concurrency.increase()
+            elif outcome in (OUTCOME_THROTTLED, OUTCOME_ERROR):
+                self.concurrency.decrease()
+            
+            self.slot_available.notify_all()
+    
+    def batch_size(self, endpoint: str, maximum: int) -> int:
+        """Taille de lot (ou de page) à utiliser pour le prochain appel de l'endpoint"""
+        with self.lock:
+            return int(self.get_endpoint(endpoint).get_batch(maximum).value)
+    
+    def delay(self, endpoint: str, base: float, minimum: float = 0.0) -> float:
+        """Pause à respecter après un appel de l'endpoint"""
+        with self.lock:
+            return self.get_endpoint(endpoint).get_delay(base, minimum)
+    
+    @contextmanager
+    def slot(self):
+        """Limite le nombre de requêtes simultanées du compte à la concurrence courante"""
+        with self.slot_available:
+            while self.in_flight >= int(self.concurrency.value):
+                self.slot_available.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self.slot_available:
+                self.in_flight -= 1
+                self.slot_available.notify()
+    
+    def get_summary(self) -> Dict:
+        """État du contrôleur pour les statistiques"""
+        with self.lock:
+            return {
+                'concurrency': int(self.concurrency.value),
+                'endpoints': {name: state.get_summary() for name, state in self.endpoints.items()}
+            }
@@ -0,0 +1,307 @@
+"""
+Couche d'appel à l'API Spotify: retry avec backoff exponentiel et disjoncteur par compte
+"""
+
+import logging
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+import requests
+import spotipy
+from spotipy.exceptions import SpotifyException
+
+# Codes HTTP pour lesquels une nouvelle tentative a des chances d'aboutir
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Levée quand le disjoncteur d'un compte est ouvert"""
+    
+    def __init__(self, account: str, retry_in: float):
+        self.account = account
+        self.retry_in = retry_in
+        super().__init__(f"Disjoncteur ouvert pour le compte {account} (nouvel essai dans {retry_in:.0f}s)")
+
+def create_spotify(**kwargs) -> spotipy.Spotify:
+    """Crée un client spotipy sans retry urllib3, à envelopper dans ResilientSpotifyClient
+    
+    Les sessions construites par spotipy relancent les codes 429/5xx puis remplacent l'erreur
+    par un 429 sans en-têtes; avec une session requests simple, le code HTTP réel et
+    l'en-tête Retry-After parviennent à la couche de retry.
+    """
+    kwargs.setdefault('requests_session', requests.Session())
+    return spotipy.Spotify(retries=0, status_retries=0, **kwargs)
+
+def is_retryable_error(error: Exception) -> bool:
+    """Classe une erreur d'appel API: True si elle est transitoire (429, 5xx, timeout, réseau)"""
+    if isinstance(error, SpotifyException):
+        return error.http_status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    return False
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Retourne le délai Retry-After (secondes) imposé par l'API, s'il existe"""
+    headers = getattr(error, 'headers', None) or {}
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class RetryPolicy:
+    """Politique de retry: backoff exponentiel avec jitter complet"""
+    
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    @classmethod
+    def from_config(cls, rate_limiting: Dict) -> 'RetryPolicy':
+        """Construit la politique à partir de la section rate_limiting de la configuration"""
+        return cls(
+            max_attempts=rate_limiting.get('retry_attempts', 5),
+            base_delay=rate_limiting.get('retry_base_delay_seconds', 1.0),
+            max_delay=rate_limiting.get('retry_max_delay_seconds', 60.0)
+        )
+    
+    def get_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Délai avant la tentative suivante (attempt commence à 1)"""
+        # Full jitter: tirage uniforme dans [0, base * 2^(n-1)], borné
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, backoff)
+        
+        # Ne jamais relancer avant le délai imposé par l'API (429)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        
+        return delay
+
+class CircuitBreaker:
+    """Disjoncteur: coupe les appels d'un compte après trop d'échecs transitoires consécutifs"""
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, rate_limiting: Dict) -> 'CircuitBreaker':
+        """Construit le disjoncteur à partir de la section rate_limiting de la configuration"""
+        return cls(
+            failure_threshold=rate_limiting.get('circuit_breaker_threshold', 5),
+            reset_timeout=rate_limiting.get('circuit_breaker_reset_seconds', 60.0)
+        )
+    
+    def retry_in(self) -> float:
+        """Temps restant avant que le disjoncteur laisse passer un appel d'essai"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+    
+    def allow_request(self) -> bool:
+        """Indique si un appel peut être tenté (fermé, ou demi-ouvert après le délai)"""
+        with self.lock:
+            return self.opened_at is None or self.retry_in() <= 0
+    
+    def record_success(self):
+        """Referme le disjoncteur après un appel réussi"""
+        with self.lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        """Comptabilise un échec transitoire et ouvre le disjoncteur si le seuil est atteint"""
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+    
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None and self.retry_in() > 0
+
+class RateLimiter:
+    """Limiteur de débit par compte (seau à jetons): au plus `rate` requêtes par seconde en régime établi"""
+    
+    def __init__(self, rate: Optional[float] = None, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, rate_limiting: Dict) -> 'RateLimiter':
+        """Construit le limiteur à partir de la section rate_limiting de la configuration"""
+        return cls(rate=rate_limiting.get('requests_per_second') or None,
+                   burst=rate_limiting.get('burst_requests', 1))
+    
+    def reserve(self) -> float:
+        """Réserve un jeton et retourne l'attente nécessaire avant d'envoyer la requête (secondes)"""
+        if not self.rate:
+            return 0.0
+        
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            
+            # Le jeton est pris tout de suite: un solde négatif ordonne les appelants concurrents
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+class ResilientSpotifyClient:
+    """Enveloppe un client spotipy: chaque appel passe par la politique de retry et le disjoncteur
+    
+    Les méthodes du client sont exposées telles quelles. Les écouteurs enregistrés via
+    add_listener reçoivent un événement par requête HTTP tentée.
+    """
+    
+    def __init__(self, client, account: str, policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None, limiter: Optional[RateLimiter] = None):
+        self.client = client
+        self.account = account
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or RateLimiter()
+        self.controller = None
+        self.listeners: List[Callable[[Dict], None]] = []
+        self.sleep = time.sleep
+        self.logger = logging.getLogger(__name__)
+    
+    @classmethod
+    def wrap(cls, client, account: str, policy: Optional[RetryPolicy] = None,
+             breaker: Optional[CircuitBreaker] = None, limiter: Optional[RateLimiter] = None) -> 'ResilientSpotifyClient':
+        """Enveloppe un client (ou reconfigure un client déjà enveloppé)"""
+        if isinstance(client, cls):
+            if policy:
+                client.policy = policy
+            if breaker:
+                client.breaker = breaker
+            if limiter:
+                client.limiter = limiter
+            return client
+        return cls(client, account, policy, breaker, limiter)
+    
+    def set_controller(self, controller):
+        """Branche un contrôleur adaptatif (AIMD): il limite la concurrence et apprend de chaque requête"""
+        if self.controller:
+            self.remove_listener(self.controller.on_api_request)
+        self.controller = controller
+        if controller:
+            self.add_listener(controller.on_api_request)
+    
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Enregistre un écouteur appelé après chaque requête tentée"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[Dict], None]):
+        """Retire un écouteur"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def notify(self, event: Dict):
+        """Transmet un événement de requête aux écouteurs, sans jamais faire échouer l'appel"""
+        for listener in list(self.listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                self.logger.debug(f"Erreur dans un écouteur d'appels API: {e}")
+    
+    def call(self, endpoint: str, *args, **kwargs):
+        """Appelle une méthode du client avec retry, backoff et disjoncteur"""
+        return self.send(endpoint, getattr(self.client, endpoint), args, kwargs)
+    
+    def save_tracks_with_timestamps(self, timestamped_ids: List[Dict]):
+        """Likes horodatés (PUT me/tracks avec timestamped_ids), absents de l'API publique de spotipy
+        
+        La requête est celle de current_user_saved_tracks_add: elle est tracée, rythmée et
+        régulée sous ce nom d'endpoint.
+        """
+        return self.send('current_user_saved_tracks_add', self.client._put, ('me/tracks',),
+                         {'payload': {'timestamped_ids': timestamped_ids}})
+    
+    def send(self, endpoint: str, method: Callable, args: tuple, kwargs: Dict):
+        """Exécute une requête avec retry, backoff et disjoncteur, sous le nom d'endpoint donné"""
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(self.account, self.breaker.retry_in())
+            
+            # Débit propre au compte: un compte lent ne ralentit pas les autres
+            wait = self.limiter.reserve()
+            if wait > 0:
+                self.sleep(wait)
+            
+            start = time.monotonic()
+            try:
+                with self.controller.slot() if self.controller else nullcontext():
+                    result = method(*args, **kwargs)
+            except Exception as e:
+                retryable = is_retryable_error(e)
+                self.notify({
+                    'account': self.account,
+                    'endpoint': endpoint,
+                    'attempt': attempt,
+                    'status': getattr(e, 'http_status', None) or 'error',
+                    'duration': time.monotonic() - start,
+                    'error': e,
+                    'retryable': retryable,
+                    'args': args,
+                    'kwargs': kwargs
+                })
+                
+                if not retryable:
+                    raise
+                
+                self.breaker.record_failure()
+                if attempt >= self.policy.max_attempts or self.breaker.is_open:
+                    raise
+                
+                delay = self.policy.get_delay(attempt, get_retry_after(e))
+                self.logger.warning(f"Erreur transitoire sur {endpoint} ({self.account}, tentative "
+                                    f"{attempt}/{self.policy.max_attempts}): {e} - nouvel essai dans {delay:.1f}s")
+                self.sleep(delay)
+                continue
+            
+            self.breaker.record_success()
+            self.notify({
+                'account': self.account,
+                'endpoint': endpoint,
+                'attempt': attempt,
+                'status': 200,
+                'duration': time.monotonic() - start,
+                'error': None,
+                'retryable': False,
+                'args': args,
+                'kwargs': kwargs
+            })
+            return result
+    
+    def __getattr__(self, name):
+        if name == 'client':
+            raise AttributeError(name)
+        
+        attribute = getattr(self.client, name)
+        if not callable(attribute) or name.startswith('__'):
+            return attribute
+        
+        def wrapper(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+        
+        wrapper.__name__ = name
+        return wrapper
@@ -0,0 +1,147 @@
+"""
+Comptabilité des requêtes API par compte et pour l'application, persistée entre les redémarrages
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_QUOTA_FILE = ".api_quota.json"
+
+# Fenêtre glissante du budget quotidien et granularité des compteurs
+QUOTA_WINDOW_SECONDS = 24 * 3600
+QUOTA_BUCKET_SECONDS = 15 * 60
+
+class ApiQuota:
+    """Compte les requêtes par tranches de 15 minutes et les somme sur une fenêtre glissante de 24 h
+    
+    Toutes les requêtes comptent (retries compris): le quota Spotify est celui de
+    l'application, partagé par tous les comptes. Une seule instance par fichier est
+    partagée entre les gestionnaires d'un même processus (voir shared()).
+    """
+    
+    instances = {}
+    instances_lock = threading.Lock()
+    
+    def __init__(self, path: str = DEFAULT_QUOTA_FILE, daily_budget: Optional[int] = None,
+                 headroom: int = 0, save_every: int = 100):
+        self.path = path
+        self.daily_budget = daily_budget
+        self.headroom = headroom
+        self.save_every = save_every
+        self.logger = logging.getLogger(__name__)
+        
+        self.lock = threading.Lock()
+        self.buckets = {}  # compte → {début de tranche (epoch): requêtes}
+        self.unsaved = 0
+        self.load()
+    
+    @classmethod
+    def shared(cls, quota_settings: Dict) -> 'ApiQuota':
+        """Retourne l'instance associée au fichier configuré (créée au premier appel)"""
+        path = quota_settings.get('file', DEFAULT_QUOTA_FILE)
+        with cls.instances_lock:
+            quota = cls.instances.get(path)
+            if quota is None:
+                quota = cls(path)
+                cls.instances[path] = quota
+            quota.daily_budget = quota_settings.get('daily_request_budget') or None
+            quota.headroom = quota_settings.get('headroom_requests', 0) or 0
+            return quota
+    
+    def load(self):
+        """Charge les compteurs enregistrés (les tranches hors fenêtre sont oubliées)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.error(f"Fichier de quota illisible, compteurs remis à zéro: {e}")
+            return
+        
+        with self.lock:
+            self.buckets = {account: {int(start): count for start, count in buckets.items()}
+                            for account, buckets in data.get('accounts', {}).items()}
+            self.prune(time.time())
+    
+    def save(self):
+        """Enregistre les compteurs (écriture atomique)"""
+        with self.lock:
+            self.prune(time.time())
+            data = {'accounts': {account: {str(start): count for start, count in buckets.items()}
+                                 for account, buckets in self.buckets.items()}}
+            self.unsaved = 0
+        
+        try:
+            temporary_path = f"{self.path}.tmp"
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            self.logger.error(f"Impossible d'enregistrer le quota API: {e}")
+    
+    def prune(self, now: float):
+        """Supprime les tranches sorties de la fenêtre (verrou détenu)"""
+        oldest = now - QUOTA_WINDOW_SECONDS
+        for account in list(self.buckets):
+            buckets = self.buckets[account]
+            for start in [start for start in buckets if start + QUOTA_BUCKET_SECONDS <= oldest]:
+                del buckets[start]
+            if not buckets:
+                del self.buckets[account]
+    
+    def record(self, account: str, count: int = 1, now: Optional[float] = None):
+        """Comptabilise des requêtes pour un compte"""
+        now = time.time() if now is None else now
+        start = int(now // QUOTA_BUCKET_SECONDS * QUOTA_BUCKET_SECONDS)
+        
+        with self.lock:
+            buckets = self.buckets.setdefault(account, {})
+            buckets[start] = buckets.get(start, 0) + count
+            self.unsaved += count
+            should_save = self.unsaved >= self.save_every
+        
+        # Sauvegarde régulière pour ne pas perdre le compte en cas d'arrêt brutal
+        if should_save:
+            self.save()
+    
+    def on_api_request(self, event: Dict):
+        """Écouteur des clients API: une requête tentée = une requête consommée"""
+        self.record(event['account'])
+    
+    def attach(self, client):
+        """Branche la comptabilité sur un client enveloppé"""
+        client.add_listener(self.on_api_request)
+    
+    def used(self, account: Optional[str] = None, now: Optional[float] = None) -> int:
+        """Requêtes des dernières 24 h, pour un compte ou pour l'application entière"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self.prune(now)
+            accounts = [account] if account else list(self.buckets)
+            return sum(sum(self.buckets.get(name, {}).values()) for name in accounts)
+    
+    def remaining(self, now: Optional[float] = None) -> Optional[int]:
+        """Requêtes encore disponibles dans le budget quotidien (None = illimité)"""
+        if not self.daily_budget:
+            return None
+        return max(0, self.daily_budget - self.used(now=now))
+    
+    def get_summary(self) -> Dict:
+        """État du quota pour les statistiques"""
+        with self.lock:
+            self.prune(time.time())
+            accounts = {account: sum(buckets.values()) for account, buckets in self.buckets.items()}
+        used = sum(accounts.values())
+        return {
+            'window_hours': QUOTA_WINDOW_SECONDS // 3600,
+            'used': used,
+            'daily_budget': self.daily_budget,
+            'remaining': max(0, self.daily_budget - used) if self.daily_budget else None,
+            'headroom': self.headroom,
+            'accounts': accounts
+        }
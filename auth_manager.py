@@ -6,6 +6,7 @@ import logging
 from typing import Optional, Dict, List
 from dotenv import load_dotenv
 from utils import format_french_datetime
+from api_client import ResilientSpotifyClient, create_spotify
 
 class SpotifyAuthManager:
     """Gestionnaire d'authentification pour les comptes Spotify"""
@@ -75,8 +76,18 @@ class SpotifyAuthManager:
             self.logger.warning(f"Impossible de charger les infos des comptes: {e}")
         return {}
     
-    def authenticate_source_account(self) -> Optional[spotipy.Spotify]:
-        """Authentifie le compte Spotify source"""
+    def create_client(self, auth_manager: SpotifyOAuth, account_type: str) -> ResilientSpotifyClient:
+        """Crée un client spotipy dont tous les appels passent par la couche de retry"""
+        # Retries urllib3 désactivés: la couche ResilientSpotifyClient est l'unique politique de retry
+        sp = create_spotify(auth_manager=auth_manager)
+        return ResilientSpotifyClient(sp, account_type)
+    
+    def authenticate_source_account(self, account_name: str = 'source') -> Optional[spotipy.Spotify]:
+        """Authentifie un compte Spotify source
+        
+        Le compte source principal s'appelle 'source'; les sources supplémentaires
+        (mode fusion) ont chacune leur nom et leur propre cache de jeton.
+        """
         try:
             client_id = os.getenv('SPOTIFY_CLIENT_ID')
             client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
@@ -85,7 +96,7 @@ class SpotifyAuthManager:
                 self.logger.error("Variables d'environnement manquantes")
                 return None
             
-            scope = "user-library-read playlist-read-private playlist-read-collaborative"
+            scope = "user-library-read user-follow-read playlist-read-private playlist-read-collaborative"
             
             # Port différent pour la source
             redirect_uri = "http://127.0.0.1:8888/callback"
@@ -95,25 +106,29 @@ class SpotifyAuthManager:
                 client_secret=client_secret,
                 redirect_uri=redirect_uri,
                 scope=scope,
-                cache_path=".cache_source",
+                cache_path=self.get_source_cache_path(account_name),
                 show_dialog=True  # Force l'affichage de la boîte de dialogue de connexion
             )
             
-            sp = spotipy.Spotify(auth_manager=auth_manager)
+            sp = self.create_client(auth_manager, account_name)
             
             # Test de connexion et sauvegarde des infos
             user_info = sp.current_user()
-            self.save_account_info('source', user_info)
-            self.logger.info(f"Connecté au compte source: {user_info['display_name']} ({user_info['id']})")
+            self.save_account_info(account_name, user_info)
+            self.logger.info(f"Connecté au compte source {account_name}: {user_info['display_name']} ({user_info['id']})")
             
             return sp
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'authentification du compte source: {e}")
+            self.logger.error(f"Erreur lors de l'authentification du compte source {account_name}: {e}")
             return None
     
-    def authenticate_target_account(self) -> Optional[spotipy.Spotify]:
-        """Authentifie le compte Spotify destination"""
+    def authenticate_target_account(self, account_name: str = 'target') -> Optional[spotipy.Spotify]:
+        """Authentifie un compte Spotify destination
+        
+        Le compte destination principal s'appelle 'target'; les destinations supplémentaires
+        (mode fan-out) ont chacune leur nom et leur propre cache de jeton.
+        """
         try:
             client_id = os.getenv('SPOTIFY_CLIENT_ID')
             client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
@@ -122,7 +137,7 @@ class SpotifyAuthManager:
                 self.logger.error("Variables d'environnement manquantes")
                 return None
             
-            scope = "user-library-read user-library-modify playlist-read-private playlist-read-collaborative playlist-modify-private playlist-modify-public"
+            scope = "user-library-read user-library-modify user-follow-read user-follow-modify playlist-read-private playlist-read-collaborative playlist-modify-private playlist-modify-public"
             
             # Port différent pour la destination
             redirect_uri = "http://127.0.0.1:8889/callback"
@@ -132,23 +147,69 @@ class SpotifyAuthManager:
                 client_secret=client_secret,
                 redirect_uri=redirect_uri,
                 scope=scope,
-                cache_path=".cache_target",
+                cache_path=self.get_target_cache_path(account_name),
                 show_dialog=True  # Force l'affichage de la boîte de dialogue de connexion
             )
             
-            sp = spotipy.Spotify(auth_manager=auth_manager)
+            sp = self.create_client(auth_manager, account_name)
             
             # Test de connexion et sauvegarde des infos
             user_info = sp.current_user()
-            self.save_account_info('target', user_info)
-            self.logger.info(f"Connecté au compte destination: {user_info['display_name']} ({user_info['id']})")
+            self.save_account_info(account_name, user_info)
+            self.logger.info(f"Connecté au compte destination {account_name}: {user_info['display_name']} ({user_info['id']})")
             
             return sp
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'authentification du compte destination: {e}")
+            self.logger.error(f"Erreur lors de l'authentification du compte destination {account_name}: {e}")
             return None
     
+    def get_source_cache_path(self, account_name: str) -> str:
+        """Retourne le fichier de cache du jeton d'un compte source"""
+        if account_name == 'source':
+            return ".cache_source"
+        return f".cache_source_{account_name}"
+    
+    def get_target_cache_path(self, account_name: str) -> str:
+        """Retourne le fichier de cache du jeton d'un compte destination"""
+        if account_name == 'target':
+            return ".cache_target"
+        return f".cache_target_{account_name}"
+    
+    def get_authenticated_targets(self, account_names: List[str]) -> Dict[str, spotipy.Spotify]:
+        """Authentifie plusieurs comptes destination; ceux en échec sont ignorés"""
+        target_clients = {}
+        
+        for account_name in account_names:
+            print(f"\n🔐 Authentification du compte DESTINATION '{account_name}'...")
+            if not os.path.exists(self.get_target_cache_path(account_name)):
+                print("   ⚠️  IMPORTANT: Déconnectez-vous de Spotify dans le navigateur, puis connectez-vous avec ce compte")
+            
+            client = self.authenticate_target_account(account_name)
+            if client:
+                target_clients[account_name] = client
+            else:
+                print(f"   ❌ Compte '{account_name}' ignoré (authentification impossible)")
+        
+        return target_clients
+    
+    def get_authenticated_sources(self, account_names: List[str]) -> Dict[str, spotipy.Spotify]:
+        """Authentifie plusieurs comptes source; ceux en échec sont ignorés"""
+        source_clients = {}
+        
+        for account_name in account_names:
+            print(f"\n🔐 Authentification du compte SOURCE '{account_name}'...")
+            if not os.path.exists(self.get_source_cache_path(account_name)):
+                print("   ⚠️  IMPORTANT: Déconnectez-vous de Spotify dans le navigateur, puis connectez-vous avec ce compte")
+            
+            client = self.authenticate_source_account(account_name)
+            if client:
+                source_clients[account_name] = client
+            else:
+                print(f"   ❌ Compte '{account_name}' ignoré (authentification impossible)")
+        
+        return source_clients
+    
     def get_authenticated_clients(self) -> tuple[Optional[spotipy.Spotify], Optional[spotipy.Spotify]]:
         """Retourne les clients authentifiés pour les deux comptes"""
         print("🔐 Authentification du compte SOURCE (celui avec les musiques à copier)...")
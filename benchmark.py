@@ -0,0 +1,196 @@
+"""
+Benchmarks reproductibles des chemins de synchronisation sur un client Spotify hors ligne
+"""
+
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from check_order import check_chronological_order, compare_order, get_liked_songs_with_dates
+from fake_spotify import FakeSpotify, make_account
+from sync_manager import SpotifySyncManager
+
+BENCHMARK_FORMAT_VERSION = 1
+
+# Tailles de bibliothèque par défaut (nombre de likes du compte source)
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_PLAYLISTS = 200
+
+# Métriques comparées à la référence: une hausse au-delà de la tolérance est une régression
+COMPARED_METRICS = ['wall_seconds', 'cpu_seconds', 'peak_memory_bytes', 'requests']
+
+# Écart de temps en dessous duquel une hausse relève du bruit de mesure (secondes)
+MIN_TIME_REGRESSION_SECONDS = 0.1
+
+class BenchmarkSyncManager(SpotifySyncManager):
+    """Gestionnaire configuré pour les benchmarks
+    
+    Configuration par défaut sans budget ni limiteur de débit; les fichiers d'état sont
+    écrits dans un dossier temporaire et les pauses de rythme sont comptées sans être attendues.
+    """
+    
+    def __init__(self, source_client, target_client, workdir: str):
+        self.workdir = workdir
+        self.paced_seconds = 0.0
+        super().__init__(source_client, target_client)
+    
+    def load_config(self, config_path: str) -> Dict:
+        config = self.get_default_config()
+        config['sync_settings']['max_tracks_per_sync'] = None
+        config['rate_limiting']['requests_per_second'] = None
+        config['playlist_settings']['mapping_file'] = os.path.join(self.workdir, 'playlist_mapping.json')
+        config['quota']['file'] = os.path.join(self.workdir, 'api_quota.json')
+        return config
+    
+    def pause(self, seconds: float):
+        self.paced_seconds += seconds
+
+def count_requests(*clients: FakeSpotify) -> int:
+    """Total des requêtes reçues par les clients hors ligne"""
+    return sum(sum(client.request_counts.values()) for client in clients)
+
+def measure(name: str, size: int, items: int, function: Callable, source: FakeSpotify, target: FakeSpotify,
+            manager: Optional[BenchmarkSyncManager] = None) -> Dict:
+    """Mesure un benchmark: temps réel, temps CPU, pic mémoire (tracemalloc) et requêtes"""
+    gc.collect()
+    requests_before = {'source': count_requests(source), 'target': count_requests(target)}
+    paced_before = manager.paced_seconds if manager else 0.0
+    
+    tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        function()
+    finally:
+        cpu_seconds = time.process_time() - cpu_start
+        wall_seconds = time.perf_counter() - wall_start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    requests_by_account = {'source': count_requests(source) - requests_before['source'],
+                           'target': count_requests(target) - requests_before['target']}
+    return {
+        'benchmark': name,
+        'size': size,
+        'items': items,
+        'wall_seconds': round(wall_seconds, 4),
+        'cpu_seconds': round(cpu_seconds, 4),
+        'items_per_second': round(items / wall_seconds, 1) if wall_seconds > 0 else None,
+        'requests': sum(requests_by_account.values()),
+        'requests_by_account': requests_by_account,
+        'peak_memory_bytes': peak_memory,
+        # Pauses de rythme qu'une exécution réelle aurait attendues
+        'paced_seconds': round((manager.paced_seconds if manager else 0.0) - paced_before, 1)
+    }
+
+def run_size(size: int, playlists_count: int, seed: int) -> List[Dict]:
+    """Exécute tous les benchmarks pour une taille de bibliothèque"""
+    playlist_size = max(1, size // max(1, playlists_count))
+    source = make_account('bench-source', size, playlists_count, playlist_size, seed=seed)
+    target = FakeSpotify('bench-target')
+    playlist_items = sum(len(playlist['tracks']) for playlist in source.playlists.values())
+    results = []
+    
+    with tempfile.TemporaryDirectory(prefix='spotify-sync-bench-') as workdir:
+        manager = BenchmarkSyncManager(source, target, workdir)
+        
+        results.append(measure('get_liked_songs', size, size,
+                               lambda: manager.get_liked_songs(manager.source_client, id_only=True),
+                               source, target, manager))
+        results.append(measure('sync_liked_songs', size, size, manager.sync_liked_songs, source, target, manager))
+        results.append(measure('sync_playlists', size, playlist_items, manager.sync_playlists, source, target, manager))
+    
+    # Analyse de check_order.py sur les bibliothèques synchronisées (récupération hors mesure)
+    with contextlib.redirect_stdout(io.StringIO()):
+        source_songs = list(reversed(get_liked_songs_with_dates(source, 'source')))
+        target_songs = list(reversed(get_liked_songs_with_dates(target, 'destination')))
+        
+        def analyze_order():
+            compare_order(source_songs, target_songs)
+            check_chronological_order(source_songs, 'source')
+            check_chronological_order(target_songs, 'destination')
+        
+        results.append(measure('check_order', size, size, analyze_order, source, target))
+    
+    return results
+
+def run_benchmarks(sizes: Optional[List[int]] = None, playlists_count: int = DEFAULT_PLAYLISTS, seed: int = 42,
+                   progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Exécute les benchmarks pour chaque taille et retourne les résultats (format JSON)"""
+    results = []
+    
+    # Les journaux sont coupés: leur coût dépend des handlers configurés, pas du code mesuré
+    logging.disable(logging.CRITICAL)
+    try:
+        for size in sizes or DEFAULT_SIZES:
+            for result in run_size(size, playlists_count, seed):
+                results.append(result)
+                if progress:
+                    progress(result)
+    finally:
+        logging.disable(logging.NOTSET)
+    
+    return {
+        'version': BENCHMARK_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'playlists': playlists_count,
+        'seed': seed,
+        'results': results
+    }
+
+def save_results(results: Dict, path: str):
+    """Enregistre les résultats d'une exécution"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+def load_results(path: str) -> Dict:
+    """Charge les résultats d'une exécution précédente"""
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('version') != BENCHMARK_FORMAT_VERSION:
+        raise ValueError(f"Version de résultats non supportée: {results.get('version')}")
+    return results
+
+def compare_results(baseline: Dict, current: Dict, tolerance: float = 0.2) -> List[Dict]:
+    """Compare deux exécutions et retourne les régressions (hausse au-delà de la tolérance)
+    
+    Les requêtes sont déterministes: toute hausse est une régression.
+    """
+    baseline_results = {(result['benchmark'], result['size']): result for result in baseline['results']}
+    regressions = []
+    
+    for result in current['results']:
+        reference = baseline_results.get((result['benchmark'], result['size']))
+        if not reference:
+            continue
+        
+        for metric in COMPARED_METRICS:
+            before, after = reference.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            
+            allowed = before if metric == 'requests' else before * (1 + tolerance)
+            if metric.endswith('_seconds'):
+                allowed = max(allowed, before + MIN_TIME_REGRESSION_SECONDS)
+            if after > allowed:
+                regressions.append({
+                    'benchmark': result['benchmark'],
+                    'size': result['size'],
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': round(after / before - 1, 3)
+                })
+    
+    return regressions
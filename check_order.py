@@ -213,6 +213,7 @@ def main():
                         track = issue['track']
                         print(f"      {track['name']}: position {issue['target_position']} "
                               f"(devrait être ~{issue['source_position']}, écart: {issue['difference']})")
+                    print(f"\n💡 Pour réparer l'ordre: python main.py repair-order")
         
         # Résumé final
         print(f"\n{Fore.CYAN}📋 RÉSUMÉ:{Style.RESET_ALL}")
@@ -4,10 +4,12 @@ Permet de supprimer toutes les playlists et unliker tous les titres
 ⚠️ ATTENTION: Ce script est destructif et irréversible !
 """
 
+import argparse
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from colorama import init, Fore, Style
 from auth_manager import SpotifyAuthManager
+from http_cassette import Cassette, install_recorder, create_replay_client
 from utils import format_french_datetime
 
 # Initialiser colorama pour les couleurs
@@ -211,8 +213,8 @@ def confirm_action(message: str) -> bool:
         else:
             print("Veuillez répondre par 'oui' ou 'non'")
 
-def main():
-    """Fonction principale"""
+def main(record_path: Optional[str] = None, replay_path: Optional[str] = None, latency_scale: float = 1.0):
+    """Fonction principale (record_path/replay_path: cassette à enregistrer ou à rejouer)"""
     print(f"{Fore.CYAN}╔══════════════════════════════════════════════════════════════════════╗")
     print(f"║                     SPOTIFY CLEANUP TOOL                            ║")
     print(f"║                Nettoyage complet d'un compte                        ║")
@@ -223,14 +225,23 @@ def main():
         print(f"\n🔐 Authentification du compte à nettoyer...")
         print(f"   ⚠️ ATTENTION: Connectez-vous avec le compte que vous voulez NETTOYER")
         
-        auth_manager = SpotifyAuthManager()
-        
-        # On utilise la méthode pour le compte destination (permissions d'écriture)
-        target_client = auth_manager.authenticate_target_account()
-        
-        if not target_client:
-            print(f"❌ Erreur d'authentification")
-            return False
+        cassette = None
+        if replay_path:
+            cassette = Cassette.load(replay_path)
+            target_client = create_replay_client(cassette, 'target', latency_scale)
+        else:
+            auth_manager = SpotifyAuthManager()
+            
+            # On utilise la méthode pour le compte destination (permissions d'écriture)
+            target_client = auth_manager.authenticate_target_account()
+            
+            if not target_client:
+                print(f"❌ Erreur d'authentification")
+                return False
+            
+            if record_path:
+                cassette = Cassette()
+                install_recorder(target_client, cassette, 'target')
         
         # Créer l'objet de nettoyage
         cleanup = SpotifyCleanup(target_client)
@@ -274,6 +285,10 @@ def main():
             else:
                 print(f"Choix invalide. Veuillez choisir 1, 2, 3 ou 4")
         
+        if record_path:
+            cassette.save(record_path)
+            print(f"📼 {len(cassette.interactions)} échanges enregistrés dans {record_path}")
+        
         if success:
             print(f"\n🎉 Nettoyage terminé avec succès !")
             print(f"Heure: {format_french_datetime()}")
@@ -290,8 +305,14 @@ def main():
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nettoyage complet d'un compte Spotify")
+    parser.add_argument('--record', dest='record_path', help="Cassette où enregistrer chaque échange HTTP")
+    parser.add_argument('--replay', dest='replay_path', help="Cassette à rejouer à la place de l'API")
+    parser.add_argument('--latency-scale', type=float, default=1.0, help="Facteur de latence pendant un rejeu")
+    args = parser.parse_args()
+    
     try:
-        success = main()
+        success = main(args.record_path, args.replay_path, args.latency_scale)
         exit(0 if success else 1)
     except Exception as e:
         print(f"\n💥 Erreur critique: {e}")
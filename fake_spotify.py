@@ -0,0 +1,363 @@
+"""
+Client Spotify hors ligne, en mémoire: sert des bibliothèques synthétiques aux benchmarks
+"""
+
+import random
+import string
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from spotipy.exceptions import SpotifyException
+
+# Format des dates d'ajout renvoyées par l'API
+ADDED_AT_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+ID_ALPHABET = string.ascii_letters + string.digits
+
+def random_id(rng: random.Random) -> str:
+    """ID Spotify synthétique (22 caractères base62)"""
+    return ''.join(rng.choices(ID_ALPHABET, k=22))
+
+class FakeSpotify:
+    """Sous-ensemble de l'API spotipy utilisé par l'application, servi depuis la mémoire
+    
+    Les likes sont rangés par date d'ajout; un like ajouté reçoit une date strictement
+    postérieure au précédent (horloge simulée), ce qui préserve l'ordre sans attendre.
+    Chaque appel est compté dans request_counts (nom de méthode → requêtes).
+    """
+    
+    def __init__(self, user_id: str, liked: Optional[Dict[str, str]] = None, playlists: Optional[List[Dict]] = None,
+                 unavailable: Iterable[str] = (), latency: float = 0.0, albums: Optional[Dict[str, str]] = None,
+                 shows: Optional[Dict[str, str]] = None, artists: Iterable[str] = ()):
+        self.user_id = user_id
+        self.latency = latency
+        self.request_counts = Counter()
+        self.lock = threading.Lock()
+        
+        # Likes: ID → date d'ajout (la liste triée est reconstruite à la lecture suivante)
+        self.liked = dict(liked or {})
+        self.liked_order = None
+        self.clock = max((parse_added_at(added_at) for added_at in self.liked.values()),
+                         default=datetime.now(timezone.utc))
+        
+        # Playlists dans l'ordre de la bibliothèque (les plus récentes d'abord)
+        self.playlists = {}
+        for playlist in playlists or []:
+            self.playlists[playlist['id']] = {
+                'id': playlist['id'],
+                'name': playlist['name'],
+                'description': playlist.get('description', ''),
+                'public': playlist.get('public', True),
+                'collaborative': playlist.get('collaborative', False),
+                'owner': playlist.get('owner', user_id),
+                'tracks': list(playlist['tracks'])
+            }
+        
+        # Albums et podcasts sauvegardés (ID → date d'ajout), artistes suivis (ordre d'abonnement)
+        self.albums = dict(albums or {})
+        self.shows = dict(shows or {})
+        self.artists = list(dict.fromkeys(artists))
+        
+        self.unavailable = set(unavailable)
+        self.rng = random.Random(user_id)
+    
+    def request(self, endpoint: str):
+        """Comptabilise une requête (et simule sa latence)"""
+        with self.lock:
+            self.request_counts[endpoint] += 1
+        if self.latency:
+            time.sleep(self.latency)
+    
+    def next_added_at(self) -> str:
+        """Date d'ajout d'un nouveau like: au moins une seconde après le précédent"""
+        self.clock = max(datetime.now(timezone.utc).replace(microsecond=0), self.clock + timedelta(seconds=1))
+        return self.clock.strftime(ADDED_AT_FORMAT)
+    
+    def get_liked_order(self) -> List[str]:
+        """IDs likés du plus récent au plus ancien, comme les renvoie l'API"""
+        if self.liked_order is None:
+            self.liked_order = sorted(self.liked, key=self.liked.__getitem__, reverse=True)
+        return self.liked_order
+    
+    def get_playlist(self, playlist_id: str) -> Dict:
+        """Playlist par ID (404 si elle n'existe pas)"""
+        playlist = self.playlists.get(playlist_id)
+        if playlist is None:
+            raise SpotifyException(404, -1, f"Playlist introuvable: {playlist_id}")
+        return playlist
+    
+    def check_limit(self, limit: int, maximum: int):
+        """Refuse les pages plus grandes que la limite de l'API"""
+        if not 1 <= limit <= maximum:
+            raise SpotifyException(400, -1, f"Invalid limit: {limit} (1..{maximum})")
+    
+    def track(self, track_id: str) -> Dict:
+        """Objet track synthétique"""
+        return {
+            'id': track_id,
+            'name': f"Track {track_id[:8]}",
+            'artists': [{'name': f"Artist {track_id[-4:]}"}],
+            'is_playable': track_id not in self.unavailable
+        }
+    
+    def page(self, items: List[Dict], total: int, limit: int, offset: int) -> Dict:
+        """Enveloppe de pagination de l'API"""
+        return {
+            'items': items,
+            'total': total,
+            'limit': limit,
+            'offset': offset,
+            'next': 'next' if offset + limit < total else None
+        }
+    
+    # --- Utilisateur ---
+    
+    def current_user(self) -> Dict:
+        self.request('current_user')
+        return {'id': self.user_id, 'display_name': self.user_id, 'country': 'FR', 'product': 'premium'}
+    
+    # --- Chansons likées ---
+    
+    def current_user_saved_tracks(self, limit: int = 20, offset: int = 0, market: Optional[str] = None) -> Dict:
+        self.request('current_user_saved_tracks')
+        self.check_limit(limit, 50)
+        order = self.get_liked_order()
+        items = [{'added_at': self.liked[track_id], 'track': self.track(track_id)}
+                 for track_id in order[offset:offset + limit]]
+        return self.page(items, len(order), limit, offset)
+    
+    def current_user_saved_tracks_add(self, tracks: Optional[List[str]] = None):
+        self.request('current_user_saved_tracks_add')
+        self.check_limit(len(tracks or []), 50)
+        added_at = self.next_added_at()
+        for track_id in tracks:
+            # Un titre déjà liké garde sa date d'ajout
+            if track_id not in self.liked:
+                self.liked[track_id] = added_at
+                self.liked_order = None
+    
+    def current_user_saved_tracks_delete(self, tracks: Optional[List[str]] = None):
+        self.request('current_user_saved_tracks_delete')
+        self.check_limit(len(tracks or []), 50)
+        for track_id in tracks:
+            if self.liked.pop(track_id, None) is not None:
+                self.liked_order = None
+    
+    def current_user_saved_tracks_contains(self, tracks: Optional[List[str]] = None) -> List[bool]:
+        self.request('current_user_saved_tracks_contains')
+        self.check_limit(len(tracks or []), 50)
+        return [track_id in self.liked for track_id in tracks]
+    
+    def _put(self, url: str, args=None, payload=None, **kwargs):
+        """Likes horodatés (PUT me/tracks avec timestamped_ids)"""
+        self.request('_put')
+        if url != 'me/tracks':
+            raise SpotifyException(404, -1, f"Endpoint non simulé: {url}")
+        for item in payload['timestamped_ids']:
+            self.liked[item['id']] = item['added_at']
+        self.liked_order = None
+    
+    # --- Albums, podcasts et artistes suivis ---
+    
+    def saved_page(self, saved: Dict[str, str], key: str, limit: int, offset: int) -> Dict:
+        """Page d'une collection datée, du plus récent au plus ancien"""
+        order = sorted(saved, key=saved.__getitem__, reverse=True)
+        items = [{'added_at': saved[item_id], key: {'id': item_id, 'name': f"{key.capitalize()} {item_id[:8]}"}}
+                 for item_id in order[offset:offset + limit]]
+        return self.page(items, len(order), limit, offset)
+    
+    def save_items(self, saved: Dict[str, str], item_ids: List[str]):
+        """Sauvegarde des items d'une collection datée (même date pour tout le lot)"""
+        added_at = self.next_added_at()
+        for item_id in item_ids:
+            saved.setdefault(item_id, added_at)
+    
+    def current_user_saved_albums(self, limit: int = 20, offset: int = 0, market: Optional[str] = None) -> Dict:
+        self.request('current_user_saved_albums')
+        self.check_limit(limit, 50)
+        return self.saved_page(self.albums, 'album', limit, offset)
+    
+    def current_user_saved_albums_add(self, albums: Optional[List[str]] = None):
+        self.request('current_user_saved_albums_add')
+        self.check_limit(len(albums or []), 20)
+        self.save_items(self.albums, albums)
+    
+    def current_user_saved_albums_contains(self, albums: Optional[List[str]] = None) -> List[bool]:
+        self.request('current_user_saved_albums_contains')
+        self.check_limit(len(albums or []), 20)
+        return [album_id in self.albums for album_id in albums]
+    
+    def current_user_saved_shows(self, limit: int = 20, offset: int = 0, market: Optional[str] = None) -> Dict:
+        self.request('current_user_saved_shows')
+        self.check_limit(limit, 50)
+        return self.saved_page(self.shows, 'show', limit, offset)
+    
+    def current_user_saved_shows_add(self, shows: Optional[List[str]] = None):
+        self.request('current_user_saved_shows_add')
+        self.check_limit(len(shows or []), 50)
+        self.save_items(self.shows, shows)
+    
+    def current_user_saved_shows_contains(self, shows: Optional[List[str]] = None) -> List[bool]:
+        self.request('current_user_saved_shows_contains')
+        self.check_limit(len(shows or []), 50)
+        return [show_id in self.shows for show_id in shows]
+    
+    def current_user_followed_artists(self, limit: int = 20, after: Optional[str] = None) -> Dict:
+        self.request('current_user_followed_artists')
+        self.check_limit(limit, 50)
+        start = self.artists.index(after) + 1 if after in self.artists else 0
+        page = self.artists[start:start + limit]
+        more = start + limit < len(self.artists)
+        return {'artists': {
+            'items': [{'id': artist_id, 'name': f"Artist {artist_id[:8]}"} for artist_id in page],
+            'total': len(self.artists),
+            'limit': limit,
+            'next': 'next' if more else None,
+            'cursors': {'after': page[-1] if more and page else None}
+        }}
+    
+    def user_follow_artists(self, ids: Optional[List[str]] = None):
+        self.request('user_follow_artists')
+        self.check_limit(len(ids or []), 50)
+        for artist_id in ids:
+            if artist_id not in self.artists:
+                self.artists.append(artist_id)
+    
+    def current_user_following_artists(self, ids: Optional[List[str]] = None) -> List[bool]:
+        self.request('current_user_following_artists')
+        self.check_limit(len(ids or []), 50)
+        return [artist_id in self.artists for artist_id in ids]
+    
+    # --- Catalogue ---
+    
+    def tracks(self, tracks: List[str], market: Optional[str] = None) -> Dict:
+        self.request('tracks')
+        self.check_limit(len(tracks), 50)
+        return {'tracks': [self.track(track_id) for track_id in tracks]}
+    
+    # --- Playlists ---
+    
+    def current_user_playlists(self, limit: int = 50, offset: int = 0) -> Dict:
+        self.request('current_user_playlists')
+        self.check_limit(limit, 50)
+        playlists = list(self.playlists.values())
+        items = [{
+            'id': playlist['id'],
+            'name': playlist['name'],
+            'description': playlist['description'],
+            'public': playlist['public'],
+            'collaborative': playlist['collaborative'],
+            'owner': {'id': playlist['owner']},
+            'snapshot_id': f"{playlist['id']}-{len(playlist['tracks'])}",
+            'tracks': {'total': len(playlist['tracks'])}
+        } for playlist in playlists[offset:offset + limit]]
+        return self.page(items, len(playlists), limit, offset)
+    
+    def playlist(self, playlist_id: str, fields: Optional[str] = None, market: Optional[str] = None,
+                 additional_types=('track',)) -> Dict:
+        self.request('playlist')
+        playlist = self.get_playlist(playlist_id)
+        return {
+            'id': playlist_id,
+            'name': playlist['name'],
+            'owner': {'id': playlist['owner']},
+            'snapshot_id': f"{playlist_id}-{len(playlist['tracks'])}",
+            'tracks': {'total': len(playlist['tracks'])}
+        }
+    
+    def playlist_items(self, playlist_id: str, fields: Optional[str] = None, limit: int = 100, offset: int = 0,
+                       market: Optional[str] = None, additional_types=('track', 'episode')) -> Dict:
+        self.request('playlist_items')
+        self.check_limit(limit, 100)
+        tracks = self.get_playlist(playlist_id)['tracks']
+        items = [{'track': self.track(track_id)} for track_id in tracks[offset:offset + limit]]
+        return self.page(items, len(tracks), limit, offset)
+    
+    def playlist_tracks(self, playlist_id: str, fields: Optional[str] = None, limit: int = 100, offset: int = 0,
+                        market: Optional[str] = None, additional_types=('track',)) -> Dict:
+        return self.playlist_items(playlist_id, fields, limit, offset, market, additional_types)
+    
+    def user_playlist_create(self, user: str, name: str, public: bool = True, collaborative: bool = False,
+                             description: str = '') -> Dict:
+        self.request('user_playlist_create')
+        playlist_id = random_id(self.rng)
+        playlist = {'id': playlist_id, 'name': name, 'description': description, 'public': public,
+                    'collaborative': collaborative, 'owner': self.user_id, 'tracks': []}
+        
+        # Une nouvelle playlist apparaît en tête de la bibliothèque
+        self.playlists = {playlist_id: playlist, **self.playlists}
+        return {'id': playlist_id, 'name': name}
+    
+    def playlist_add_items(self, playlist_id: str, items: List[str], position: Optional[int] = None) -> Dict:
+        self.request('playlist_add_items')
+        self.check_limit(len(items), 100)
+        tracks = self.get_playlist(playlist_id)['tracks']
+        if position is None:
+            tracks.extend(items)
+        else:
+            tracks[position:position] = items
+        return {'snapshot_id': f"{playlist_id}-{len(tracks)}"}
+    
+    def playlist_replace_items(self, playlist_id: str, items: List[str]) -> Dict:
+        self.request('playlist_replace_items')
+        if len(items) > 100:
+            raise SpotifyException(400, -1, f"Invalid limit: {len(items)} (0..100)")
+        playlist = self.get_playlist(playlist_id)
+        playlist['tracks'] = list(items)
+        return {'snapshot_id': f"{playlist_id}-{len(items)}"}
+    
+    def playlist_remove_specific_occurrences_of_items(self, playlist_id: str, items: List[Dict],
+                                                      snapshot_id: Optional[str] = None) -> Dict:
+        self.request('playlist_remove_specific_occurrences_of_items')
+        self.check_limit(len(items), 100)
+        tracks = self.get_playlist(playlist_id)['tracks']
+        positions = [position for item in items for position in item['positions']]
+        for item in items:
+            for position in item['positions']:
+                if position >= len(tracks) or tracks[position] != item['uri']:
+                    raise SpotifyException(400, -1, f"Item absent à la position {position}: {item['uri']}")
+        for position in sorted(positions, reverse=True):
+            del tracks[position]
+        return {'snapshot_id': f"{playlist_id}-{len(tracks)}"}
+    
+    def current_user_follow_playlist(self, playlist_id: str, public: bool = True):
+        self.request('current_user_follow_playlist')
+        if playlist_id not in self.playlists:
+            playlist = {'id': playlist_id, 'name': f"Playlist {playlist_id[:8]}", 'description': '', 'public': public,
+                        'collaborative': False, 'owner': 'spotify', 'tracks': []}
+            self.playlists = {playlist_id: playlist, **self.playlists}
+    
+    def current_user_unfollow_playlist(self, playlist_id: str):
+        self.request('current_user_unfollow_playlist')
+        self.playlists.pop(playlist_id, None)
+
+def parse_added_at(added_at: str) -> datetime:
+    """Date d'ajout de l'API → datetime UTC"""
+    return datetime.strptime(added_at, ADDED_AT_FORMAT).replace(tzinfo=timezone.utc)
+
+def make_account(user_id: str, tracks_count: int, playlists_count: int = 0, playlist_size: int = 100,
+                 seed: int = 0) -> FakeSpotify:
+    """Compte synthétique: tracks_count likes (un toutes les heures environ) et des playlists
+    de taille variable (playlist_size en moyenne) tirées de la même bibliothèque"""
+    rng = random.Random(seed)
+    track_ids = [random_id(rng) for _ in range(max(tracks_count, playlist_size))]
+    
+    added_at = datetime(2015, 1, 1, tzinfo=timezone.utc)
+    liked = {}
+    for track_id in track_ids[:tracks_count]:
+        added_at += timedelta(seconds=rng.randint(60, 7200))
+        liked[track_id] = added_at.strftime(ADDED_AT_FORMAT)
+    
+    playlists = []
+    for i in range(playlists_count):
+        size = min(len(track_ids), max(1, int(playlist_size * rng.uniform(0.5, 1.5))))
+        playlists.append({
+            'id': random_id(rng),
+            'name': f"Playlist {i + 1}",
+            'tracks': rng.sample(track_ids, size)
+        })
+    
+    return FakeSpotify(user_id, liked, playlists)
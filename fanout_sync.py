@@ -0,0 +1,155 @@
+"""
+Synchronisation fan-out: un compte source vers plusieurs comptes destination
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import spotipy
+
+from sync_manager import SpotifySyncManager
+from utils import get_french_datetime
+
+class SharedSourceLibrary:
+    """Bibliothèque du compte source lue une seule fois par cycle et partagée entre les destinations
+    
+    Chaque élément (likes, liste des playlists, contenu d'une playlist) est lu à la première
+    demande; les destinations qui le demandent en même temps attendent cette unique lecture.
+    Les listes retournées sont partagées et ne doivent pas être modifiées.
+    """
+    
+    def __init__(self, reader: SpotifySyncManager):
+        self.reader = reader
+        self.values = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+    
+    def get(self, key: str, loader: Callable):
+        """Retourne la valeur d'une clé, en la chargeant une seule fois"""
+        with self.lock:
+            key_lock = self.locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            if key in self.values:
+                with self.lock:
+                    self.hits += 1
+                return self.values[key]
+            
+            # Une lecture en échec n'est pas mise en cache: la destination suivante réessaie
+            value = loader()
+            self.values[key] = value
+            return value
+    
+    def liked_songs(self) -> List[Dict]:
+        """Chansons likées du compte source (ID et date)"""
+        return self.get('liked_songs', lambda: self.reader.get_liked_songs(self.reader.source_client, id_only=True))
+    
+    def playlists(self) -> List[Dict]:
+        """Playlists du compte source (filtres de configuration appliqués)"""
+        return self.get('playlists', lambda: self.reader.get_playlists(self.reader.source_client))
+    
+    def playlist_tracks(self, playlist_id: str) -> List[str]:
+        """IDs des tracks d'une playlist source"""
+        return self.get(f'playlist:{playlist_id}',
+                        lambda: self.reader.get_playlist_tracks(self.reader.source_client, playlist_id))
+    
+    def get_summary(self) -> Dict:
+        """Nombre de lectures effectuées et de lectures évitées grâce au partage"""
+        with self.lock:
+            return {'reads': len(self.values), 'shared_reads': self.hits}
+
+class FanoutSyncManager:
+    """Synchronise un compte source vers plusieurs comptes destination en parallèle
+    
+    Chaque destination a son propre gestionnaire (budget, disjoncteur et limiteur de débit);
+    une erreur sur une destination n'interrompt pas les autres.
+    """
+    
+    def __init__(self, source_client: spotipy.Spotify, target_clients: Dict[str, spotipy.Spotify],
+                 config_path: str = "config.json"):
+        self.logger = logging.getLogger(__name__)
+        
+        if not target_clients:
+            raise ValueError("Aucun compte destination pour la synchronisation fan-out")
+        
+        self.managers = {}
+        config = None
+        for name, target_client in target_clients.items():
+            manager = SpotifySyncManager(source_client, target_client, config_path, config=config, target_name=name)
+            config = manager.config
+            self.managers[name] = manager
+        
+        self.config = config
+        fanout_settings = self.config.get('fanout_settings', {})
+        self.max_workers = fanout_settings.get('max_workers') or len(self.managers)
+        
+        self.last_results = {}
+        self.last_source_summary = None
+    
+    def sync_target(self, name: str, manager: SpotifySyncManager) -> Dict:
+        """Synchronise une destination; les erreurs sont capturées pour ne pas affecter les autres"""
+        self.logger.info(f"[{name}] Début de la synchronisation")
+        manager.reset_session_counters()
+        
+        error = None
+        try:
+            success = manager.full_sync()
+        except Exception as e:
+            self.logger.error(f"[{name}] Erreur lors de la synchronisation: {e}")
+            success = False
+            error = str(e)
+        
+        self.logger.info(f"[{name}] Synchronisation {'terminée' if success else 'en échec'}")
+        return {'success': success, 'error': error, 'stats': manager.get_sync_stats()}
+    
+    def full_sync(self) -> bool:
+        """Effectue un cycle: la source est lue une fois, les destinations sont traitées en parallèle"""
+        self.logger.info(f"Début de la synchronisation fan-out vers {len(self.managers)} comptes")
+        start_time = get_french_datetime()
+        
+        source_library = SharedSourceLibrary(next(iter(self.managers.values())))
+        for manager in self.managers.values():
+            manager.source_library = source_library
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fanout') as executor:
+                futures = {name: executor.submit(self.sync_target, name, manager)
+                           for name, manager in self.managers.items()}
+                self.last_results = {name: future.result() for name, future in futures.items()}
+        finally:
+            for manager in self.managers.values():
+                manager.source_library = None
+        
+        self.last_source_summary = source_library.get_summary()
+        
+        duration = get_french_datetime() - start_time
+        failed = [name for name, result in self.last_results.items() if not result['success']]
+        
+        if failed:
+            self.logger.error(f"Synchronisation fan-out terminée avec des erreurs en {duration} "
+                              f"(comptes en échec: {', '.join(failed)})")
+        else:
+            self.logger.info(f"Synchronisation fan-out terminée avec succès en {duration}")
+        
+        return not failed
+    
+    def set_profiler(self, profiler):
+        """Active le profilage par phase sur toutes les destinations"""
+        for manager in self.managers.values():
+            manager.set_profiler(profiler)
+    
+    def set_tracer(self, tracer):
+        """Active le traçage des appels API sur toutes les destinations"""
+        for manager in self.managers.values():
+            manager.set_tracer(tracer)
+    
+    def get_sync_stats(self) -> Dict:
+        """Retourne les statistiques de chaque destination et de la lecture partagée de la source"""
+        return {
+            'targets': {name: manager.get_sync_stats() for name, manager in self.managers.items()},
+            'failed_targets': [name for name, result in self.last_results.items() if not result['success']],
+            'source_reads': self.last_source_summary
+        }
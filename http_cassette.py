@@ -0,0 +1,217 @@
+"""
+Enregistrement et rejeu des échanges HTTP avec l'API Spotify (cassettes)
+
+Une cassette contient chaque requête faite par les clients spotipy (compte, méthode, URL,
+corps) et sa réponse (statut, en-têtes utiles, corps, durée). Les jetons ne sont jamais
+enregistrés: l'en-tête Authorization n'est pas conservé et les champs sensibles sont retirés
+des URL et des corps. Le rejeu sert les réponses dans l'ordre d'enregistrement, sans réseau,
+avec la latence d'origine multipliée par un facteur.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+import spotipy
+from requests.structures import CaseInsensitiveDict
+
+from api_client import ResilientSpotifyClient, create_spotify
+
+CASSETTE_FORMAT_VERSION = 1
+
+# Champs retirés des URL et des corps enregistrés
+SENSITIVE_KEYS = {'access_token', 'refresh_token', 'client_secret', 'code', 'authorization'}
+
+# En-têtes de réponse conservés (les autres n'influencent pas le client)
+RECORDED_HEADERS = ['Content-Type', 'Retry-After']
+
+class CassetteMissError(Exception):
+    """Requête absente de la cassette pendant un rejeu"""
+
+def strip_secrets(value):
+    """Retire récursivement les champs sensibles d'un objet JSON"""
+    if isinstance(value, dict):
+        return {key: strip_secrets(item) for key, item in value.items() if key.lower() not in SENSITIVE_KEYS}
+    if isinstance(value, list):
+        return [strip_secrets(item) for item in value]
+    return value
+
+def normalize_url(url: str, params: Optional[Dict] = None) -> str:
+    """Chemin de l'URL et paramètres triés (paramètres vides et sensibles retirés)
+    
+    L'hôte n'est pas conservé: une cassette se rejoue quel que soit le point d'accès de l'API.
+    """
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query)]
+    query += [(key, str(value)) for key, value in (params or {}).items() if value is not None]
+    query = sorted((key, value) for key, value in query if key.lower() not in SENSITIVE_KEYS)
+    return urlunsplit(('', '', parts.path, urlencode(query), ''))
+
+def normalize_body(data) -> Optional[str]:
+    """Corps de requête comparable d'un enregistrement à l'autre (JSON à clés triées)"""
+    if data is None or data == '':
+        return None
+    if isinstance(data, bytes):
+        data = data.decode('utf-8', errors='replace')
+    try:
+        return json.dumps(strip_secrets(json.loads(data)), sort_keys=True, separators=(',', ':'))
+    except (TypeError, ValueError):
+        return str(data)
+
+class Cassette:
+    """Échanges HTTP enregistrés, dans l'ordre où ils ont eu lieu"""
+    
+    def __init__(self, interactions: Optional[list] = None):
+        self.interactions = interactions or []
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, path: str) -> 'Cassette':
+        """Charge une cassette enregistrée"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CASSETTE_FORMAT_VERSION:
+            raise ValueError(f"Version de cassette non supportée: {data.get('version')}")
+        return cls(data['interactions'])
+    
+    def save(self, path: str):
+        """Écrit la cassette"""
+        with self.lock:
+            interactions = list(self.interactions)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CASSETTE_FORMAT_VERSION,
+                       'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                       'interactions': interactions}, f, ensure_ascii=False)
+    
+    def record(self, interaction: Dict):
+        """Ajoute un échange"""
+        with self.lock:
+            self.interactions.append(interaction)
+    
+    def get_summary(self) -> Dict:
+        """Nombre d'échanges et durée cumulée par compte"""
+        summary = {}
+        for interaction in self.interactions:
+            account = summary.setdefault(interaction['account'], {'requests': 0, 'seconds': 0.0})
+            account['requests'] += 1
+            account['seconds'] = round(account['seconds'] + interaction['elapsed'], 3)
+        return summary
+
+class RecordingSession(requests.Session):
+    """Session requests qui enregistre chaque échange dans une cassette"""
+    
+    def __init__(self, cassette: Cassette, account: str):
+        super().__init__()
+        self.cassette = cassette
+        self.account = account
+    
+    def request(self, method, url, params=None, data=None, **kwargs):
+        interaction = {
+            'account': self.account,
+            'method': method.upper(),
+            'url': normalize_url(url, params),
+            'body': normalize_body(data)
+        }
+        
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, params=params, data=data, **kwargs)
+        except requests.exceptions.RequestException as e:
+            # Les erreurs réseau sont rejouées telles quelles (même type d'exception)
+            interaction.update({'elapsed': round(time.perf_counter() - start, 4), 'error': type(e).__name__,
+                                'message': str(e)})
+            self.cassette.record(interaction)
+            raise
+        
+        try:
+            content = {'json': strip_secrets(response.json())}
+        except ValueError:
+            content = {'text': response.text}
+        
+        interaction.update({
+            'elapsed': round(time.perf_counter() - start, 4),
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            **content
+        })
+        self.cassette.record(interaction)
+        return response
+
+class ReplaySession(requests.Session):
+    """Session requests qui sert les réponses d'une cassette, sans réseau
+    
+    Chaque requête reçoit la prochaine réponse enregistrée pour la même requête (compte,
+    méthode, URL et corps); une requête répétée plus souvent qu'à l'enregistrement reçoit
+    la dernière réponse. latency_scale multiplie la durée enregistrée (0: aucune attente).
+    """
+    
+    def __init__(self, cassette: Cassette, account: str, latency_scale: float = 1.0):
+        super().__init__()
+        self.account = account
+        self.latency_scale = latency_scale
+        self.lock = threading.Lock()
+        self.replayed = 0
+        self.repeated = 0
+        
+        self.queues = defaultdict(deque)
+        self.last = {}
+        for interaction in cassette.interactions:
+            if interaction['account'] == account:
+                self.queues[self.key(interaction['method'], interaction['url'], interaction['body'])].append(interaction)
+    
+    def key(self, method: str, url: str, body: Optional[str]) -> tuple:
+        return method, url, body
+    
+    def request(self, method, url, params=None, data=None, **kwargs):
+        key = self.key(method.upper(), normalize_url(url, params), normalize_body(data))
+        
+        with self.lock:
+            queue = self.queues.get(key)
+            if queue:
+                interaction = queue.popleft()
+                self.last[key] = interaction
+                self.replayed += 1
+            elif key in self.last:
+                interaction = self.last[key]
+                self.repeated += 1
+            else:
+                raise CassetteMissError(f"[{self.account}] Requête absente de la cassette: {key[0]} {key[1]}")
+        
+        if self.latency_scale:
+            time.sleep(interaction['elapsed'] * self.latency_scale)
+        
+        if 'error' in interaction:
+            error_class = getattr(requests.exceptions, interaction['error'], requests.exceptions.ConnectionError)
+            raise error_class(interaction.get('message'))
+        
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.headers = CaseInsensitiveDict(interaction.get('headers') or {})
+        response.url = interaction['url']
+        response.reason = ''
+        response.encoding = 'utf-8'
+        if 'json' in interaction:
+            response._content = json.dumps(interaction['json']).encode('utf-8')
+        else:
+            response._content = (interaction.get('text') or '').encode('utf-8')
+        return response
+
+def underlying_spotify(client) -> spotipy.Spotify:
+    """Client spotipy sous la couche de retry"""
+    return client.client if isinstance(client, ResilientSpotifyClient) else client
+
+def install_recorder(client, cassette: Cassette, account: str):
+    """Enregistre dans la cassette tous les échanges d'un client à partir de maintenant"""
+    spotify = underlying_spotify(client)
+    spotify._session = RecordingSession(cassette, account)
+
+def create_replay_client(cassette: Cassette, account: str, latency_scale: float = 1.0) -> ResilientSpotifyClient:
+    """Client servi par la cassette (aucune authentification ni appel réseau)"""
+    session = ReplaySession(cassette, account, latency_scale)
+    spotify = create_spotify(auth='replay', requests_session=session)
+    return ResilientSpotifyClient(spotify, account)
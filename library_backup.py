@@ -0,0 +1,96 @@
+"""
+Sauvegarde d'une bibliothèque Spotify en NDJSON compressé (gzip), écrite et relue en flux
+
+Une ligne JSON par enregistrement, dans l'ordre:
+    {"type": "header", "version", "user_id", "created_at"}
+    {"type": "liked", "id", "added_at"}                          une ligne par titre liké
+    {"type": "playlist", "id", "name", "description", "public", "collaborative", "owner_id"}
+    {"type": "items", "playlist_id", "ids": [...]}               une ligne par page de la playlist
+    {"type": "end", "liked", "playlists", "items"}               absent si la sauvegarde est tronquée
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from typing import Dict, Iterator
+
+BACKUP_FORMAT_VERSION = 1
+
+class BackupWriter:
+    """Écrit une sauvegarde enregistrement par enregistrement (mémoire constante)"""
+    
+    def __init__(self, path: str, user_id: str):
+        self.path = path
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self.counts = {'liked': 0, 'playlists': 0, 'items': 0}
+        self.write({'type': 'header', 'version': BACKUP_FORMAT_VERSION, 'user_id': user_id,
+                    'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds')})
+    
+    def write(self, record: Dict):
+        """Ajoute un enregistrement"""
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+    
+    def write_liked(self, track_id: str, added_at: str):
+        """Ajoute un titre liké"""
+        self.write({'type': 'liked', 'id': track_id, 'added_at': added_at})
+        self.counts['liked'] += 1
+    
+    def write_playlist(self, playlist: Dict):
+        """Ajoute les métadonnées d'une playlist (ses items suivent)"""
+        self.write({'type': 'playlist', 'id': playlist['id'], 'name': playlist['name'],
+                    'description': playlist.get('description') or '', 'public': playlist.get('public'),
+                    'collaborative': playlist.get('collaborative', False), 'owner_id': playlist.get('owner_id')})
+        self.counts['playlists'] += 1
+    
+    def write_items(self, playlist_id: str, track_ids: list):
+        """Ajoute une page d'items de la dernière playlist écrite"""
+        if track_ids:
+            self.write({'type': 'items', 'playlist_id': playlist_id, 'ids': track_ids})
+            self.counts['items'] += len(track_ids)
+    
+    def close(self):
+        """Termine la sauvegarde (l'enregistrement final atteste qu'elle est complète)"""
+        self.write(dict({'type': 'end'}, **self.counts))
+        self.file.close()
+    
+    def abort(self):
+        """Ferme une sauvegarde interrompue, sans enregistrement final"""
+        self.file.close()
+
+def read_backup(path: str) -> Iterator[Dict]:
+    """Relit une sauvegarde enregistrement par enregistrement
+    
+    Lève ValueError si le fichier n'est pas une sauvegarde de ce format; une sauvegarde
+    tronquée est détectée à la fin de la lecture (enregistrement final absent).
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        try:
+            header = json.loads(f.readline() or 'null')
+        except (OSError, EOFError, ValueError):
+            header = None
+        if not isinstance(header, dict) or header.get('type') != 'header' or header.get('version') != BACKUP_FORMAT_VERSION:
+            raise ValueError(f"{path} n'est pas une sauvegarde valide (version {BACKUP_FORMAT_VERSION})")
+        yield header
+        
+        complete = False
+        try:
+            for line in f:
+                record = json.loads(line)
+                complete = record['type'] == 'end'
+                yield record
+        except (EOFError, ValueError) as e:
+            raise ValueError(f"Sauvegarde {path} illisible ou tronquée: {e}")
+        
+        if not complete:
+            raise ValueError(f"Sauvegarde {path} tronquée (enregistrement final absent)")
+
+def inspect_backup(path: str) -> Dict:
+    """Vérifie qu'une sauvegarde est complète et retourne son en-tête et ses compteurs (lecture en flux)"""
+    header = None
+    counts = None
+    for record in read_backup(path):
+        if record['type'] == 'header':
+            header = record
+        elif record['type'] == 'end':
+            counts = {key: record[key] for key in ('liked', 'playlists', 'items')}
+    return dict(header, **counts)
@@ -0,0 +1,61 @@
+"""
+Collections de la bibliothèque synchronisées en plus des likes et des playlists:
+albums sauvegardés, artistes suivis et podcasts (shows) sauvegardés
+
+Chaque collection est décrite par ses endpoints spotipy et les limites de l'API; les
+écritures se font par lots (un lot = une requête), dans l'ordre chronologique de la source.
+"""
+
+from typing import Dict, Optional
+
+# Collections synchronisables (réglage sync_<nom> de sync_settings)
+LIBRARY_COLLECTIONS = {
+    'saved_albums': {
+        'label': 'albums',
+        'item_key': 'album',
+        'read': 'current_user_saved_albums',
+        'page_size': 50,
+        'contains': 'current_user_saved_albums_contains',
+        'save': 'current_user_saved_albums_add',
+        # PUT /me/albums et /me/albums/contains acceptent au plus 20 IDs
+        'batch_size': 20,
+        'ordered': True
+    },
+    'followed_artists': {
+        'label': 'artistes suivis',
+        'item_key': None,
+        'read': 'current_user_followed_artists',
+        'page_size': 50,
+        'contains': 'current_user_following_artists',
+        'save': 'user_follow_artists',
+        'batch_size': 50,
+        # L'API ne date pas les abonnements: l'ordre n'a pas à être préservé
+        'ordered': False
+    },
+    'saved_shows': {
+        'label': 'podcasts',
+        'item_key': 'show',
+        'read': 'current_user_saved_shows',
+        'page_size': 50,
+        'contains': 'current_user_saved_shows_contains',
+        'save': 'current_user_saved_shows_add',
+        'batch_size': 50,
+        'ordered': True
+    }
+}
+
+def collection_item(collection: Dict, item: Dict) -> Optional[Dict]:
+    """ID et date d'ajout d'un item de page (None si l'objet n'est plus disponible)"""
+    if collection['item_key'] is None:
+        return {'id': item['id'], 'added_at': None} if item and item.get('id') else None
+    
+    entity = item.get(collection['item_key'])
+    if not entity or not entity.get('id'):
+        return None
+    return {'id': entity['id'], 'added_at': item.get('added_at')}
+
+def collection_total(collection: Dict, results: Dict) -> int:
+    """Nombre total d'items d'une collection d'après une page de résultats"""
+    if collection['item_key'] is None:
+        return results['artists']['total']
+    return results['total']
@@ -0,0 +1,245 @@
+"""
+Snapshots binaires d'une bibliothèque Spotify (titres likés et playlists), lisibles par mmap
+
+Format (little-endian):
+    en-tête      HEADER_FORMAT (voir ci-dessous)
+    likes        liked_count IDs de 22 octets, ordre chronologique
+    dates        liked_count entiers int64 (timestamp UNIX de added_at)
+    playlists    playlist_count entrées PLAYLIST_FORMAT (ID, visibilité, nom, description,
+                 début et taille des items)
+    items        item_count IDs de 22 octets (contenu de toutes les playlists, bout à bout)
+    chaînes      noms et descriptions des playlists en UTF-8
+
+Les snapshots de version 1 (sans visibilité ni description) restent lisibles.
+"""
+
+import mmap
+import struct
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List
+
+from order_repair import longest_increasing_subsequence, parse_added_at
+
+SNAPSHOT_MAGIC = b'SPSNAP\x00\x01'
+SNAPSHOT_VERSION = 2
+
+# Les IDs Spotify (base62) font toujours 22 caractères
+TRACK_ID_SIZE = 22
+
+# magic, version, liked_count, playlist_count, item_count, created_at,
+# offsets (likes, dates, playlists, items, chaînes), user_id
+HEADER_FORMAT = '<8sIIIIq5q64s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# ID, playlist publique, position et taille du nom et de la description, premier item et nombre d'items
+PLAYLIST_FORMAT = '<22s?xIIIIII'
+PLAYLIST_SIZE = struct.calcsize(PLAYLIST_FORMAT)
+
+# Version 1: ID, position et taille du nom, premier item et nombre d'items
+PLAYLIST_FORMAT_V1 = '<22s2xIIII'
+PLAYLIST_SIZE_V1 = struct.calcsize(PLAYLIST_FORMAT_V1)
+
+TIMESTAMP_FORMAT = '<q'
+
+def pack_track_id(track_id: str) -> bytes:
+    """Encode un ID Spotify sur 22 octets"""
+    encoded = track_id.encode('ascii')
+    if len(encoded) > TRACK_ID_SIZE:
+        raise ValueError(f"ID Spotify invalide: {track_id}")
+    return encoded.ljust(TRACK_ID_SIZE, b'\x00')
+
+def unpack_track_id(packed: bytes) -> str:
+    """Décode un ID Spotify de 22 octets"""
+    return packed.rstrip(b'\x00').decode('ascii')
+
+def write_snapshot(path: str, user_id: str, liked_songs: List[Dict], playlists: List[Dict]):
+    """Écrit un snapshot
+    
+    liked_songs: [{'id', 'added_at'}] en ordre chronologique
+    playlists: [{'id', 'name', 'public', 'description', 'track_ids'}]
+    """
+    liked_ids = b''.join(pack_track_id(song['id']) for song in liked_songs)
+    liked_times = b''.join(struct.pack(TIMESTAMP_FORMAT, int(parse_added_at(song['added_at']).timestamp()))
+                           for song in liked_songs)
+    
+    table = []
+    items = []
+    strings = []
+    strings_size = 0
+    item_count = 0
+    
+    for playlist in playlists:
+        name = (playlist.get('name') or '').encode('utf-8')
+        description = (playlist.get('description') or '').encode('utf-8')
+        table.append(struct.pack(PLAYLIST_FORMAT, pack_track_id(playlist['id']), bool(playlist.get('public')),
+                                 strings_size, len(name), strings_size + len(name), len(description),
+                                 item_count, len(playlist['track_ids'])))
+        strings.extend((name, description))
+        strings_size += len(name) + len(description)
+        
+        items.extend(pack_track_id(track_id) for track_id in playlist['track_ids'])
+        item_count += len(playlist['track_ids'])
+    
+    liked_offset = HEADER_SIZE
+    times_offset = liked_offset + len(liked_ids)
+    playlists_offset = times_offset + len(liked_times)
+    items_offset = playlists_offset + PLAYLIST_SIZE * len(table)
+    strings_offset = items_offset + TRACK_ID_SIZE * item_count
+    
+    header = struct.pack(
+        HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(liked_songs), len(playlists), item_count,
+        int(datetime.now(timezone.utc).timestamp()),
+        liked_offset, times_offset, playlists_offset, items_offset, strings_offset,
+        user_id.encode('utf-8')[:64]
+    )
+    
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(liked_ids)
+        f.write(liked_times)
+        f.writelines(table)
+        f.writelines(items)
+        f.writelines(strings)
+
+class LibrarySnapshot:
+    """Lecture d'un snapshot via mmap: seules les zones consultées sont chargées en mémoire"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        (magic, version, self.liked_count, self.playlist_count, self.item_count, created_at,
+         self.liked_offset, self.times_offset, self.playlists_offset, self.items_offset,
+         self.strings_offset, user_id) = struct.unpack_from(HEADER_FORMAT, self.data, 0)
+        
+        if magic != SNAPSHOT_MAGIC or version not in (1, SNAPSHOT_VERSION):
+            self.close()
+            raise ValueError(f"{path} n'est pas un snapshot valide (version {SNAPSHOT_VERSION})")
+        
+        self.version = version
+        self.created_at = datetime.fromtimestamp(created_at, timezone.utc)
+        self.user_id = user_id.rstrip(b'\x00').decode('utf-8')
+    
+    def close(self):
+        """Libère le mapping mémoire et le fichier"""
+        self.data.close()
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def liked_id(self, index: int) -> str:
+        """ID du index-ième titre liké (ordre chronologique)"""
+        start = self.liked_offset + index * TRACK_ID_SIZE
+        return unpack_track_id(self.data[start:start + TRACK_ID_SIZE])
+    
+    def liked_timestamp(self, index: int) -> int:
+        """Timestamp UNIX de la date d'ajout du index-ième titre liké"""
+        return struct.unpack_from(TIMESTAMP_FORMAT, self.data, self.times_offset + index * 8)[0]
+    
+    def liked_packed_ids(self) -> List[bytes]:
+        """IDs des titres likés sous forme brute (22 octets), ordre chronologique"""
+        region = self.data[self.liked_offset:self.liked_offset + self.liked_count * TRACK_ID_SIZE]
+        return [region[i:i + TRACK_ID_SIZE] for i in range(0, len(region), TRACK_ID_SIZE)]
+    
+    def iter_liked(self) -> Iterator[Dict]:
+        """Itère sur les titres likés ({'id', 'added_at'}) en ordre chronologique"""
+        for index in range(self.liked_count):
+            added_at = datetime.fromtimestamp(self.liked_timestamp(index), timezone.utc)
+            yield {'id': self.liked_id(index), 'added_at': added_at.strftime('%Y-%m-%dT%H:%M:%SZ')}
+    
+    def playlist(self, index: int) -> Dict:
+        """Métadonnées de la index-ième playlist (sans ses items)"""
+        if self.version == 1:
+            packed_id, name_start, name_length, first_item, items_count = struct.unpack_from(
+                PLAYLIST_FORMAT_V1, self.data, self.playlists_offset + index * PLAYLIST_SIZE_V1)
+            public, description_start, description_length = False, 0, 0
+        else:
+            (packed_id, public, name_start, name_length, description_start, description_length,
+             first_item, items_count) = struct.unpack_from(
+                PLAYLIST_FORMAT, self.data, self.playlists_offset + index * PLAYLIST_SIZE)
+        
+        name_offset = self.strings_offset + name_start
+        description_offset = self.strings_offset + description_start
+        return {
+            'index': index,
+            'id': unpack_track_id(packed_id),
+            'name': self.data[name_offset:name_offset + name_length].decode('utf-8'),
+            'public': public,
+            'description': self.data[description_offset:description_offset + description_length].decode('utf-8'),
+            'first_item': first_item,
+            'track_count': items_count
+        }
+    
+    def playlists(self) -> List[Dict]:
+        """Métadonnées de toutes les playlists"""
+        return [self.playlist(index) for index in range(self.playlist_count)]
+    
+    def playlist_packed_items(self, index: int) -> List[bytes]:
+        """Items bruts (22 octets) de la index-ième playlist, dans l'ordre"""
+        playlist = self.playlist(index)
+        start = self.items_offset + playlist['first_item'] * TRACK_ID_SIZE
+        region = self.data[start:start + playlist['track_count'] * TRACK_ID_SIZE]
+        return [region[i:i + TRACK_ID_SIZE] for i in range(0, len(region), TRACK_ID_SIZE)]
+    
+    def playlist_items(self, index: int) -> List[str]:
+        """IDs des tracks de la index-ième playlist, dans l'ordre"""
+        return [unpack_track_id(packed) for packed in self.playlist_packed_items(index)]
+
+def count_misordered(old_ids: List[bytes], new_ids: List[bytes]) -> int:
+    """Nombre d'éléments communs hors de la plus longue sous-suite dans le même ordre"""
+    old_positions = {track_id: i for i, track_id in enumerate(old_ids)}
+    positions = [old_positions[track_id] for track_id in new_ids if track_id in old_positions]
+    return len(positions) - len(longest_increasing_subsequence(positions))
+
+def diff_id_lists(old_ids: List[bytes], new_ids: List[bytes]) -> Dict:
+    """Compare deux listes ordonnées d'IDs bruts"""
+    old_set = set(old_ids)
+    new_set = set(new_ids)
+    return {
+        'added': [unpack_track_id(track_id) for track_id in new_ids if track_id not in old_set],
+        'removed': [unpack_track_id(track_id) for track_id in old_ids if track_id not in new_set],
+        'misordered': count_misordered(old_ids, new_ids)
+    }
+
+def diff_snapshots(old: LibrarySnapshot, new: LibrarySnapshot, match_by_name: bool = False) -> Dict:
+    """Compare deux snapshots (titres likés et playlists)
+    
+    Les playlists sont associées par ID, ou par nom avec match_by_name (utile pour
+    comparer un compte source à sa copie, dont les IDs de playlist diffèrent).
+    """
+    liked = diff_id_lists(old.liked_packed_ids(), new.liked_packed_ids())
+    
+    key = 'name' if match_by_name else 'id'
+    old_playlists = {playlist[key]: playlist for playlist in old.playlists()}
+    new_playlists = {playlist[key]: playlist for playlist in new.playlists()}
+    
+    changed = []
+    for playlist_key, old_playlist in old_playlists.items():
+        new_playlist = new_playlists.get(playlist_key)
+        if not new_playlist:
+            continue
+        
+        items_diff = diff_id_lists(old.playlist_packed_items(old_playlist['index']),
+                                   new.playlist_packed_items(new_playlist['index']))
+        if items_diff['added'] or items_diff['removed'] or items_diff['misordered']:
+            changed.append({
+                'id': new_playlist['id'],
+                'name': new_playlist['name'],
+                'added': items_diff['added'],
+                'removed': items_diff['removed'],
+                'misordered': items_diff['misordered']
+            })
+    
+    return {
+        'liked': liked,
+        'playlists': {
+            'added': [new_playlists[k]['name'] for k in new_playlists if k not in old_playlists],
+            'removed': [old_playlists[k]['name'] for k in old_playlists if k not in new_playlists],
+            'changed': changed
+        }
+    }
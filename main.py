@@ -3,11 +3,25 @@ import json
 import schedule
 import time
 import logging
+import cProfile
+import os
+import tempfile
 from datetime import datetime
 from colorama import init, Fore, Style
 from auth_manager import SpotifyAuthManager
 from sync_manager import SpotifySyncManager
-from utils import format_french_datetime
+from fanout_sync import FanoutSyncManager
+from merge_sync import MergeSyncManager
+from sync_trigger import SyncTrigger, make_scope
+from sync_profiler import SyncProfiler
+from sync_tracer import SyncTracer, load_trace, summarize_trace
+from library_snapshot import LibrarySnapshot, diff_snapshots
+from library_backup import inspect_backup
+from library_collections import LIBRARY_COLLECTIONS
+from http_cassette import Cassette, install_recorder, create_replay_client
+from synthetic_library import ADDED_AT_DISTRIBUTIONS, SCALE_PROFILES, describe_library, generate_profile, save_library
+from benchmark import DEFAULT_PLAYLISTS, DEFAULT_SIZES, compare_results, load_results, run_benchmarks, save_results
+from utils import format_french_datetime, format_duration
 
 # Initialiser colorama pour les couleurs dans le terminal
 init()
@@ -63,15 +77,124 @@ def print_sync_summary(sync_manager: SpotifySyncManager, success: bool, duration
     print(f"Durée: {duration:.2f} secondes")
     print(f"Chansons synchronisées: {Fore.CYAN}{stats['synced_tracks_count']}{Style.RESET_ALL}")
     print(f"Playlists synchronisées: {Fore.CYAN}{stats['synced_playlists_count']}{Style.RESET_ALL}")
+    for kind, count in (stats.get('synced_library_items') or {}).items():
+        if count:
+            print(f"{LIBRARY_COLLECTIONS[kind]['label'].capitalize()} synchronisés: {Fore.CYAN}{count}{Style.RESET_ALL}")
+    if stats.get('unavailable_tracks_count'):
+        print(f"Tracks injouables ignorées: {Fore.YELLOW}{stats['unavailable_tracks_count']}{Style.RESET_ALL}")
+    quota = stats.get('api_quota') or {}
+    if quota.get('daily_budget'):
+        print(f"Quota API (24 h): {Fore.CYAN}{quota['used']}/{quota['daily_budget']}{Style.RESET_ALL} requêtes")
+    if stats.get('deferred_work'):
+        print(f"Reporté faute de quota: {Fore.YELLOW}{', '.join(stats['deferred_work'])}{Style.RESET_ALL}")
     print(f"Heure: {format_french_datetime()}")
     print(f"{Fore.YELLOW}{'═' * 40}{Style.RESET_ALL}\n")
 
+def print_fanout_summary(fanout_manager: FanoutSyncManager, success: bool, duration: float):
+    """Affiche un résumé de la synchronisation fan-out, compte par compte"""
+    stats = fanout_manager.get_sync_stats()
+    
+    status_color = Fore.GREEN if success else Fore.RED
+    status_text = "SUCCÈS" if success else "ÉCHEC"
+    
+    print(f"\n{Fore.YELLOW}═══ RÉSUMÉ DE LA SYNCHRONISATION FAN-OUT ═══{Style.RESET_ALL}")
+    print(f"Statut: {status_color}{status_text}{Style.RESET_ALL}")
+    print(f"Durée: {duration:.2f} secondes")
+    for name, target_stats in stats['targets'].items():
+        target_color = Fore.RED if name in stats['failed_targets'] else Fore.GREEN
+        print(f"   {target_color}{name}{Style.RESET_ALL}: {target_stats['synced_tracks_count']} chansons, "
+              f"{target_stats['synced_playlists_count']} playlists")
+    if stats['source_reads']:
+        print(f"Lectures source: {stats['source_reads']['reads']} "
+              f"({stats['source_reads']['shared_reads']} évitées grâce au partage)")
+    print(f"Heure: {format_french_datetime()}")
+    print(f"{Fore.YELLOW}{'═' * 40}{Style.RESET_ALL}\n")
+
+def print_profile_report(report: dict):
+    """Affiche le rapport de profilage par phase"""
+    print(f"{Fore.YELLOW}═══ PROFIL PAR PHASE ═══{Style.RESET_ALL}")
+    print(f"{'Phase':<16}{'Durée':>10}{'Requêtes':>10}{'API':>10}{'Octets':>12}{'Pauses':>10}")
+    
+    rows = list(report['phases'].items()) + [('TOTAL', report['totals'])]
+    for name, stats in rows:
+        print(f"{name:<16}{stats['wall_time']:>9.2f}s{stats['requests']:>10}"
+              f"{stats['api_time']:>9.2f}s{stats['bytes']:>12}{stats['sleep_time']:>9.2f}s")
+    
+    print(f"{Fore.YELLOW}{'═' * 40}{Style.RESET_ALL}\n")
+
+def print_plan_summary(plan: dict):
+    """Affiche un résumé d'un plan de synchronisation"""
+    estimate = plan['estimate']
+    
+    print(f"\n{Fore.YELLOW}═══ PLAN DE SYNCHRONISATION ═══{Style.RESET_ALL}")
+    print(f"Calculé le: {plan['created_at']}")
+    print(f"Chansons à liker: {Fore.CYAN}{estimate['tracks_to_like']}{Style.RESET_ALL}")
+    print(f"Playlists à créer: {Fore.CYAN}{estimate['playlists_to_create']}{Style.RESET_ALL} "
+          f"({estimate['playlist_tracks_to_add']} tracks)")
+    if estimate.get('playlists_to_follow'):
+        print(f"Playlists à suivre: {Fore.CYAN}{estimate['playlists_to_follow']}{Style.RESET_ALL}")
+    for kind, count in (estimate.get('library_items_to_save') or {}).items():
+        print(f"{LIBRARY_COLLECTIONS[kind]['label'].capitalize()} à synchroniser: {Fore.CYAN}{count}{Style.RESET_ALL}")
+    for playlist in plan['playlists'][:10]:
+        if playlist.get('follow'):
+            print(f"   - {playlist['name']} (suivie)")
+        else:
+            print(f"   - {playlist['name']} ({len(playlist['track_ids'])} tracks)")
+    if len(plan['playlists']) > 10:
+        print(f"   ... et {len(plan['playlists']) - 10} autres")
+    print(f"Requêtes estimées: {estimate['requests']}")
+    print(f"Durée estimée: {format_duration(estimate['duration_seconds'])}")
+    print(f"{Fore.YELLOW}{'═' * 40}{Style.RESET_ALL}\n")
+
+def print_snapshot_diff(diff: dict):
+    """Affiche la différence entre deux snapshots"""
+    liked = diff['liked']
+    playlists = diff['playlists']
+    
+    print(f"\n{Fore.YELLOW}═══ DIFFÉRENCES ═══{Style.RESET_ALL}")
+    print(f"Titres likés: {Fore.GREEN}+{len(liked['added'])}{Style.RESET_ALL} "
+          f"{Fore.RED}-{len(liked['removed'])}{Style.RESET_ALL}, {liked['misordered']} mal ordonnés")
+    print(f"Playlists: {Fore.GREEN}+{len(playlists['added'])}{Style.RESET_ALL} "
+          f"{Fore.RED}-{len(playlists['removed'])}{Style.RESET_ALL}, {len(playlists['changed'])} modifiées")
+    for name in playlists['added'][:10]:
+        print(f"   {Fore.GREEN}+ {name}{Style.RESET_ALL}")
+    for name in playlists['removed'][:10]:
+        print(f"   {Fore.RED}- {name}{Style.RESET_ALL}")
+    for playlist in playlists['changed'][:10]:
+        print(f"   ~ {playlist['name']}: +{len(playlist['added'])} -{len(playlist['removed'])}, "
+              f"{playlist['misordered']} mal ordonnés")
+    print(f"{Fore.YELLOW}{'═' * 40}{Style.RESET_ALL}\n")
+
+def create_sync_manager(config: str):
+    """Authentifie les deux comptes et retourne un gestionnaire de synchronisation"""
+    print(f"{Fore.BLUE}🔐 Authentification en cours...{Style.RESET_ALL}")
+    auth_manager = SpotifyAuthManager()
+    
+    source_client, target_client = auth_manager.get_authenticated_clients()
+    
+    if not source_client or not target_client:
+        print(f"{Fore.RED}❌ Erreur d'authentification. Vérifiez votre configuration.{Style.RESET_ALL}")
+        return None
+    
+    print(f"{Fore.GREEN}✅ Authentification réussie{Style.RESET_ALL}")
+    auth_manager.display_connected_accounts()
+    
+    return SpotifySyncManager(source_client, target_client, config)
+
 @click.command()
 @click.option('--watch', is_flag=True, help='Mode surveillance continue')
 @click.option('--interval', type=int, default=None, help='Intervalle de synchronisation en minutes (mode surveillance)')
 @click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
 @click.option('--dry-run', is_flag=True, help='Simulation sans modifications réelles')
-def main(watch, interval, config, dry_run):
+@click.option('--profile', is_flag=True, help='Profile chaque synchronisation par phase (durée, requêtes, octets, pauses)')
+@click.option('--profile-output', default=None, help='Fichier pstats où écrire le profil cProfile de l\'exécution')
+@click.option('--trigger-port', type=int, default=None, help='Port de l\'API locale de déclenchement (mode surveillance)')
+@click.option('--trace', 'trace_path', default=None, help='Fichier JSON lines où tracer chaque appel API')
+@click.option('--record', 'record_path', default=None, help='Cassette où enregistrer chaque échange HTTP (jetons retirés)')
+@click.option('--replay', 'replay_path', default=None, help='Cassette à rejouer à la place de l\'API (aucun appel réseau)')
+@click.option('--latency-scale', type=float, default=1.0, help='Facteur appliqué à la latence enregistrée pendant un rejeu (0 = aucune attente)')
+def main(watch, interval, config, dry_run, profile, profile_output, trigger_port, trace_path, record_path, replay_path,
+         latency_scale):
     """
     Outil de synchronisation automatique entre deux comptes Spotify.
     
@@ -85,8 +208,16 @@ def main(watch, interval, config, dry_run):
         with open(config, 'r', encoding='utf-8') as f:
             config_data = json.load(f)
         default_interval = config_data.get('sync_settings', {}).get('sync_interval_minutes', 30)
+        trigger_settings = config_data.get('trigger_settings', {})
+        tracing_settings = config_data.get('tracing', {})
     except:
         default_interval = 30
+        trigger_settings = {}
+        tracing_settings = {}
+    
+    # API de déclenchement: option en ligne de commande ou section trigger_settings
+    if trigger_port is None and trigger_settings.get('enabled'):
+        trigger_port = trigger_settings.get('port', 8765)
     
     # Utiliser l'intervalle de la config si pas spécifié en ligne de commande
     if interval is None:
@@ -107,56 +238,106 @@ def main(watch, interval, config, dry_run):
     if dry_run:
         print(f"{Fore.YELLOW}⚠️  MODE SIMULATION ACTIVÉ - Aucune modification ne sera effectuée{Style.RESET_ALL}\n")
     
+    if record_path and replay_path:
+        print(f"{Fore.RED}❌ --record et --replay ne peuvent pas être utilisés ensemble{Style.RESET_ALL}")
+        return
+    
     try:
-        # Initialiser le gestionnaire d'authentification
-        print(f"{Fore.BLUE}🔐 Authentification en cours...{Style.RESET_ALL}")
-        auth_manager = SpotifyAuthManager()
-        
-        # Obtenir les clients authentifiés
-        source_client, target_client = auth_manager.get_authenticated_clients()
-        
-        if not source_client or not target_client:
-            print(f"{Fore.RED}❌ Erreur d'authentification. Vérifiez votre configuration.{Style.RESET_ALL}")
-            return
-        
-        print(f"{Fore.GREEN}✅ Authentification réussie{Style.RESET_ALL}")
+        cassette = None
+        if replay_path:
+            # Rejeu: les deux comptes sont servis par la cassette, sans authentification
+            cassette = Cassette.load(replay_path)
+            print(f"{Fore.CYAN}📼 Rejeu de {replay_path} ({len(cassette.interactions)} échanges, "
+                  f"latence x{latency_scale}){Style.RESET_ALL}")
+            sync_manager = SpotifySyncManager(create_replay_client(cassette, 'source', latency_scale),
+                                              create_replay_client(cassette, 'target', latency_scale), config)
+        else:
+            # Authentifier les comptes et initialiser le gestionnaire de synchronisation
+            sync_manager = create_sync_manager(config)
+            if not sync_manager:
+                return
+            
+            if record_path:
+                cassette = Cassette()
+                install_recorder(sync_manager.source_client, cassette, 'source')
+                install_recorder(sync_manager.target_client, cassette, 'target')
+                print(f"{Fore.CYAN}📼 Enregistrement des échanges HTTP: {record_path}{Style.RESET_ALL}")
         
-        # Afficher les comptes connectés
-        auth_manager.display_connected_accounts()
+        # Trace JSON lines de chaque appel API (option --trace ou section tracing)
+        tracer = None
+        if trace_path or tracing_settings.get('enabled'):
+            tracer = SyncTracer.from_config(tracing_settings, trace_path)
+            sync_manager.set_tracer(tracer)
+            print(f"{Fore.CYAN}🧵 Trace des appels API: {tracer.path}{Style.RESET_ALL}")
         
-        # Initialiser le gestionnaire de synchronisation
-        sync_manager = SpotifySyncManager(source_client, target_client, config)
+        # Profil cProfile de toute l'exécution (écrit à la fin de chaque synchronisation)
+        cprofiler = None
+        if profile_output:
+            cprofiler = cProfile.Profile()
+            cprofiler.enable()
         
-        def perform_sync():
-            """Effectue une synchronisation"""
+        def perform_sync(scope=None):
+            """Effectue une synchronisation (complète, ou limitée à une portée demandée)"""
             print(f"\n{Fore.BLUE}🔄 Début de la synchronisation...{Style.RESET_ALL}")
             start_time = time.time()
             
+            if profile:
+                sync_manager.set_profiler(SyncProfiler())
+            
             # Réinitialiser les compteurs de session
             sync_manager.reset_session_counters()
             
             if dry_run:
                 print(f"{Fore.YELLOW}📋 Simulation de la synchronisation...{Style.RESET_ALL}")
-                # En mode dry-run, on simule juste une synchronisation réussie
-                success = True
-                time.sleep(2)  # Simulation d'une opération
+                # En mode dry-run, on calcule le plan complet sans rien écrire
+                try:
+                    print_plan_summary(sync_manager.compute_sync_plan())
+                    success = True
+                except Exception as e:
+                    logger.error(f"Erreur lors du calcul du plan: {e}")
+                    success = False
+            elif scope:
+                success = sync_manager.sync_scope(scope)
             else:
                 success = sync_manager.full_sync()
             
             duration = time.time() - start_time
             print_sync_summary(sync_manager, success, duration)
             
+            if record_path:
+                cassette.save(record_path)
+                print(f"{Fore.CYAN}📼 {len(cassette.interactions)} échanges enregistrés dans {record_path}{Style.RESET_ALL}\n")
+            
+            if profile:
+                print_profile_report(sync_manager.profiler.get_report())
+            
+            if cprofiler:
+                # dump_stats désactive le profileur: le réactiver pour les cycles suivants
+                cprofiler.dump_stats(profile_output)
+                cprofiler.enable()
+                print(f"{Fore.CYAN}📈 Profil cProfile écrit dans {profile_output}{Style.RESET_ALL}\n")
+            
             return success
         
         if watch:
             print(f"{Fore.YELLOW}👁️  Mode surveillance activé (intervalle: {interval} minutes){Style.RESET_ALL}")
             print(f"{Fore.YELLOW}   Appuyez sur Ctrl+C pour arrêter{Style.RESET_ALL}\n")
             
+            trigger = None
+            scheduled_sync = perform_sync
+            if trigger_port:
+                # Demandes externes regroupées; minuteur et demandes ne se chevauchent jamais
+                trigger = SyncTrigger(perform_sync, trigger_settings.get('debounce_seconds', 5))
+                trigger.start(trigger_settings.get('host', '127.0.0.1'), trigger_port, trigger_settings.get('token'))
+                scheduled_sync = lambda: trigger.run_now(make_scope('all'))
+                print(f"{Fore.CYAN}📡 API de déclenchement: POST http://{trigger_settings.get('host', '127.0.0.1')}:"
+                      f"{trigger_port}/sync?scope=all|liked|playlists|playlist&playlist_id=...{Style.RESET_ALL}\n")
+            
             # Programmation de la synchronisation périodique
-            schedule.every(interval).minutes.do(perform_sync)
+            schedule.every(interval).minutes.do(scheduled_sync)
             
             # Effectuer une première synchronisation immédiatement
-            perform_sync()
+            scheduled_sync()
             
             # Boucle de surveillance
             try:
@@ -166,10 +347,17 @@ def main(watch, interval, config, dry_run):
             except KeyboardInterrupt:
                 print(f"\n{Fore.YELLOW}⏹️  Arrêt du mode surveillance{Style.RESET_ALL}")
                 logger.info("Mode surveillance arrêté par l'utilisateur")
+            finally:
+                if trigger:
+                    trigger.stop()
+                if tracer:
+                    tracer.close()
         else:
             # Synchronisation unique
             success = perform_sync()
             exit_code = 0 if success else 1
+            if tracer:
+                tracer.close()
             exit(exit_code)
     
     except Exception as e:
@@ -241,14 +429,600 @@ def status():
     else:
         print(f"{Fore.YELLOW}⚠️  Configuration incomplète. Utilisez 'python main.py setup' pour l'aide{Style.RESET_ALL}")
 
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--output', default='sync_plan.json', help='Fichier de plan à écrire')
+def plan(config, output):
+    """Calcule le plan de synchronisation (lectures uniquement) et l'écrit dans un fichier"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        print(f"\n{Fore.BLUE}🔍 Calcul du plan de synchronisation...{Style.RESET_ALL}")
+        sync_plan = sync_manager.compute_sync_plan()
+        sync_manager.save_plan(sync_plan, output)
+        
+        print_plan_summary(sync_plan)
+        print(f"{Fore.GREEN}✅ Plan écrit dans {output}{Style.RESET_ALL}")
+        print(f"   Appliquez-le avec: python main.py apply --plan {output}")
+        
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--plan', 'plan_path', default='sync_plan.json', help='Fichier de plan à appliquer')
+def apply(config, plan_path):
+    """Applique un plan calculé avec 'plan', sans relire les bibliothèques"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        sync_plan = sync_manager.load_plan(plan_path)
+        print_plan_summary(sync_plan)
+        
+        print(f"{Fore.BLUE}🔄 Application du plan...{Style.RESET_ALL}")
+        start_time = time.time()
+        success = sync_manager.apply_sync_plan(sync_plan)
+        
+        print_sync_summary(sync_manager, success, time.time() - start_time)
+        exit(0 if success else 1)
+        
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command('repair-order')
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--dry-run', is_flag=True, help='Calcule la réparation sans rien modifier')
+def repair_order(config, dry_run):
+    """Répare l'ordre des titres likés de la destination (re-like minimal par lots)"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        print(f"\n{Fore.BLUE}🔍 Analyse de l'ordre des titres likés...{Style.RESET_ALL}")
+        result = sync_manager.repair_liked_order(dry_run=dry_run)
+        
+        print(f"\n{Fore.YELLOW}═══ RÉPARATION DE L'ORDRE ═══{Style.RESET_ALL}")
+        print(f"Titres communs: {result['common_count']}")
+        print(f"Déjà bien placés: {Fore.GREEN}{result['kept_count']}{Style.RESET_ALL}")
+        print(f"À re-liker: {Fore.CYAN}{result['to_repair']}{Style.RESET_ALL} (~{result['requests']} requêtes)")
+        
+        if dry_run:
+            print(f"{Fore.YELLOW}📋 Simulation: aucune modification effectuée{Style.RESET_ALL}")
+        else:
+            print(f"Re-likés: {result['repaired']}")
+            if result['failed']:
+                print(f"{Fore.RED}❌ {len(result['failed'])} titres re-likés sans date (ordre non réparé){Style.RESET_ALL}")
+        
+        exit(0 if not result['failed'] else 1)
+        
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--samples', type=int, default=None, help='Pages de likes à échantillonner (sinon verification.liked_samples)')
+@click.option('--playlist-samples', type=int, default=None, help='Playlists à échantillonner (sinon verification.playlist_samples)')
+@click.option('--reconcile', is_flag=True, help='Réconcilie intégralement les seules parties divergentes')
+def verify(config, samples, playlist_samples, reconcile):
+    """Vérifie par échantillonnage que la destination reflète la source (quelques requêtes)"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        print(f"\n{Fore.BLUE}🎲 Vérification par échantillonnage...{Style.RESET_ALL}")
+        result = sync_manager.verify_sync(samples, playlist_samples, reconcile=reconcile)
+        
+        print(f"\n{Fore.YELLOW}═══ VÉRIFICATION ═══{Style.RESET_ALL}")
+        liked = result['liked']
+        if liked:
+            liked_color = Fore.RED if liked['drift'] else Fore.GREEN
+            print(f"Likes: {liked_color}{len(liked['missing'])} manquants, {liked['misordered_ranges']} pages "
+                  f"désordonnées{Style.RESET_ALL} ({liked['sampled']} échantillonnés sur {liked['source_total']}"
+                  f"{'' if liked['order_checked'] else ', ordre non vérifiable'})")
+        for check in result['playlists']:
+            status = f"{Fore.RED}divergente{Style.RESET_ALL}" if check['drift'] else f"{Fore.GREEN}OK{Style.RESET_ALL}"
+            print(f"   {check['name'] or check['source_id']}: {status}" + (f" ({check['error']})" if check['error'] else ""))
+        
+        print(f"Éléments échantillonnés: {result['sampled_items']} ({result['requests']} requêtes)")
+        if result['consistent']:
+            bound = result['max_drift_rate']
+            if bound is not None:
+                print(f"{Fore.GREEN}✅ Aucune divergence: moins de {bound:.1%} d'éléments divergents "
+                      f"(confiance {result['confidence']:.0%}){Style.RESET_ALL}")
+            else:
+                print(f"{Fore.GREEN}✅ Rien à vérifier{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.RED}❌ {result['drifted_items']} éléments divergents "
+                  f"({result['observed_drift_rate']:.1%} de l'échantillon){Style.RESET_ALL}")
+            if result['reconciled']:
+                print(f"{Fore.GREEN}🔧 Parties divergentes réconciliées{Style.RESET_ALL}")
+            else:
+                print(f"Relancez avec --reconcile pour réconcilier les parties divergentes")
+        
+        exit(0 if result['consistent'] or result['reconciled'] else 1)
+        
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--snapshot', 'snapshot_path', default=None, help='Snapshot à restaurer (par défaut le plus récent)')
+@click.option('--list', 'list_snapshots', is_flag=True, help='Liste les snapshots de retour arrière disponibles')
+@click.option('--dry-run', is_flag=True, help='Calcule le retour arrière sans rien modifier')
+def rollback(config, snapshot_path, list_snapshots, dry_run):
+    """Ramène le compte destination à l'état d'un snapshot pris avant une synchronisation"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        if list_snapshots:
+            snapshots = sync_manager.list_rollback_snapshots()
+            print(f"\n{Fore.YELLOW}═══ SNAPSHOTS DE RETOUR ARRIÈRE ═══{Style.RESET_ALL}")
+            for path in reversed(snapshots):
+                print(f"   {path}")
+            if not snapshots:
+                print(f"   Aucun snapshot (activez rollback.snapshot_before_sync)")
+            return
+        
+        print(f"\n{Fore.BLUE}🔍 Comparaison de la destination avec le snapshot...{Style.RESET_ALL}")
+        result = sync_manager.rollback_target(snapshot_path, dry_run=dry_run)
+        
+        print(f"\n{Fore.YELLOW}═══ RETOUR ARRIÈRE ═══{Style.RESET_ALL}")
+        print(f"Snapshot: {result['snapshot']} ({result['snapshot_created_at']})")
+        print(f"Titres à unliker: {Fore.CYAN}{result['unlikes']}{Style.RESET_ALL}")
+        print(f"Titres à re-liker (date d'origine): {Fore.CYAN}{result['relikes']}{Style.RESET_ALL}")
+        print(f"Playlists à supprimer: {Fore.CYAN}{len(result['delete_playlists'])}{Style.RESET_ALL}")
+        print(f"Playlists à recréer: {Fore.CYAN}{len(result['recreate_playlists'])}{Style.RESET_ALL}")
+        for edit in result['edit_playlists']:
+            print(f"   ✏️  {edit['name']}: {edit['action']} ({edit['items']} tracks)")
+        print(f"Requêtes estimées: ~{result['requests']}")
+        
+        if dry_run:
+            print(f"{Fore.YELLOW}📋 Simulation: aucune modification effectuée{Style.RESET_ALL}")
+        elif result['errors']:
+            print(f"{Fore.RED}❌ {len(result['errors'])} erreurs pendant le retour arrière (voir le journal){Style.RESET_ALL}")
+            exit(1)
+        else:
+            print(f"{Fore.GREEN}✅ Compte destination restauré{Style.RESET_ALL}")
+            
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--account', type=click.Choice(['source', 'target']), default='source', help='Compte à capturer')
+@click.option('--output', default=None, help='Fichier de snapshot à écrire')
+def snapshot(config, account, output):
+    """Capture la bibliothèque d'un compte dans un snapshot binaire"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        output = output or f"snapshot_{account}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.snap"
+        client = sync_manager.source_client if account == 'source' else sync_manager.target_client
+        
+        print(f"\n{Fore.BLUE}📸 Capture du compte {account}...{Style.RESET_ALL}")
+        result = sync_manager.capture_snapshot(client, output)
+        
+        print(f"{Fore.GREEN}✅ Snapshot écrit: {output}{Style.RESET_ALL}")
+        print(f"Titres likés: {result['liked_count']}")
+        print(f"Playlists: {result['playlist_count']} ({result['item_count']} tracks)")
+        
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--account', type=click.Choice(['source', 'target']), default='source', help='Compte à sauvegarder')
+@click.option('--output', default=None, help='Fichier de sauvegarde à écrire (.ndjson.gz)')
+def backup(config, account, output):
+    """Sauvegarde la bibliothèque d'un compte en NDJSON compressé, écrit en flux"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        output = output or f"backup_{account}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson.gz"
+        client = sync_manager.source_client if account == 'source' else sync_manager.target_client
+        
+        print(f"\n{Fore.BLUE}💾 Sauvegarde du compte {account}...{Style.RESET_ALL}")
+        result = sync_manager.backup_account(client, output)
+        
+        print(f"{Fore.GREEN}✅ Sauvegarde écrite: {output}{Style.RESET_ALL}")
+        print(f"Titres likés: {result['liked']}")
+        print(f"Playlists: {result['playlists']} ({result['items']} tracks)")
+        
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command()
+@click.argument('backup_file')
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--account', type=click.Choice(['source', 'target']), default='target', help='Compte où restaurer')
+@click.option('--no-playlists', is_flag=True, help='Ne restaure que les titres likés')
+@click.option('--yes', is_flag=True, help='Ne demande pas de confirmation')
+def restore(backup_file, config, account, no_playlists, yes):
+    """Restaure une sauvegarde dans un compte (likes avec leur date d'origine, playlists)"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        summary = inspect_backup(backup_file)
+        print(f"\n{Fore.YELLOW}═══ SAUVEGARDE ═══{Style.RESET_ALL}")
+        print(f"Compte d'origine: {summary['user_id']} ({summary['created_at']})")
+        print(f"Titres likés: {summary['liked']}")
+        print(f"Playlists: {summary['playlists']} ({summary['items']} tracks)")
+        
+        if not yes and not click.confirm(f"Restaurer cette sauvegarde dans le compte {account} ?"):
+            return
+        
+        sync_manager = create_sync_manager(config)
+        if not sync_manager:
+            exit(1)
+        
+        client = sync_manager.source_client if account == 'source' else sync_manager.target_client
+        print(f"\n{Fore.BLUE}♻️  Restauration dans le compte {account}...{Style.RESET_ALL}")
+        result = sync_manager.restore_account(client, backup_file, playlists=not no_playlists)
+        
+        print(f"Titres likés: {Fore.CYAN}{result['liked']}{Style.RESET_ALL}")
+        print(f"Playlists recréées: {Fore.CYAN}{result['playlists']}{Style.RESET_ALL} ({result['items']} tracks), "
+              f"suivies: {Fore.CYAN}{result['followed_playlists']}{Style.RESET_ALL}")
+        if result['errors']:
+            print(f"{Fore.RED}❌ {len(result['errors'])} erreurs pendant la restauration (voir le journal){Style.RESET_ALL}")
+            exit(1)
+        print(f"{Fore.GREEN}✅ Sauvegarde restaurée{Style.RESET_ALL}")
+        
+    except ValueError as e:
+        print(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+        exit(1)
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command('snapshot-diff')
+@click.argument('old_snapshot')
+@click.argument('new_snapshot', required=False)
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--live', type=click.Choice(['source', 'target']), default=None,
+              help='Compare au compte en direct au lieu d\'un second snapshot')
+@click.option('--by-name', is_flag=True, help='Associe les playlists par nom (comparaison source/destination)')
+def snapshot_diff(old_snapshot, new_snapshot, config, live, by_name):
+    """Compare deux snapshots (ou un snapshot et un compte en direct) sans appel API"""
+    if bool(new_snapshot) == bool(live):
+        print(f"{Fore.RED}❌ Indiquez soit un second snapshot, soit --live source|target{Style.RESET_ALL}")
+        exit(1)
+    
+    live_path = None
+    try:
+        if live:
+            setup_logging()
+            sync_manager = create_sync_manager(config)
+            if not sync_manager:
+                exit(1)
+            
+            client = sync_manager.source_client if live == 'source' else sync_manager.target_client
+            fd, live_path = tempfile.mkstemp(suffix='.snap')
+            os.close(fd)
+            
+            print(f"\n{Fore.BLUE}📸 Capture du compte {live}...{Style.RESET_ALL}")
+            sync_manager.capture_snapshot(client, live_path)
+            new_snapshot = live_path
+        
+        with LibrarySnapshot(old_snapshot) as old, LibrarySnapshot(new_snapshot) as new:
+            print_snapshot_diff(diff_snapshots(old, new, match_by_name=by_name))
+            
+    except Exception as e:
+        print(f"{Fore.RED}💥 Erreur: {e}{Style.RESET_ALL}")
+        exit(1)
+    finally:
+        if live_path and os.path.exists(live_path):
+            os.remove(live_path)
+
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--targets', default=None, help='Comptes destination séparés par des virgules (sinon fanout_settings.targets)')
+@click.option('--watch', is_flag=True, help='Mode surveillance continue')
+@click.option('--interval', type=int, default=None, help='Intervalle de synchronisation en minutes (mode surveillance)')
+def fanout(config, targets, watch, interval):
+    """Synchronise le compte source vers plusieurs comptes destination (source lue une seule fois)"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        with open(config, 'r', encoding='utf-8') as f:
+            config_data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        config_data = {}
+    
+    if targets:
+        target_names = [name.strip() for name in targets.split(',') if name.strip()]
+    else:
+        target_names = config_data.get('fanout_settings', {}).get('targets', ['target'])
+    interval = interval or config_data.get('sync_settings', {}).get('sync_interval_minutes', 30)
+    
+    try:
+        print(f"{Fore.BLUE}🔐 Authentification en cours...{Style.RESET_ALL}")
+        auth_manager = SpotifyAuthManager()
+        source_client = auth_manager.authenticate_source_account()
+        if not source_client:
+            print(f"{Fore.RED}❌ Erreur d'authentification du compte source.{Style.RESET_ALL}")
+            exit(1)
+        
+        target_clients = auth_manager.get_authenticated_targets(target_names)
+        if not target_clients:
+            print(f"{Fore.RED}❌ Aucun compte destination authentifié.{Style.RESET_ALL}")
+            exit(1)
+        
+        print(f"{Fore.GREEN}✅ {len(target_clients)} comptes destination prêts: {', '.join(target_clients)}{Style.RESET_ALL}")
+        fanout_manager = FanoutSyncManager(source_client, target_clients, config)
+        
+        def perform_sync():
+            """Effectue un cycle fan-out"""
+            print(f"\n{Fore.BLUE}🔄 Début de la synchronisation fan-out...{Style.RESET_ALL}")
+            start_time = time.time()
+            success = fanout_manager.full_sync()
+            print_fanout_summary(fanout_manager, success, time.time() - start_time)
+            return success
+        
+        if watch:
+            print(f"{Fore.YELLOW}👁️  Mode surveillance activé (intervalle: {interval} minutes){Style.RESET_ALL}")
+            schedule.every(interval).minutes.do(perform_sync)
+            perform_sync()
+            
+            try:
+                while True:
+                    schedule.run_pending()
+                    time.sleep(60)
+            except KeyboardInterrupt:
+                print(f"\n{Fore.YELLOW}⏹️  Arrêt du mode surveillance{Style.RESET_ALL}")
+                logger.info("Mode surveillance arrêté par l'utilisateur")
+        else:
+            exit(0 if perform_sync() else 1)
+            
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command()
+@click.option('--config', default='config.json', help='Chemin vers le fichier de configuration')
+@click.option('--sources', default=None, help='Comptes source séparés par des virgules (sinon merge_settings.sources)')
+@click.option('--watch', is_flag=True, help='Mode surveillance continue')
+@click.option('--interval', type=int, default=None, help='Intervalle de synchronisation en minutes (mode surveillance)')
+def merge(config, sources, watch, interval):
+    """Fusionne les likes de plusieurs comptes source dans le compte destination (ordre chronologique global)"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    print_banner()
+    
+    try:
+        with open(config, 'r', encoding='utf-8') as f:
+            config_data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        config_data = {}
+    
+    if sources:
+        source_names = [name.strip() for name in sources.split(',') if name.strip()]
+    else:
+        source_names = config_data.get('merge_settings', {}).get('sources', ['source'])
+    interval = interval or config_data.get('sync_settings', {}).get('sync_interval_minutes', 30)
+    
+    try:
+        print(f"{Fore.BLUE}🔐 Authentification en cours...{Style.RESET_ALL}")
+        auth_manager = SpotifyAuthManager()
+        source_clients = auth_manager.get_authenticated_sources(source_names)
+        if not source_clients:
+            print(f"{Fore.RED}❌ Aucun compte source authentifié.{Style.RESET_ALL}")
+            exit(1)
+        
+        print(f"\n🔐 Authentification du compte DESTINATION...")
+        target_client = auth_manager.authenticate_target_account()
+        if not target_client:
+            print(f"{Fore.RED}❌ Erreur d'authentification du compte destination.{Style.RESET_ALL}")
+            exit(1)
+        
+        print(f"{Fore.GREEN}✅ {len(source_clients)} comptes source prêts: {', '.join(source_clients)}{Style.RESET_ALL}")
+        merge_manager = MergeSyncManager(source_clients, target_client, config)
+        
+        def perform_sync():
+            """Effectue un cycle de fusion"""
+            print(f"\n{Fore.BLUE}🔄 Début de la synchronisation fusionnée...{Style.RESET_ALL}")
+            start_time = time.time()
+            merge_manager.reset_session_counters()
+            success = merge_manager.full_sync()
+            print_sync_summary(merge_manager, success, time.time() - start_time)
+            for name, count in merge_manager.get_sync_stats()['source_counts'].items():
+                print(f"   {name}: {count} chansons likées")
+            return success
+        
+        if watch:
+            print(f"{Fore.YELLOW}👁️  Mode surveillance activé (intervalle: {interval} minutes){Style.RESET_ALL}")
+            schedule.every(interval).minutes.do(perform_sync)
+            perform_sync()
+            
+            try:
+                while True:
+                    schedule.run_pending()
+                    time.sleep(60)
+            except KeyboardInterrupt:
+                print(f"\n{Fore.YELLOW}⏹️  Arrêt du mode surveillance{Style.RESET_ALL}")
+                logger.info("Mode surveillance arrêté par l'utilisateur")
+        else:
+            exit(0 if perform_sync() else 1)
+            
+    except Exception as e:
+        logger.error(f"Erreur critique: {e}")
+        print(f"{Fore.RED}💥 Erreur critique: {e}{Style.RESET_ALL}")
+        exit(1)
+
+@cli.command('trace-report')
+@click.argument('trace_file')
+@click.option('--slowest', type=int, default=10, help='Nombre d\'appels les plus lents à afficher')
+def trace_report(trace_file, slowest):
+    """Analyse un fichier de trace: latences par endpoint (p50/p95/p99) et appels les plus lents"""
+    try:
+        summary = summarize_trace(load_trace(trace_file), slowest)
+    except FileNotFoundError:
+        print(f"{Fore.RED}❌ Fichier de trace introuvable: {trace_file}{Style.RESET_ALL}")
+        exit(1)
+    
+    print(f"\n{Fore.YELLOW}═══ ANALYSE DE LA TRACE ═══{Style.RESET_ALL}")
+    print(f"Spans: {summary['spans']} ({summary['cycles']} cycles)")
+    print(f"{'Endpoint':<45} {'Req.':>6} {'Err.':>5} {'Retry':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for key, stats in sorted(summary['endpoints'].items(), key=lambda item: -item[1]['total_ms']):
+        print(f"{key:<45} {stats['requests']:>6} {stats['errors']:>5} {stats['retries']:>5} "
+              f"{stats['p50_ms']:>6.0f}ms {stats['p95_ms']:>6.0f}ms {stats['p99_ms']:>6.0f}ms {stats['max_ms']:>6.0f}ms")
+    
+    if summary['slowest']:
+        print(f"\n{Fore.CYAN}Appels les plus lents:{Style.RESET_ALL}")
+        for span in summary['slowest']:
+            print(f"   {span['duration_ms']:>8.0f}ms  {span['account']} {span['endpoint']} "
+                  f"(phase {span.get('phase')}, lot {span.get('batch_size')}, statut {span.get('status')}, {span['ts']})")
+    print(f"{Fore.YELLOW}{'═' * 40}{Style.RESET_ALL}\n")
+
+@cli.command()
+@click.option('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+              help='Tailles de bibliothèque à mesurer (nombre de likes, séparés par des virgules)')
+@click.option('--playlists', type=int, default=DEFAULT_PLAYLISTS, help='Nombre de playlists du compte source synthétique')
+@click.option('--seed', type=int, default=42, help='Graine des bibliothèques synthétiques')
+@click.option('--output', default='benchmark_results.json', help='Fichier JSON où écrire les résultats')
+@click.option('--baseline', default=None, help='Résultats de référence à comparer (détection des régressions)')
+@click.option('--tolerance', type=float, default=0.2, help='Hausse tolérée par rapport à la référence (0.2 = +20 %)')
+def bench(sizes, playlists, seed, output, baseline, tolerance):
+    """Mesure les chemins de synchronisation sur un client Spotify hors ligne (aucun appel réseau)"""
+    try:
+        sizes = [int(size) for size in sizes.split(',') if size.strip()]
+        reference = load_results(baseline) if baseline else None
+    except (ValueError, OSError) as e:
+        print(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+        exit(1)
+    
+    print(f"\n{Fore.YELLOW}═══ BENCHMARKS ═══{Style.RESET_ALL}")
+    print(f"{'Benchmark':<18} {'Taille':>8} {'Éléments':>9} {'Durée':>9} {'CPU':>9} {'Éléments/s':>11} {'Req.':>7} {'Mémoire':>10}")
+    
+    def print_result(result: dict):
+        print(f"{result['benchmark']:<18} {result['size']:>8} {result['items']:>9} {result['wall_seconds']:>8.2f}s "
+              f"{result['cpu_seconds']:>8.2f}s {result['items_per_second'] or 0:>11.0f} {result['requests']:>7} "
+              f"{result['peak_memory_bytes'] / 1024 / 1024:>8.1f}Mo")
+    
+    results = run_benchmarks(sizes, playlists, seed, progress=print_result)
+    save_results(results, output)
+    print(f"\n{Fore.GREEN}✅ Résultats enregistrés dans {output}{Style.RESET_ALL}")
+    
+    if reference:
+        regressions = compare_results(reference, results, tolerance)
+        if not regressions:
+            print(f"{Fore.GREEN}✅ Aucune régression par rapport à {baseline}{Style.RESET_ALL}")
+            return
+        
+        print(f"{Fore.RED}❌ {len(regressions)} régressions par rapport à {baseline}:{Style.RESET_ALL}")
+        for regression in regressions:
+            print(f"   {regression['benchmark']} ({regression['size']}) {regression['metric']}: "
+                  f"{regression['baseline']} → {regression['current']} ({regression['change']:+.0%})")
+        exit(1)
+
+@cli.command()
+@click.option('--profile', type=click.Choice(list(SCALE_PROFILES)), default='medium', help='Profil de taille')
+@click.option('--liked', type=int, default=None, help='Nombre de titres likés (remplace le profil)')
+@click.option('--playlists', type=int, default=None, help='Nombre de playlists (remplace le profil)')
+@click.option('--playlist-size', type=int, default=None, help='Taille moyenne des playlists (remplace le profil)')
+@click.option('--duplicate-ratio', type=float, default=None, help='Part d\'items répétés dans une playlist')
+@click.option('--unavailable-ratio', type=float, default=None, help='Part des tracks injouables')
+@click.option('--distribution', type=click.Choice(ADDED_AT_DISTRIBUTIONS), default=None,
+              help='Répartition des dates d\'ajout des likes')
+@click.option('--seed', type=int, default=42, help='Graine de génération')
+@click.option('--output', default='synthetic_library.json.gz', help='Fichier où écrire la bibliothèque')
+def generate(profile, liked, playlists, playlist_size, duplicate_ratio, unavailable_ratio, distribution, seed, output):
+    """Génère une bibliothèque synthétique servie hors ligne (tests de montée en charge)"""
+    overrides = {key: value for key, value in {
+        'liked_count': liked, 'playlists_count': playlists, 'playlist_size': playlist_size,
+        'duplicate_ratio': duplicate_ratio, 'unavailable_ratio': unavailable_ratio, 'distribution': distribution
+    }.items() if value is not None}
+    
+    library = generate_profile('synthetic', profile, seed=seed, **overrides)
+    save_library(library, output)
+    
+    description = describe_library(library)
+    print(f"{Fore.GREEN}✅ Bibliothèque écrite: {output}{Style.RESET_ALL}")
+    print(f"Titres likés: {description['liked']} ({description['unavailable']} tracks injouables)")
+    print(f"Playlists: {description['playlists']} ({description['playlist_items']} tracks, "
+          f"la plus grande: {description['largest_playlist']})")
+
 # Ajouter les commandes au groupe principal
 cli.add_command(setup)
 cli.add_command(status)
+cli.add_command(plan)
+cli.add_command(apply)
+cli.add_command(repair_order)
+cli.add_command(rollback)
+cli.add_command(verify)
+cli.add_command(snapshot)
+cli.add_command(backup)
+cli.add_command(restore)
+cli.add_command(snapshot_diff)
+cli.add_command(fanout)
+cli.add_command(merge)
+cli.add_command(trace_report)
+cli.add_command(bench)
+cli.add_command(generate)
 
 if __name__ == '__main__':
     # Vérifier si on appelle une sous-commande
     import sys
-    if len(sys.argv) > 1 and sys.argv[1] in ['setup', 'status']:
+    if len(sys.argv) > 1 and sys.argv[1] in ['setup', 'status', 'plan', 'apply', 'repair-order', 'rollback', 'verify', 'snapshot', 'snapshot-diff', 'backup', 'restore', 'fanout', 'merge', 'trace-report', 'bench', 'generate']:
         cli()
     else:
         main()
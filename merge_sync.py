@@ -0,0 +1,101 @@
+"""
+Synchronisation fusionnée: plusieurs comptes source vers un seul compte destination
+"""
+
+import heapq
+from typing import Dict, Iterable, Iterator
+
+import spotipy
+
+from sync_manager import SpotifySyncManager
+
+def merge_liked_streams(streams: Iterable[Iterator[Dict]]) -> Iterator[Dict]:
+    """Fusionne des flux de likes déjà triés par date d'ajout (k-way, par tas)
+    
+    Un titre présent dans plusieurs flux n'est émis qu'une fois, à sa date d'ajout la plus
+    ancienne. Les dates de l'API (ISO 8601 UTC) se comparent comme des chaînes.
+    """
+    seen = set()
+    for song in heapq.merge(*streams, key=lambda song: song['added_at']):
+        if song['id'] not in seen:
+            seen.add(song['id'])
+            yield song
+
+class MergeSyncManager(SpotifySyncManager):
+    """Synchronise les likes de plusieurs comptes source vers un compte destination
+    
+    Les likes des sources sont lus page par page, du plus ancien au plus récent, et fusionnés
+    en un seul ordre chronologique: seule la page courante de chaque source est en mémoire.
+    Les playlists sont synchronisées depuis la première source.
+    """
+    
+    def __init__(self, source_clients: Dict[str, spotipy.Spotify], target_client: spotipy.Spotify,
+                 config_path: str = "config.json", config=None):
+        if not source_clients:
+            raise ValueError("Aucun compte source pour la synchronisation fusionnée")
+        
+        names = list(source_clients)
+        super().__init__(source_clients[names[0]], target_client, config_path, config=config)
+        
+        self.source_clients = {names[0]: self.source_client}
+        for name in names[1:]:
+            client = self.wrap_client(source_clients[name], name)
+            client.add_listener(self.on_api_request)
+            self.quota.attach(client)
+            self.source_clients[name] = client
+        
+        self.last_source_counts = {}
+    
+    def iter_liked_songs_oldest_first(self, name: str, client: spotipy.Spotify) -> Iterator[Dict]:
+        """Likes d'un compte (ID et date), du plus ancien au plus récent, lus en flux
+        
+        L'API renvoie les likes les plus récents d'abord: les pages sont lues depuis la fin.
+        """
+        total = client.current_user_saved_tracks(limit=1)['total']
+        end = total
+        count = 0
+        
+        while end > 0:
+            page_size = self.batch_size(client, 'current_user_saved_tracks', 50)
+            offset = max(0, end - page_size)
+            results = client.current_user_saved_tracks(limit=end - offset, offset=offset)
+            
+            for item in reversed(results['items']):
+                track = item['track']
+                if track and track['id']:
+                    count += 1
+                    yield {'id': track['id'], 'added_at': item['added_at']}
+            
+            end = offset
+            if end > 0:
+                self.pace(client, 'current_user_saved_tracks', 0.1)
+        
+        self.last_source_counts[name] = count
+        self.logger.info(f"[{name}] {count} chansons likées lues")
+    
+    def plan_liked_songs(self) -> Dict:
+        """Calcule les chansons à liker: fusion chronologique des sources moins la destination"""
+        self.last_source_counts = {}
+        source_count = 0
+        candidates = []
+        
+        # Le flux fusionné est consommé au fil de l'eau: seules les candidates sont conservées
+        with self.phase('fetch_source'):
+            streams = [self.iter_liked_songs_oldest_first(name, client) for name, client in self.source_clients.items()]
+            for song in merge_liked_streams(streams):
+                source_count += 1
+                if self.is_candidate_track(song['id']):
+                    candidates.append(song['id'])
+        
+        plan = self.select_tracks_to_like(candidates)
+        self.logger.info(f"{source_count} chansons likées distinctes sur {len(self.source_clients)} comptes source, "
+                         f"{len(plan['tracks_to_like'])} à synchroniser")
+        
+        plan.update({'source_count': source_count, 'source_counts': dict(self.last_source_counts)})
+        return plan
+    
+    def get_sync_stats(self) -> Dict:
+        """Statistiques de la synchronisation, avec les likes lus par compte source"""
+        stats = super().get_sync_stats()
+        stats['source_counts'] = dict(self.last_source_counts)
+        return stats
@@ -0,0 +1,153 @@
+"""
+Réparation de l'ordre des titres likés: calcul du plus petit ensemble de titres à re-liker
+"""
+
+import bisect
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+# Taille maximale d'un lot pour /me/tracks (like et unlike)
+SAVED_TRACKS_BATCH_SIZE = 50
+
+def parse_added_at(added_at: str) -> datetime:
+    """Convertit une date added_at de l'API Spotify en datetime UTC"""
+    return datetime.fromisoformat(added_at.replace('Z', '+00:00'))
+
+def format_added_at(dt: datetime) -> str:
+    """Formate un datetime au format added_at de l'API Spotify"""
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def longest_increasing_subsequence(values: List[int]) -> List[int]:
+    """Retourne les indices d'une plus longue sous-suite strictement croissante (O(n log n))"""
+    tails = []        # tails[k] = plus petite fin d'une sous-suite de longueur k+1
+    tails_index = []  # indice dans values de chaque fin
+    previous = [-1] * len(values)
+    
+    for i, value in enumerate(values):
+        k = bisect.bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tails_index.append(i)
+        else:
+            tails[k] = value
+            tails_index[k] = i
+        previous[i] = tails_index[k - 1] if k > 0 else -1
+    
+    result = []
+    i = tails_index[-1] if tails_index else -1
+    while i != -1:
+        result.append(i)
+        i = previous[i]
+    result.reverse()
+    return result
+
+def assign_timestamps(slots: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+    """Attribue une date d'ajout aux titres déplacés pour qu'ils s'insèrent entre leurs voisins conservés
+    
+    slots est la liste des titres communs dans l'ordre source: {'id', 'added_at' (datetime ou None), 'keep'}.
+    Les dates sont à la seconde: quand l'espace entre deux titres conservés est insuffisant,
+    le titre conservé suivant est lui aussi déplacé pour agrandir la fenêtre.
+    """
+    now = now or datetime.now(timezone.utc)
+    relikes = []
+    i = 0
+    
+    while i < len(slots):
+        if slots[i]['keep']:
+            i += 1
+            continue
+        
+        # Fenêtre [start, end) de titres à déplacer, bornée par des titres conservés
+        lower = slots[i - 1]['added_at'] if i > 0 else None
+        end = i
+        while True:
+            while end < len(slots) and not slots[end]['keep']:
+                end += 1
+            upper = slots[end]['added_at'] if end < len(slots) else None
+            count = end - i
+            
+            if lower is None or upper is None:
+                break
+            if (upper - lower).total_seconds() - 1 >= count:
+                break
+            
+            # Pas assez de secondes libres: déplacer aussi le titre conservé suivant
+            slots[end]['keep'] = False
+        
+        if lower is None and upper is None:
+            start_time = now - timedelta(seconds=count)
+            step = 1.0
+        elif lower is None:
+            start_time = upper - timedelta(seconds=count)
+            step = 1.0
+        elif upper is None:
+            start_time = lower + timedelta(seconds=1)
+            step = 1.0
+        else:
+            step = max(1.0, (upper - lower).total_seconds() // (count + 1))
+            start_time = lower + timedelta(seconds=step)
+        
+        for j in range(count):
+            added_at = start_time + timedelta(seconds=int(j * step))
+            slots[i + j]['added_at'] = added_at
+            relikes.append({'id': slots[i + j]['id'], 'added_at': format_added_at(added_at)})
+        
+        i = end
+    
+    return relikes
+
+def compute_order_repair(source_songs: List[Dict], target_songs: List[Dict]) -> Dict:
+    """Calcule la réparation minimale de l'ordre des likes de la destination
+    
+    Les deux listes sont en ordre chronologique ({'id', 'added_at'}). Les titres communs
+    dont la position destination forme la plus longue sous-suite croissante (dans l'ordre
+    source) sont conservés; les autres sont unlikés puis re-likés avec une date d'ajout
+    qui les replace entre leurs voisins.
+    """
+    source_order = {song['id']: i for i, song in enumerate(source_songs)}
+    target_added_at = {song['id']: song['added_at'] for song in target_songs}
+    
+    # Titres communs dans l'ordre destination, avec leur position dans la source
+    common_in_target = [song['id'] for song in target_songs if song['id'] in source_order]
+    source_positions = [source_order[track_id] for track_id in common_in_target]
+    
+    kept_ids = {common_in_target[i] for i in longest_increasing_subsequence(source_positions)}
+    
+    # Titres communs dans l'ordre source
+    slots = [{
+        'id': song['id'],
+        'added_at': parse_added_at(target_added_at[song['id']]),
+        'keep': song['id'] in kept_ids
+    } for song in source_songs if song['id'] in target_added_at]
+    
+    relikes = assign_timestamps(slots)
+    
+    return {
+        'common_count': len(slots),
+        'kept_count': len(slots) - len(relikes),
+        'relikes': relikes
+    }
+
+def apply_order_repair(client, relikes: List[Dict], batch_size: int = SAVED_TRACKS_BATCH_SIZE) -> Dict:
+    """Unlike puis re-like par lots les titres déplacés, avec leur nouvelle date d'ajout
+    
+    Chaque lot est re-liké juste après avoir été unliké pour limiter la fenêtre
+    pendant laquelle un titre n'est plus dans la bibliothèque.
+    """
+    repaired = 0
+    failed = []
+    
+    for i in range(0, len(relikes), batch_size):
+        batch = relikes[i:i + batch_size]
+        track_ids = [item['id'] for item in batch]
+        
+        client.current_user_saved_tracks_delete(tracks=track_ids)
+        try:
+            client.save_tracks_with_timestamps(batch)
+            repaired += len(batch)
+        except Exception:
+            # Ne jamais perdre un titre: re-liker sans date (il revient en fin de liste)
+            client.current_user_saved_tracks_add(tracks=track_ids)
+            failed.extend(track_ids)
+    
+    return {'repaired': repaired, 'failed': failed}
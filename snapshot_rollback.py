@@ -0,0 +1,167 @@
+"""
+Retour d'un compte à l'état d'un snapshot: calcul et application des modifications minimales
+"""
+
+import math
+from typing import Dict, List
+
+from library_snapshot import LibrarySnapshot
+from order_repair import SAVED_TRACKS_BATCH_SIZE
+
+# Taille maximale d'un lot pour les items de playlist (ajout, remplacement, suppression)
+PLAYLIST_ITEMS_BATCH_SIZE = 100
+
+def plan_playlist_edit(snapshot_items: List[str], current_items: List[str]) -> Dict:
+    """Modification la moins coûteuse pour rendre à une playlist le contenu du snapshot
+    
+    Les syncs ne font qu'ajouter en fin de playlist: le cas courant est une fin à retirer.
+    Retourne None si la playlist n'a pas changé.
+    """
+    if snapshot_items == current_items:
+        return None
+    
+    # Items ajoutés en fin de playlist: les retirer par position
+    if current_items[:len(snapshot_items)] == snapshot_items:
+        positions = list(range(len(snapshot_items), len(current_items)))
+        return {'action': 'truncate', 'positions': positions, 'items': current_items[len(snapshot_items):],
+                'requests': math.ceil(len(positions) / PLAYLIST_ITEMS_BATCH_SIZE)}
+    
+    # Items retirés en fin de playlist: les rajouter
+    if snapshot_items[:len(current_items)] == current_items:
+        items = snapshot_items[len(current_items):]
+        return {'action': 'append', 'items': items,
+                'requests': math.ceil(len(items) / PLAYLIST_ITEMS_BATCH_SIZE)}
+    
+    # Contenu réorganisé: réécrire la playlist
+    return {'action': 'replace', 'items': snapshot_items,
+            'requests': max(1, math.ceil(len(snapshot_items) / PLAYLIST_ITEMS_BATCH_SIZE))}
+
+def compute_rollback(snapshot: LibrarySnapshot, current_liked: List[Dict], current_playlists: List[Dict]) -> Dict:
+    """Calcule les modifications qui ramènent le compte à l'état du snapshot
+    
+    current_liked: [{'id', 'added_at'}]; current_playlists: [{'id', 'name', 'owner_id', 'track_ids'}].
+    Les titres retirés depuis le snapshot sont re-likés avec leur date d'ajout d'origine,
+    ce qui les remet à leur place dans l'ordre chronologique.
+    """
+    snapshot_liked = list(snapshot.iter_liked())
+    snapshot_liked_ids = {song['id'] for song in snapshot_liked}
+    current_liked_ids = {song['id'] for song in current_liked}
+    
+    unlikes = [song['id'] for song in current_liked if song['id'] not in snapshot_liked_ids]
+    relikes = [song for song in snapshot_liked if song['id'] not in current_liked_ids]
+    
+    snapshot_playlists = {playlist['id']: playlist for playlist in snapshot.playlists()}
+    current_by_id = {playlist['id']: playlist for playlist in current_playlists}
+    
+    # Playlists créées ou suivies depuis le snapshot
+    delete_playlists = [{'id': playlist['id'], 'name': playlist['name']}
+                        for playlist in current_playlists if playlist['id'] not in snapshot_playlists]
+    
+    # Playlists disparues depuis le snapshot: recréées (nouvel ID) avec leur contenu
+    recreate_playlists = [{'id': playlist['id'], 'name': playlist['name'], 'public': playlist['public'],
+                           'description': playlist['description'],
+                           'track_ids': snapshot.playlist_items(playlist['index'])}
+                          for playlist_id, playlist in snapshot_playlists.items() if playlist_id not in current_by_id]
+    
+    edit_playlists = []
+    for playlist_id, playlist in snapshot_playlists.items():
+        current = current_by_id.get(playlist_id)
+        # Les playlists d'autres utilisateurs ne sont pas modifiables
+        if not current or current.get('owner_id') not in (None, snapshot.user_id):
+            continue
+        
+        edit = plan_playlist_edit(snapshot.playlist_items(playlist['index']), current['track_ids'])
+        if edit:
+            edit.update({'id': playlist_id, 'name': playlist['name']})
+            edit_playlists.append(edit)
+    
+    requests = (math.ceil(len(unlikes) / SAVED_TRACKS_BATCH_SIZE)
+                + math.ceil(len(relikes) / SAVED_TRACKS_BATCH_SIZE)
+                + len(delete_playlists)
+                + sum(1 + math.ceil(len(playlist['track_ids']) / PLAYLIST_ITEMS_BATCH_SIZE)
+                      for playlist in recreate_playlists)
+                + sum(edit['requests'] for edit in edit_playlists))
+    
+    return {
+        'snapshot_created_at': snapshot.created_at.isoformat(),
+        'unlikes': unlikes,
+        'relikes': relikes,
+        'delete_playlists': delete_playlists,
+        'recreate_playlists': recreate_playlists,
+        'edit_playlists': edit_playlists,
+        'requests': requests
+    }
+
+def apply_playlist_edit(client, edit: Dict):
+    """Applique une modification de playlist calculée par plan_playlist_edit"""
+    if edit['action'] == 'truncate':
+        # Retirer depuis la fin: les positions des lots suivants restent valides
+        positions = edit['positions']
+        items = edit['items']
+        for end in range(len(positions), 0, -PLAYLIST_ITEMS_BATCH_SIZE):
+            start = max(0, end - PLAYLIST_ITEMS_BATCH_SIZE)
+            occurrences = [{'uri': track_id, 'positions': [position]}
+                           for track_id, position in zip(items[start:end], positions[start:end])]
+            client.playlist_remove_specific_occurrences_of_items(edit['id'], occurrences)
+        return
+    
+    items = edit['items']
+    if edit['action'] == 'replace':
+        client.playlist_replace_items(edit['id'], items[:PLAYLIST_ITEMS_BATCH_SIZE])
+        items = items[PLAYLIST_ITEMS_BATCH_SIZE:]
+    
+    for i in range(0, len(items), PLAYLIST_ITEMS_BATCH_SIZE):
+        client.playlist_add_items(edit['id'], items[i:i + PLAYLIST_ITEMS_BATCH_SIZE])
+
+def apply_rollback(client, rollback: Dict, user_id: str) -> Dict:
+    """Applique un retour arrière par lots; une erreur sur un élément n'interrompt pas les autres
+    
+    Retourne le nombre de modifications faites, les erreurs et les nouveaux IDs des
+    playlists recréées (ancien ID → nouvel ID).
+    """
+    result = {'unliked': 0, 'reliked': 0, 'deleted_playlists': 0, 'recreated_playlists': {},
+              'edited_playlists': 0, 'errors': []}
+    
+    unlikes = rollback['unlikes']
+    for i in range(0, len(unlikes), SAVED_TRACKS_BATCH_SIZE):
+        batch = unlikes[i:i + SAVED_TRACKS_BATCH_SIZE]
+        try:
+            client.current_user_saved_tracks_delete(tracks=batch)
+            result['unliked'] += len(batch)
+        except Exception as e:
+            result['errors'].append(f"unlike de {len(batch)} titres: {e}")
+    
+    # Re-likes horodatés: chaque titre reprend sa date d'ajout d'origine
+    relikes = rollback['relikes']
+    for i in range(0, len(relikes), SAVED_TRACKS_BATCH_SIZE):
+        batch = relikes[i:i + SAVED_TRACKS_BATCH_SIZE]
+        try:
+            client.save_tracks_with_timestamps(batch)
+            result['reliked'] += len(batch)
+        except Exception as e:
+            result['errors'].append(f"re-like de {len(batch)} titres: {e}")
+    
+    for playlist in rollback['delete_playlists']:
+        try:
+            client.current_user_unfollow_playlist(playlist['id'])
+            result['deleted_playlists'] += 1
+        except Exception as e:
+            result['errors'].append(f"suppression de la playlist '{playlist['name']}': {e}")
+    
+    for playlist in rollback['recreate_playlists']:
+        try:
+            new_playlist = client.user_playlist_create(user=user_id, name=playlist['name'], public=playlist['public'],
+                                                       description=playlist['description'])
+            result['recreated_playlists'][playlist['id']] = new_playlist['id']
+            apply_playlist_edit(client, {'id': new_playlist['id'], 'action': 'append', 'items': playlist['track_ids']})
+        except Exception as e:
+            result['errors'].append(f"recréation de la playlist '{playlist['name']}': {e}")
+    
+    for edit in rollback['edit_playlists']:
+        try:
+            apply_playlist_edit(client, edit)
+            result['edited_playlists'] += 1
+        except Exception as e:
+            result['errors'].append(f"modification de la playlist '{edit['name']}': {e}")
+    
+    return result
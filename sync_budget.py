@@ -0,0 +1,104 @@
+"""
+Budget de travail d'un cycle de synchronisation (tracks, requêtes, durée)
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+class SyncBudget:
+    """Limite le travail effectué pendant un cycle de synchronisation
+    
+    Chaque limite est optionnelle (None = illimitée). Le travail non effectué
+    est simplement reporté: le diff du cycle suivant le retrouvera.
+    """
+    
+    def __init__(self, max_tracks: Optional[int] = None, max_requests: Optional[int] = None,
+                 max_seconds: Optional[float] = None):
+        self.max_tracks = max_tracks
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        
+        self.start_time = time.monotonic()
+        self.used_tracks = 0
+        self.used_requests = 0
+        
+        # Les phases d'un cycle peuvent s'exécuter en parallèle (mode concurrent_phases)
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, sync_settings: Dict) -> 'SyncBudget':
+        """Construit le budget à partir de la section sync_settings de la configuration"""
+        max_minutes = sync_settings.get('max_sync_duration_minutes')
+        return cls(
+            max_tracks=sync_settings.get('max_tracks_per_sync') or None,
+            max_requests=sync_settings.get('max_requests_per_sync') or None,
+            max_seconds=max_minutes * 60 if max_minutes else None
+        )
+    
+    def elapsed(self) -> float:
+        """Durée écoulée depuis le début du cycle (secondes)"""
+        return time.monotonic() - self.start_time
+    
+    def remaining_tracks(self) -> Optional[int]:
+        """Nombre de tracks encore autorisées dans ce cycle (None = illimité)"""
+        if self.max_tracks is None:
+            return None
+        return max(0, self.max_tracks - self.used_tracks)
+    
+    def consume_tracks(self, count: int = 1):
+        """Comptabilise des tracks écrites sur le compte destination"""
+        with self.lock:
+            self.used_tracks += count
+    
+    def consume_requests(self, count: int = 1):
+        """Comptabilise des requêtes envoyées à l'API"""
+        with self.lock:
+            self.used_requests += count
+    
+    def exhausted(self) -> bool:
+        """Indique si une des limites du cycle est atteinte"""
+        if self.max_tracks is not None and self.used_tracks >= self.max_tracks:
+            return True
+        if self.max_requests is not None and self.used_requests >= self.max_requests:
+            return True
+        if self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            return True
+        return False
+    
+    def fair_shares(self, needs: List[int]) -> List[Optional[int]]:
+        """Répartit équitablement les tracks restantes entre plusieurs phases
+        
+        Partage max-min: chaque phase reçoit au plus ce dont elle a besoin, et la part
+        inutilisée d'une phase est redistribuée aux autres.
+        """
+        remaining = self.remaining_tracks()
+        if remaining is None:
+            return [None] * len(needs)
+        
+        shares = [0] * len(needs)
+        pending = [i for i, need in enumerate(needs) if need > 0]
+        
+        while pending and remaining > 0:
+            share = max(1, remaining // len(pending))
+            still_pending = []
+            for i in pending:
+                grant = min(share, needs[i] - shares[i], remaining)
+                shares[i] += grant
+                remaining -= grant
+                if shares[i] < needs[i]:
+                    still_pending.append(i)
+            pending = still_pending
+        
+        return shares
+    
+    def get_summary(self) -> Dict:
+        """Retourne l'état du budget pour les statistiques"""
+        return {
+            'used_tracks': self.used_tracks,
+            'used_requests': self.used_requests,
+            'elapsed_seconds': round(self.elapsed(), 1),
+            'max_tracks': self.max_tracks,
+            'max_requests': self.max_requests,
+            'max_seconds': self.max_seconds
+        }
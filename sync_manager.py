@@ -1,27 +1,172 @@
 import spotipy
 import json
 import logging
-from typing import List, Dict, Optional, Set
+import math
+from typing import List, Dict, Iterator, Optional, Set
 from datetime import datetime
 import time
+import os
+import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import zip_longest
 from utils import get_french_datetime
+from sync_budget import SyncBudget
+from api_client import ResilientSpotifyClient, RetryPolicy, CircuitBreaker, RateLimiter
+from sync_profiler import SyncProfiler
+from adaptive_control import AdaptiveController
+from api_quota import ApiQuota
+from order_repair import compute_order_repair, apply_order_repair, SAVED_TRACKS_BATCH_SIZE
+from library_snapshot import LibrarySnapshot, write_snapshot
+from snapshot_rollback import compute_rollback, apply_rollback, plan_playlist_edit, apply_playlist_edit
+from library_backup import BackupWriter, read_backup, inspect_backup
+from library_collections import LIBRARY_COLLECTIONS, collection_item, collection_total
+from sync_verify import sample_offsets, page_ids, summarize_verification
+
+# Version du format des fichiers de plan (commandes plan/apply)
+PLAN_FORMAT_VERSION = 1
+
+# Latence moyenne estimée d'une requête à l'API Spotify (secondes)
+ESTIMATED_REQUEST_LATENCY = 0.2
+
+# Fichier de correspondance playlist source → playlist destination
+DEFAULT_PLAYLIST_MAPPING_FILE = ".playlist_mapping.json"
+PLAYLIST_MAPPING_LOCK = threading.Lock()
+
+# Taille maximale d'un lot pour la recherche de tracks dans le catalogue (/tracks)
+CATALOG_LOOKUP_BATCH_SIZE = 50
+
+# Projection des pages de playlist: seuls les IDs des tracks et la pagination sont transférés
+PLAYLIST_TRACKS_FIELDS = "items(track(id)),next,total"
+
+# Dossier des snapshots de la destination pris avant chaque cycle (retour arrière)
+DEFAULT_ROLLBACK_DIRECTORY = "snapshots"
 
 class SpotifySyncManager:
     """Gestionnaire principal pour la synchronisation entre deux comptes Spotify"""
     
-    def __init__(self, source_client: spotipy.Spotify, target_client: spotipy.Spotify, config_path: str = "config.json"):
-        self.source_client = source_client
-        self.target_client = target_client
-        self.config = self.load_config(config_path)
+    def __init__(self, source_client: spotipy.Spotify, target_client: spotipy.Spotify, config_path: str = "config.json",
+                 config: Optional[Dict] = None, target_name: str = 'target'):
         self.logger = logging.getLogger(__name__)
+        self.config = config if config is not None else self.load_config(config_path)
+        self.target_name = target_name
+        
+        # Tous les appels API passent par la couche de retry (disjoncteur et débit par compte)
+        self.source_client = self.wrap_client(source_client, 'source')
+        self.target_client = self.wrap_client(target_client, target_name)
+        self.source_client.add_listener(self.on_api_request)
+        self.target_client.add_listener(self.on_api_request)
+        
+        # Requêtes comptées sur 24 h glissantes, persistées (une instance partagée par fichier)
+        self.quota = ApiQuota.shared(self.config.get('quota', {}))
+        self.quota.attach(self.source_client)
+        self.quota.attach(self.target_client)
+        
+        # État propre au thread courant (réserve de quota d'une phase, mode concurrent_phases)
+        self.cycle_local = threading.local()
+        self.quota_floor = 0
         
         # Cache pour éviter les doublons
         self.synced_tracks = set()
         self.synced_playlists = set()
+        self.synced_collections = {kind: set() for kind in LIBRARY_COLLECTIONS}
+        
+        # Likes connus de la destination (lecture complète + écritures), réutilisés d'un cycle à l'autre
+        self.target_liked_ids = None
+        
+        # Tracks injouables sur le compte destination (ID → raison), vérifiées avant écriture
+        self.unavailable_tracks = {}
+        self.session_unavailable_tracks = set()
+        
+        # Tracks vérifiées jouables pendant le cycle en cours (une seule vérification pour les deux phases)
+        self.playable_tracks = set()
         
-        # Compteurs pour la session actuelle
+        # Compteurs pour la session actuelle (mis à jour sous verrou: les phases peuvent être parallèles)
         self.session_synced_tracks = 0
         self.session_synced_playlists = 0
+        self.session_synced_collections = {kind: 0 for kind in LIBRARY_COLLECTIONS}
+        self.counters_lock = threading.Lock()
+        
+        # Correspondance playlist source → copie destination (chargée à la demande)
+        self.source_user_id = None
+        self.target_user_id = None
+        self.playlist_mapping = None
+        # Correspondance initiale retrouvée par nom lors d'un plan ou d'une simulation, pas encore écrite
+        self.playlist_mapping_unsaved = False
+        
+        # Budget du cycle en cours (uniquement pendant full_sync) et travail reporté
+        self.budget = None
+        self.budget_threads = set()
+        self.last_budget_summary = None
+        self.pending_work = {'tracks_to_like': 0, 'playlists': 0, 'library_items': 0}
+        self.deferred_work = []
+        
+        # Profileur par phase (option --profile) et traceur des appels API (option --trace)
+        self.profiler = None
+        self.tracer = None
+        self.trace_cycle_id = None
+        
+        # Bibliothèque source partagée entre plusieurs destinations (mode fan-out)
+        self.source_library = None
+    
+    def wrap_client(self, client: spotipy.Spotify, account: str) -> ResilientSpotifyClient:
+        """Enveloppe un client avec la politique de retry, le disjoncteur et le limiteur de la configuration
+        
+        Un limiteur déjà configuré est conservé: un client partagé entre plusieurs
+        gestionnaires (source en mode fan-out) garde un seul débit.
+        """
+        rate_limiting = self.config.get('rate_limiting', {})
+        limiter = None
+        if not (isinstance(client, ResilientSpotifyClient) and client.limiter.rate):
+            limiter = RateLimiter.from_config(rate_limiting)
+        client = ResilientSpotifyClient.wrap(client, account, RetryPolicy.from_config(rate_limiting),
+                                             CircuitBreaker.from_config(rate_limiting), limiter)
+        
+        # Lots, pauses et concurrence ajustés en continu (AIMD), un contrôleur par compte
+        adaptive_control = self.config.get('adaptive_control', {})
+        if adaptive_control.get('enabled', True) and not client.controller:
+            client.set_controller(AdaptiveController.from_config(account, adaptive_control))
+        
+        return client
+    
+    @property
+    def quota_floor(self) -> int:
+        """Réserve du quota quotidien que la phase en cours (dans ce thread) ne doit pas entamer"""
+        return getattr(self.cycle_local, 'quota_floor', 0)
+    
+    @quota_floor.setter
+    def quota_floor(self, value: int):
+        self.cycle_local.quota_floor = value
+    
+    def concurrent_phases(self) -> bool:
+        """Vrai si les lectures et les phases d'un cycle s'exécutent en parallèle (sync_settings.concurrent_phases)"""
+        return bool(self.config['sync_settings'].get('concurrent_phases', False))
+    
+    def run_concurrently(self, *calls) -> list:
+        """Exécute des appels (fonction, arguments...) en parallèle et retourne leurs résultats dans l'ordre
+        
+        Chaque appel s'exécute dans un thread rattaché au cycle en cours (budget et traçage);
+        l'exception d'un appel est relevée une fois tous les appels terminés.
+        """
+        with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix=f'sync-{self.target_name}') as executor:
+            futures = [executor.submit(self.run_in_cycle, *call) for call in calls]
+            return [future.result() for future in futures]
+    
+    def run_in_cycle(self, function, *args):
+        """Exécute une fonction dans un thread de travail comme si elle était appelée par le cycle"""
+        thread_id = threading.get_ident()
+        with self.counters_lock:
+            self.budget_threads.add(thread_id)
+        if self.tracer:
+            self.tracer.join_cycle(self.trace_cycle_id, self.target_name)
+        
+        try:
+            return function(*args)
+        finally:
+            with self.counters_lock:
+                self.budget_threads.discard(thread_id)
     
     def load_config(self, config_path: str) -> Dict:
         """Charge la configuration depuis le fichier JSON"""
@@ -42,49 +187,128 @@ class SpotifySyncManager:
                 "sync_liked_songs": True,
                 "sync_playlists": True,
                 "sync_interval_minutes": 30,
-                "max_tracks_per_sync": 100
+                "max_tracks_per_sync": 100,
+                "max_requests_per_sync": None,
+                "max_sync_duration_minutes": None,
+                "preflight_check": True,
+                "concurrent_phases": False,
+                "sync_saved_albums": False,
+                "sync_followed_artists": False,
+                "sync_saved_shows": False
             },
             "playlist_settings": {
                 "excluded_playlists": ["Discover Weekly", "Release Radar"],
                 "create_copy_suffix": " (Copy)",
+                "mapping_file": DEFAULT_PLAYLIST_MAPPING_FILE,
                 "preserve_playlist_order": True,
-                "sync_collaborative_playlists": False
+                "sync_collaborative_playlists": False,
+                "follow_non_owned_playlists": False
+            },
+            "rate_limiting": {
+                "requests_per_second": 10,
+                "retry_attempts": 5,
+                "retry_base_delay_seconds": 1,
+                "retry_max_delay_seconds": 60,
+                "circuit_breaker_threshold": 5,
+                "circuit_breaker_reset_seconds": 60
+            },
+            "adaptive_control": {
+                "enabled": True,
+                "latency_target_seconds": 2.0,
+                "max_concurrency": 4
+            },
+            "verification": {
+                "liked_samples": 5,
+                "playlist_samples": 5,
+                "confidence": 0.95
+            },
+            "rollback": {
+                "snapshot_before_sync": False,
+                "directory": DEFAULT_ROLLBACK_DIRECTORY,
+                "keep_snapshots": 10
+            },
+            "quota": {
+                "file": ".api_quota.json",
+                "daily_request_budget": None,
+                "headroom_requests": 500
+            },
+            "trigger_settings": {
+                "enabled": False,
+                "host": "127.0.0.1",
+                "port": 8765,
+                "debounce_seconds": 5,
+                "token": None
+            },
+            "tracing": {
+                "enabled": False,
+                "file": "api_trace.jsonl",
+                "flush_interval_seconds": 1.0
+            },
+            "fanout_settings": {
+                "targets": ["target"],
+                "max_workers": 4
+            },
+            "merge_settings": {
+                "sources": ["source"]
             }
         }
     
-    def get_liked_songs(self, client: spotipy.Spotify) -> List[Dict]:
-        """Récupère toutes les chansons likées d'un compte"""
-        liked_songs = []
+    def iter_pages(self, client: spotipy.Spotify, endpoint: str, limit: int, *args, **kwargs) -> Iterator[Dict]:
+        """Parcourt un endpoint paginé page par page (taille ajustée par le contrôleur adaptatif)
+        
+        Seule la page courante est en mémoire; la dernière page est détectée par 'next'
+        pour ne pas demander de page vide.
+        """
         offset = 0
-        limit = 50
+        
+        while True:
+            page_size = self.batch_size(client, endpoint, limit)
+            results = getattr(client, endpoint)(*args, limit=page_size, offset=offset, **kwargs)
+            
+            if not results['items']:
+                break
+            
+            yield results
+            
+            if not results.get('next'):
+                break
+            
+            offset += page_size
+            
+            # Respecter les limites de taux de l'API
+            self.pace(client, endpoint, 0.1)
+    
+    def get_liked_songs(self, client: spotipy.Spotify, id_only: bool = False) -> List[Dict]:
+        """Récupère toutes les chansons likées d'un compte
+        
+        Avec id_only=True, seuls l'ID et la date d'ajout sont conservés (suffisant pour le diff),
+        ce qui réduit fortement la mémoire occupée pour les grosses bibliothèques.
+        """
+        liked_songs = []
         
         self.logger.info("Récupération des chansons likées...")
         
-        while True:
-            try:
-                results = client.current_user_saved_tracks(limit=limit, offset=offset)
-                
-                if not results['items']:
-                    break
-                
+        try:
+            for results in self.iter_pages(client, 'current_user_saved_tracks', 50):
                 for item in results['items']:
                     track = item['track']
                     if track and track['id']:  # Vérifier que la track existe et a un ID
-                        liked_songs.append({
-                            'id': track['id'],
-                            'name': track['name'],
-                            'artists': [artist['name'] for artist in track['artists']],
-                            'added_at': item['added_at']
-                        })
-                
-                offset += limit
-                
-                # Respecter les limites de taux de l'API
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Erreur lors de la récupération des chansons likées: {e}")
-                break
+                        if id_only:
+                            liked_songs.append({
+                                'id': track['id'],
+                                'added_at': item['added_at']
+                            })
+                        else:
+                            liked_songs.append({
+                                'id': track['id'],
+                                'name': track['name'],
+                                'artists': [artist['name'] for artist in track['artists']],
+                                'added_at': item['added_at']
+                            })
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la récupération des chansons likées: {e}")
+            # Ne pas continuer avec des données tronquées
+            raise
         
         # Inverser l'ordre pour préserver la chronologie originale
         # (API Spotify retourne les plus récentes en premier, on veut les plus anciennes d'abord)
@@ -93,6 +317,223 @@ class SpotifySyncManager:
         self.logger.info(f"Récupéré {len(liked_songs)} chansons likées (ordre chronologique préservé)")
         return liked_songs
     
+    def plan_liked_songs(self) -> Dict:
+        """Calcule les chansons likées à synchroniser sans rien modifier
+        
+        En mode concurrent_phases, la destination est lue pendant la lecture de la source.
+        """
+        # Récupérer les chansons likées du compte source (ID et date suffisent pour le diff)
+        def fetch_source():
+            with self.phase('fetch_source'):
+                return self.fetch_source_liked_songs()
+        
+        prefetched = None
+        if self.concurrent_phases():
+            source_liked, prefetched = self.run_concurrently((fetch_source,), (self.prefetch_target_liked_songs,))
+        else:
+            source_liked = fetch_source()
+        
+        plan = self.select_tracks_to_like([track['id'] for track in source_liked], prefetched)
+        plan['source_count'] = len(source_liked)
+        return plan
+    
+    def prefetch_target_liked_songs(self) -> Dict:
+        """Lit la destination pendant la lecture de la source (mode concurrent_phases)
+        
+        La taille de la destination est sondée; sans likes connus, la lecture complète est faite
+        tout de suite si elle ne coûte pas plus de requêtes que la lecture de la source (le diff
+        la choisirait alors de toute façon). Retourne {'target_count', 'fetched'}.
+        """
+        with self.phase('fetch_target'):
+            target_count = self.target_client.current_user_saved_tracks(limit=1)['total']
+        
+        if self.target_liked_ids is not None or target_count == 0:
+            return {'target_count': target_count, 'fetched': False}
+        
+        with self.phase('fetch_source'):
+            source_count = self.source_client.current_user_saved_tracks(limit=1)['total']
+        if math.ceil(target_count / SAVED_TRACKS_BATCH_SIZE) > math.ceil(source_count / SAVED_TRACKS_BATCH_SIZE):
+            return {'target_count': target_count, 'fetched': False}
+        
+        with self.phase('fetch_target'):
+            target_liked = self.get_liked_songs(self.target_client, id_only=True)
+        self.target_liked_ids = {song['id'] for song in target_liked}
+        return {'target_count': target_count, 'fetched': True}
+    
+    def is_candidate_track(self, track_id: str) -> bool:
+        """Vrai si une chanson source n'est pas déjà connue sur la destination (ni écartée)"""
+        return (track_id not in self.synced_tracks and track_id not in self.unavailable_tracks
+                and (self.target_liked_ids is None or track_id not in self.target_liked_ids))
+    
+    def select_tracks_to_like(self, source_ids: List[str], prefetched: Optional[Dict] = None) -> Dict:
+        """Filtre les chansons source (ordre chronologique) déjà likées sur la destination
+        
+        Choisit la vérification la moins coûteuse en requêtes: aucune si la destination est vide,
+        /me/tracks/contains par lots de 50 si les candidates sont peu nombreuses par rapport
+        à la bibliothèque destination, lecture complète de la destination sinon.
+        prefetched est le résultat de prefetch_target_liked_songs (destination déjà lue).
+        """
+        fetched = bool(prefetched and prefetched['fetched'])
+        
+        with self.phase('fetch_target'):
+            # Une requête d'une track pour connaître la taille de la bibliothèque destination
+            if prefetched:
+                target_count = prefetched['target_count']
+            else:
+                target_count = self.target_client.current_user_saved_tracks(limit=1)['total']
+        
+        # Des likes ou unlikes faits ailleurs sur la destination invalident les likes connus
+        if not fetched and self.target_liked_ids is not None and len(self.target_liked_ids) != target_count:
+            self.logger.info("Bibliothèque destination modifiée depuis le dernier cycle, likes connus ignorés")
+            self.target_liked_ids = None
+        
+        with self.phase('diff'):
+            candidates = list(dict.fromkeys(track_id for track_id in source_ids if self.is_candidate_track(track_id)))
+        
+        contains_cost = math.ceil(len(candidates) / SAVED_TRACKS_BATCH_SIZE)
+        fetch_cost = math.ceil(target_count / SAVED_TRACKS_BATCH_SIZE)
+        
+        if fetched:
+            # Likes connus tout juste lus: les candidates sont exactement les likes manquants
+            target_check = 'full_fetch'
+            tracks_to_like = candidates
+        elif not candidates or target_count == 0:
+            target_check = 'none'
+            tracks_to_like = candidates
+        elif contains_cost < fetch_cost:
+            target_check = 'contains'
+            with self.phase('fetch_target'):
+                tracks_to_like = self.filter_saved_tracks(candidates)
+        else:
+            target_check = 'full_fetch'
+            with self.phase('fetch_target'):
+                target_liked = self.get_liked_songs(self.target_client, id_only=True)
+            with self.phase('diff'):
+                self.target_liked_ids = {song['id'] for song in target_liked}
+                tracks_to_like = [track_id for track_id in candidates if track_id not in self.target_liked_ids]
+        
+        self.logger.info(f"Vérification de la destination ({target_count} likes): {target_check}, "
+                         f"{len(candidates)} candidates, {len(tracks_to_like)} à liker")
+        return {
+            'target_count': target_count,
+            'target_check': target_check,
+            'tracks_to_like': tracks_to_like
+        }
+    
+    def filter_saved_tracks(self, track_ids: List[str]) -> List[str]:
+        """Retourne, dans l'ordre, les tracks absentes de la bibliothèque destination (/me/tracks/contains)"""
+        missing = []
+        i = 0
+        
+        while i < len(track_ids):
+            batch_size = self.batch_size(self.target_client, 'current_user_saved_tracks_contains', SAVED_TRACKS_BATCH_SIZE)
+            batch = track_ids[i:i + batch_size]
+            i += len(batch)
+            
+            saved = self.target_client.current_user_saved_tracks_contains(tracks=batch)
+            for track_id, is_saved in zip(batch, saved):
+                if not is_saved:
+                    missing.append(track_id)
+                elif self.target_liked_ids is not None:
+                    self.target_liked_ids.add(track_id)
+            
+            if i < len(track_ids):
+                self.pace(self.target_client, 'current_user_saved_tracks_contains', 0.1)
+        
+        return missing
+    
+    def apply_liked_songs(self, track_ids: List[str]) -> bool:
+        """Like les chansons données sur le compte destination, dans l'ordre"""
+        with self.phase('write_likes'):
+            return self.write_liked_songs(track_ids)
+    
+    def write_liked_songs(self, track_ids: List[str]) -> bool:
+        """Écrit les likes un par un pour préserver l'ordre chronologique exact"""
+        self.logger.info(f"Synchronisation de {len(track_ids)} nouvelles chansons (une par une pour préserver l'ordre)")
+        
+        # Écarter d'avance les chansons injouables plutôt que d'échouer à l'écriture
+        self.check_playability(track_ids)
+        
+        # Liker les chansons UNE PAR UNE pour préserver l'ordre chronologique exact
+        for i, track_id in enumerate(track_ids):
+            if self.budget_exhausted():
+                self.logger.info(f"Budget du cycle atteint, {len(track_ids) - i} chansons reportées au prochain cycle")
+                break
+            
+            if track_id in self.unavailable_tracks:
+                continue
+            
+            try:
+                # Liker une seule chanson à la fois (les erreurs transitoires sont retentées par le client)
+                self.target_client.current_user_saved_tracks_add(tracks=[track_id])
+                
+                # Marquer comme synchronisé
+                self.synced_tracks.add(track_id)
+                if self.target_liked_ids is not None:
+                    self.target_liked_ids.add(track_id)
+                with self.counters_lock:
+                    self.session_synced_tracks += 1  # Compter pour cette session
+                if self.budget:
+                    self.budget.consume_tracks(1)
+                
+                self.logger.info(f"Chanson {i+1}/{len(track_ids)} likée avec succès")
+                
+                # Pause pour éviter les timeouts; jamais moins d'une seconde car added_at
+                # est à la seconde près et l'ordre des likes en dépend
+                self.pace(self.target_client, 'current_user_saved_tracks_add', 1, minimum=1)
+                
+            except Exception as e:
+                self.logger.error(f"Échec définitif chanson {i+1}: {e}")
+        
+        self.logger.info("Synchronisation des chansons likées terminée avec succès")
+        return True
+    
+    def check_playability(self, track_ids: List[str]) -> Dict[str, str]:
+        """Vérifie par lots dans le catalogue (marché du compte destination) que les tracks sont jouables
+        
+        Les tracks introuvables ou indisponibles sont ajoutées à unavailable_tracks et retournées
+        (ID → raison). En cas d'échec de la vérification, les tracks sont considérées jouables.
+        """
+        if not self.config['sync_settings'].get('preflight_check', True):
+            return {}
+        
+        candidates = list(dict.fromkeys(track_id for track_id in track_ids
+                                        if track_id not in self.unavailable_tracks and track_id not in self.synced_tracks
+                                        and track_id not in self.playable_tracks))
+        unavailable = {}
+        
+        with self.phase('preflight'):
+            i = 0
+            while i < len(candidates):
+                batch_size = self.batch_size(self.target_client, 'tracks', CATALOG_LOOKUP_BATCH_SIZE)
+                batch = candidates[i:i + batch_size]
+                i += len(batch)
+                
+                try:
+                    results = self.target_client.tracks(batch, market='from_token')
+                except Exception as e:
+                    self.logger.warning(f"Vérification de disponibilité impossible ({len(batch)} tracks): {e}")
+                    continue
+                
+                for track_id, track in zip(batch, results.get('tracks') or []):
+                    if not track:
+                        unavailable[track_id] = 'introuvable'
+                    elif track.get('is_playable') is False:
+                        unavailable[track_id] = (track.get('restrictions') or {}).get('reason') or 'indisponible sur ce marché'
+                
+                with self.counters_lock:
+                    self.playable_tracks.update(track_id for track_id in batch if track_id not in unavailable)
+        
+        if unavailable:
+            with self.counters_lock:
+                self.unavailable_tracks.update(unavailable)
+                self.session_unavailable_tracks.update(unavailable)
+            details = ', '.join(f"{track_id} ({reason})" for track_id, reason in list(unavailable.items())[:10])
+            self.logger.warning(f"{len(unavailable)} tracks injouables sur le compte destination ignorées: {details}"
+                                + (" ..." if len(unavailable) > 10 else ""))
+        
+        return unavailable
+    
     def sync_liked_songs(self) -> bool:
         """Synchronise les chansons likées du compte source vers le compte destination"""
         if not self.config['sync_settings']['sync_liked_songs']:
@@ -102,99 +543,51 @@ class SpotifySyncManager:
         try:
             self.logger.info("Début de la synchronisation des chansons likées")
             
-            # Récupérer les chansons likées du compte source
-            source_liked = self.get_liked_songs(self.source_client)
-            
-            # Récupérer les chansons déjà likées sur le compte destination
-            target_liked = self.get_liked_songs(self.target_client)
-            target_liked_ids = {song['id'] for song in target_liked}
+            liked_plan = self.plan_liked_songs()
             
-            # Identifier les nouvelles chansons à liker
-            new_tracks_to_like = []
-            for track in source_liked:
-                if track['id'] not in target_liked_ids and track['id'] not in self.synced_tracks:
-                    new_tracks_to_like.append(track['id'])
-            
-            if not new_tracks_to_like:
+            if not liked_plan['tracks_to_like']:
                 self.logger.info("Aucune nouvelle chanson à synchroniser")
                 return True
             
-            self.logger.info(f"Synchronisation de {len(new_tracks_to_like)} nouvelles chansons (une par une pour préserver l'ordre)")
-            
-            # Liker les chansons UNE PAR UNE pour préserver l'ordre chronologique exact
-            for i, track_id in enumerate(new_tracks_to_like):
-                success = False
-                retry_count = 0
-                max_retries = 3
-                
-                while not success and retry_count < max_retries:
-                    try:
-                        # Liker une seule chanson à la fois
-                        self.target_client.current_user_saved_tracks_add(tracks=[track_id])
-                        
-                        # Marquer comme synchronisé
-                        self.synced_tracks.add(track_id)
-                        self.session_synced_tracks += 1  # Compter pour cette session
-                        
-                        self.logger.info(f"Chanson {i+1}/{len(new_tracks_to_like)} likée avec succès")
-                        success = True
-                        
-                        # Pause optimisée pour éviter les timeouts
-                        time.sleep(1)
-                        
-                    except Exception as e:
-                        retry_count += 1
-                        if retry_count < max_retries:
-                            self.logger.warning(f"Erreur chanson {i+1} (tentative {retry_count}/{max_retries}): {e}")
-                            self.logger.info(f"Retry dans 2 secondes...")
-                            time.sleep(2.0)  # Pause plus longue avant retry
-                        else:
-                            self.logger.error(f"Échec définitif chanson {i+1} après {max_retries} tentatives: {e}")
-                
-                # Pas de pause - test de vitesse maximale
-            
-            self.logger.info("Synchronisation des chansons likées terminée avec succès")
-            return True
+            return self.apply_liked_songs(liked_plan['tracks_to_like'])
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la synchronisation des chansons likées: {e}")
             return False
     
-    def get_playlists(self, client: spotipy.Spotify) -> List[Dict]:
-        """Récupère toutes les playlists d'un utilisateur"""
+    def get_playlists(self, client: spotipy.Spotify, apply_filters: bool = True) -> List[Dict]:
+        """Récupère toutes les playlists d'un utilisateur
+        
+        Avec apply_filters=False, les playlists exclues et collaboratives sont aussi retournées.
+        """
         playlists = []
-        offset = 0
-        limit = 50
         
         self.logger.info("Récupération des playlists...")
         
-        while True:
-            try:
-                results = client.current_user_playlists(limit=limit, offset=offset)
-                
-                if not results['items']:
-                    break
-                
+        try:
+            for results in self.iter_pages(client, 'current_user_playlists', 50):
                 for playlist in results['items']:
+                    # Les playlists suivies peuvent être nulles (supprimées par leur propriétaire)
+                    if not playlist:
+                        continue
+                    
                     # Filtrer les playlists exclues
-                    if playlist['name'] not in self.config['playlist_settings']['excluded_playlists']:
+                    if not apply_filters or playlist['name'] not in self.config['playlist_settings']['excluded_playlists']:
                         # Filtrer les playlists collaboratives si désactivé
-                        if not playlist['collaborative'] or self.config['playlist_settings']['sync_collaborative_playlists']:
+                        if not apply_filters or not playlist['collaborative'] or self.config['playlist_settings']['sync_collaborative_playlists']:
                             playlists.append({
                                 'id': playlist['id'],
                                 'name': playlist['name'],
                                 'description': playlist['description'],
                                 'public': playlist['public'],
                                 'collaborative': playlist['collaborative'],
+                                'owner_id': (playlist.get('owner') or {}).get('id'),
                                 'track_count': playlist['tracks']['total']
                             })
-                
-                offset += limit
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Erreur lors de la récupération des playlists: {e}")
-                break
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la récupération des playlists: {e}")
+            # Ne pas continuer avec des données tronquées
+            raise
         
         self.logger.info(f"Récupéré {len(playlists)} playlists")
         return playlists
@@ -202,35 +595,192 @@ class SpotifySyncManager:
     def get_playlist_tracks(self, client: spotipy.Spotify, playlist_id: str) -> List[str]:
         """Récupère tous les IDs des tracks d'une playlist"""
         track_ids = []
-        offset = 0
-        limit = 100
         
-        while True:
-            try:
-                results = client.playlist_tracks(playlist_id, limit=limit, offset=offset, fields="items(track(id))")
-                
-                if not results['items']:
-                    break
-                
+        try:
+            for results in self.iter_pages(client, 'playlist_tracks', 100, playlist_id,
+                                           fields=PLAYLIST_TRACKS_FIELDS, additional_types=('track',)):
                 for item in results['items']:
                     if item['track'] and item['track']['id']:
                         track_ids.append(item['track']['id'])
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la récupération des tracks de la playlist: {e}")
+            # Ne pas continuer avec des données tronquées
+            raise
+        
+        return track_ids
+    
+    def fetch_source_liked_songs(self) -> List[Dict]:
+        """Chansons likées du compte source (ID et date), lues une seule fois en mode fan-out"""
+        if self.source_library:
+            return self.source_library.liked_songs()
+        return self.get_liked_songs(self.source_client, id_only=True)
+    
+    def fetch_source_playlists(self) -> List[Dict]:
+        """Playlists du compte source, lues une seule fois en mode fan-out"""
+        if self.source_library:
+            return self.source_library.playlists()
+        return self.get_playlists(self.source_client)
+    
+    def fetch_source_playlist_tracks(self, playlist_id: str) -> List[str]:
+        """Tracks d'une playlist source, lues une seule fois en mode fan-out"""
+        if self.source_library:
+            return self.source_library.playlist_tracks(playlist_id)
+        return self.get_playlist_tracks(self.source_client, playlist_id)
+    
+    def get_source_user_id(self) -> str:
+        """Retourne l'ID de l'utilisateur source (mis en cache)"""
+        if not self.source_user_id:
+            self.source_user_id = self.source_client.current_user()['id']
+        return self.source_user_id
+    
+    def should_follow_playlist(self, source_playlist: Dict) -> bool:
+        """Vrai si une playlist source doit être suivie plutôt que copiée
+        
+        Seules les playlists publiques d'un autre utilisateur sont suivies (mode
+        follow_non_owned_playlists): une copie serait aussitôt périmée.
+        """
+        if not self.config['playlist_settings'].get('follow_non_owned_playlists', False):
+            return False
+        owner_id = source_playlist.get('owner_id')
+        return bool(owner_id) and source_playlist.get('public') is not False and owner_id != self.get_source_user_id()
+    
+    def follow_playlist(self, source_playlist: Dict) -> bool:
+        """Suit une playlist source depuis le compte destination et enregistre la correspondance"""
+        try:
+            self.target_client.current_user_follow_playlist(source_playlist['id'])
+        except Exception as e:
+            self.logger.error(f"Erreur lors du suivi de la playlist '{source_playlist['name']}': {e}")
+            return False
+        
+        if self.playlist_mapping is None:
+            self.playlist_mapping = self.load_playlist_mapping() or {}
+        self.playlist_mapping[source_playlist['id']] = {
+            'target_id': source_playlist['id'],
+            'source_name': source_playlist['name'],
+            'followed': True
+        }
+        self.save_playlist_mapping()
+        return True
+    
+    def get_target_user_id(self) -> str:
+        """Retourne l'ID de l'utilisateur destination (mis en cache)"""
+        if not self.target_user_id:
+            self.target_user_id = self.target_client.current_user()['id']
+        return self.target_user_id
+    
+    def get_mapping_file(self) -> str:
+        """Retourne le chemin du fichier de correspondance des playlists"""
+        return self.config['playlist_settings'].get('mapping_file', DEFAULT_PLAYLIST_MAPPING_FILE)
+    
+    def load_playlist_mapping(self) -> Optional[Dict]:
+        """Charge la correspondance playlist source → playlist destination du compte destination
+        
+        Retourne None si aucune correspondance n'a encore été enregistrée pour ce compte.
+        """
+        target_user_id = self.get_target_user_id()
+        
+        with PLAYLIST_MAPPING_LOCK:
+            try:
+                with open(self.get_mapping_file(), 'r', encoding='utf-8') as f:
+                    mappings = json.load(f)
+            except FileNotFoundError:
+                return None
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Fichier de correspondance des playlists illisible: {e}")
+                return None
+        
+        return mappings.get(target_user_id)
+    
+    def save_playlist_mapping(self):
+        """Sauvegarde la correspondance des playlists du compte destination"""
+        target_user_id = self.get_target_user_id()
+        mapping_file = self.get_mapping_file()
+        
+        with PLAYLIST_MAPPING_LOCK:
+            try:
+                mappings = {}
+                if os.path.exists(mapping_file):
+                    with open(mapping_file, 'r', encoding='utf-8') as f:
+                        mappings = json.load(f)
                 
-                offset += limit
-                time.sleep(0.1)
+                mappings[target_user_id] = self.playlist_mapping
                 
+                with open(mapping_file, 'w', encoding='utf-8') as f:
+                    json.dump(mappings, f, indent=2, ensure_ascii=False)
+                self.playlist_mapping_unsaved = False
+                    
             except Exception as e:
-                self.logger.error(f"Erreur lors de la récupération des tracks de la playlist: {e}")
-                break
+                self.logger.error(f"Erreur lors de la sauvegarde de la correspondance des playlists: {e}")
+    
+    def get_playlist_mapping(self, source_playlists: List[Dict], persist: bool = True) -> Dict:
+        """Retourne la correspondance des playlists, en l'initialisant au premier lancement
         
-        return track_ids
+        Lors du tout premier lancement pour un compte destination, les copies créées
+        par les versions précédentes sont retrouvées une seule fois par leur nom. Avec
+        persist=False (plan, simulation), cette correspondance reste en mémoire.
+        """
+        if self.playlist_mapping is not None:
+            if persist and self.playlist_mapping_unsaved:
+                self.save_playlist_mapping()
+            return self.playlist_mapping
+        
+        mapping = self.load_playlist_mapping()
+        
+        if mapping is None:
+            self.logger.info("Aucune correspondance de playlists enregistrée, recherche des copies existantes par nom")
+            
+            target_playlists = self.get_playlists(self.target_client)
+            target_ids_by_name = {}
+            for target_playlist in target_playlists:
+                target_ids_by_name.setdefault(target_playlist['name'], []).append(target_playlist['id'])
+            
+            mapping = {}
+            for source_playlist in source_playlists:
+                playlist_copy_name = source_playlist['name'] + self.config['playlist_settings']['create_copy_suffix']
+                candidates = target_ids_by_name.get(playlist_copy_name)
+                if candidates:
+                    mapping[source_playlist['id']] = {
+                        'target_id': candidates.pop(0),
+                        'source_name': source_playlist['name']
+                    }
+            
+            self.playlist_mapping = mapping
+            if persist:
+                self.save_playlist_mapping()
+            else:
+                self.playlist_mapping_unsaved = True
+            self.logger.info(f"{len(mapping)} copies existantes associées à leur playlist source")
+        else:
+            self.playlist_mapping = mapping
+        
+        return self.playlist_mapping
+    
+    def drop_missing_playlist_copy(self, source_id: str, error: Exception) -> bool:
+        """Retire de la correspondance une copie introuvable sur la destination (404)
+        
+        La copie n'est vérifiée que lorsqu'elle est lue ou complétée; retourne True si
+        l'erreur signalait une copie supprimée, qui doit alors être recréée.
+        """
+        if getattr(error, 'http_status', None) != 404:
+            return False
+        
+        if self.playlist_mapping is None:
+            self.playlist_mapping = self.load_playlist_mapping() or {}
+        entry = self.playlist_mapping.pop(source_id, None)
+        if entry is None:
+            return False
+        
+        self.synced_playlists.discard(source_id)
+        self.save_playlist_mapping()
+        self.logger.warning(f"Copie de la playlist '{entry.get('source_name', source_id)}' introuvable sur la "
+                            f"destination ({entry['target_id']}), elle sera recréée")
+        return True
     
     def create_playlist_copy(self, source_playlist: Dict) -> Optional[str]:
-        """Crée une copie d'une playlist sur le compte destination"""
+        """Crée une copie d'une playlist sur le compte destination et enregistre la correspondance"""
         try:
             # Obtenir l'ID de l'utilisateur destination
-            user_info = self.target_client.current_user()
-            user_id = user_info['id']
+            user_id = self.get_target_user_id()
             
             # Créer le nom de la nouvelle playlist
             new_name = source_playlist['name'] + self.config['playlist_settings']['create_copy_suffix']
@@ -244,98 +794,598 @@ class SpotifySyncManager:
                 description=f"Spotify Sync - Copie automatique de: {source_playlist['name']}"
             )
             
+            # Enregistrer la correspondance source → destination
+            if self.playlist_mapping is None:
+                self.playlist_mapping = self.load_playlist_mapping() or {}
+            self.playlist_mapping[source_playlist['id']] = {
+                'target_id': new_playlist['id'],
+                'source_name': source_playlist['name']
+            }
+            self.save_playlist_mapping()
+            
             return new_playlist['id']
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la création de la playlist '{source_playlist['name']}': {e}")
             return None
     
-    def sync_playlists(self) -> bool:
-        """Synchronise toutes les playlists du compte source vers le compte destination"""
-        if not self.config['sync_settings']['sync_playlists']:
-            self.logger.info("Synchronisation des playlists désactivée")
-            return True
+    def plan_playlists(self, playlist_ids: Optional[Set[str]] = None, persist: bool = True) -> List[Dict]:
+        """Calcule les playlists à copier (avec leurs tracks) sans rien modifier
         
-        try:
-            self.logger.info("Début de la synchronisation des playlists")
+        Avec playlist_ids, seules ces playlists source sont considérées; avec persist=False,
+        la correspondance initiale éventuellement retrouvée n'est pas écrite sur disque.
+        """
+        # Récupérer les playlists du compte source
+        with self.phase('fetch_source'):
+            source_playlists = self.fetch_source_playlists()
+        if playlist_ids is not None:
+            source_playlists = [playlist for playlist in source_playlists if playlist['id'] in playlist_ids]
+        
+        # Les copies existantes sont connues par leur ID, sans lister le compte destination
+        with self.phase('fetch_target'):
+            playlist_mapping = self.get_playlist_mapping(source_playlists, persist)
+        
+        playlists_to_copy = []
+        carried_over = []
+        
+        # Les playlists sont traitées dans l'ordre de la bibliothèque (les plus récentes d'abord)
+        for source_playlist in source_playlists:
+            mapping_entry = playlist_mapping.get(source_playlist['id'])
             
-            # Récupérer les playlists du compte source
-            source_playlists = self.get_playlists(self.source_client)
+            # Copie partielle d'un cycle précédent: reprendre là où elle s'était arrêtée
+            if mapping_entry and mapping_entry.get('pending'):
+                playlist_entry = dict(source_playlist)
+                playlist_entry['target_id'] = mapping_entry['target_id']
+                with self.phase('fetch_source'):
+                    track_ids = self.fetch_source_playlist_tracks(source_playlist['id'])
+                playlist_entry['track_ids'] = track_ids[mapping_entry.get('synced_tracks', 0):]
+                carried_over.append(playlist_entry)
+                continue
             
-            # Récupérer les playlists existantes sur le compte destination
-            target_playlists = self.get_playlists(self.target_client)
-            target_playlist_names = {pl['name'] for pl in target_playlists}
+            # Vérifier si la playlist a déjà une copie
+            if mapping_entry:
+                self.logger.info(f"Playlist '{source_playlist['name']}' déjà "
+                                 f"{'suivie' if mapping_entry.get('followed') else 'copiée'}, passage à la suivante")
+                continue
             
-            synchronized_playlists = 0
+            if source_playlist['id'] in self.synced_playlists:
+                continue
             
-            for source_playlist in source_playlists:
-                playlist_copy_name = source_playlist['name'] + self.config['playlist_settings']['create_copy_suffix']
-                
-                # Vérifier si la playlist existe déjà
-                if playlist_copy_name in target_playlist_names:
-                    self.logger.info(f"Playlist '{playlist_copy_name}' existe déjà, passage à la suivante")
-                    continue
-                
-                if source_playlist['id'] in self.synced_playlists:
-                    continue
-                
-                self.logger.info(f"Synchronisation de la playlist: {source_playlist['name']}")
-                
-                # Créer la copie de la playlist
-                new_playlist_id = self.create_playlist_copy(source_playlist)
+            # Playlist d'un autre utilisateur: suivie en une requête, ses tracks ne sont pas lues
+            if self.should_follow_playlist(source_playlist):
+                playlists_to_copy.append(dict(source_playlist, follow=True, track_ids=[]))
+                continue
+            
+            # Récupérer les tracks de la playlist source
+            playlist_entry = dict(source_playlist)
+            with self.phase('fetch_source'):
+                playlist_entry['track_ids'] = self.fetch_source_playlist_tracks(source_playlist['id'])
+            playlists_to_copy.append(playlist_entry)
+        
+        # Le travail reporté passe avant les nouvelles copies
+        return carried_over + playlists_to_copy
+    
+    def apply_playlists(self, playlists_to_copy: List[Dict], max_tracks: Optional[int] = None) -> int:
+        """Crée (ou complète) les copies des playlists données sur le compte destination
+        
+        Si max_tracks est fourni, la copie s'arrête une fois ce nombre de tracks ajouté;
+        la progression est enregistrée dans la correspondance pour reprendre au cycle suivant.
+        """
+        with self.phase('write_playlists'):
+            return self.write_playlists(playlists_to_copy, max_tracks)
+    
+    def write_playlists(self, playlists_to_copy: List[Dict], max_tracks: Optional[int] = None) -> int:
+        """Crée ou complète les copies de playlists dans la limite de max_tracks"""
+        synchronized_playlists = 0
+        remaining_tracks = max_tracks
+        
+        if self.playlist_mapping is None:
+            self.playlist_mapping = self.load_playlist_mapping() or {}
+        
+        # Les copies supprimées sur la destination sont remises en file pour être recréées
+        playlists_to_copy = list(playlists_to_copy)
+        
+        for source_playlist in playlists_to_copy:
+            track_ids = source_playlist['track_ids']
+            target_playlist_id = source_playlist.get('target_id')
+            mapping_entry = self.playlist_mapping.get(source_playlist['id'])
+            
+            # Un plan peut être appliqué après coup: ne pas recréer une copie existante
+            if not target_playlist_id and mapping_entry:
+                self.logger.info(f"Playlist '{source_playlist['name']}' déjà copiée, passage à la suivante")
+                continue
+            
+            if self.budget_exhausted() or (remaining_tracks is not None and remaining_tracks <= 0 and track_ids):
+                self.logger.info("Budget du cycle atteint, playlists restantes reportées au prochain cycle")
+                break
+            
+            if source_playlist.get('follow'):
+                if self.follow_playlist(source_playlist):
+                    self.synced_playlists.add(source_playlist['id'])
+                    synchronized_playlists += 1
+                    with self.counters_lock:
+                        self.session_synced_playlists += 1
+                    self.logger.info(f"Playlist '{source_playlist['name']}' suivie depuis le compte destination")
+                    self.pace(self.target_client, 'current_user_follow_playlist', 0.5)
+                continue
+            
+            self.logger.info(f"Synchronisation de la playlist: {source_playlist['name']}")
+            
+            # Créer la copie de la playlist, sauf si on complète une copie partielle
+            if not target_playlist_id:
+                target_playlist_id = self.create_playlist_copy(source_playlist)
                 
-                if not new_playlist_id:
+                if not target_playlist_id:
                     continue
                 
-                # Récupérer les tracks de la playlist source
-                track_ids = self.get_playlist_tracks(self.source_client, source_playlist['id'])
-                
-                if track_ids:
-                    # Ajouter les tracks par lots de 100 (limite de l'API)
-                    batch_size = 100
-                    for i in range(0, len(track_ids), batch_size):
-                        batch = track_ids[i:i + batch_size]
-                        
-                        try:
-                            self.target_client.playlist_add_items(new_playlist_id, batch)
-                            time.sleep(0.5)
-                        except Exception as e:
-                            self.logger.error(f"Erreur lors de l'ajout des tracks au lot {i//batch_size + 1}: {e}")
-                            continue
+                mapping_entry = self.playlist_mapping[source_playlist['id']]
+            
+            tracks_to_add = track_ids
+            if remaining_tracks is not None:
+                tracks_to_add = track_ids[:remaining_tracks]
+            
+            added_tracks = 0
+            copy_missing = False
+            if tracks_to_add:
+                # Écarter d'avance les tracks injouables: un lot refusé ferait perdre toutes ses tracks
+                self.check_playability(tracks_to_add)
                 
-                # Marquer comme synchronisé
-                self.synced_playlists.add(source_playlist['id'])
-                synchronized_playlists += 1
+                # Ajouter les tracks par lots (100 au plus, limite de l'API; taille ajustée en continu)
+                i = 0
+                while i < len(tracks_to_add):
+                    if self.budget_exhausted():
+                        break
+                    
+                    batch_size = self.batch_size(self.target_client, 'playlist_add_items', 100)
+                    batch = tracks_to_add[i:i + batch_size]
+                    i += len(batch)
+                    
+                    # Les tracks écartées comptent dans la progression (positions dans la playlist source)
+                    playable_batch = [track_id for track_id in batch if track_id not in self.unavailable_tracks]
+                    
+                    try:
+                        if playable_batch:
+                            self.target_client.playlist_add_items(target_playlist_id, playable_batch)
+                            self.pace(self.target_client, 'playlist_add_items', 0.5)
+                    except Exception as e:
+                        if source_playlist.get('target_id') and self.drop_missing_playlist_copy(source_playlist['id'], e):
+                            copy_missing = True
+                            break
+                        # La progression s'arrête avant le lot en échec: il sera retenté au prochain cycle
+                        self.logger.error(f"Erreur lors de l'ajout des tracks (position {i - len(batch)}), "
+                                          f"suite au prochain cycle: {e}")
+                        break
+                    
+                    added_tracks += len(batch)
+                    if self.budget:
+                        self.budget.consume_tracks(len(batch))
+            
+            if remaining_tracks is not None:
+                remaining_tracks -= added_tracks
+            
+            # Copie partielle supprimée entre deux cycles: recopiée entièrement dans une nouvelle playlist
+            if copy_missing:
+                playlist_entry = {key: value for key, value in source_playlist.items() if key != 'target_id'}
+                playlist_entry['track_ids'] = self.fetch_source_playlist_tracks(source_playlist['id'])
+                playlists_to_copy.append(playlist_entry)
+                continue
+            
+            # Copie incomplète: enregistrer la progression pour le prochain cycle
+            if added_tracks < len(track_ids):
+                mapping_entry['pending'] = True
+                mapping_entry['synced_tracks'] = mapping_entry.get('synced_tracks', 0) + added_tracks
+                self.save_playlist_mapping()
+                self.logger.info(f"Playlist '{source_playlist['name']}' copiée partiellement "
+                                 f"({added_tracks}/{len(track_ids)} tracks), suite au prochain cycle")
+                continue
+            
+            if mapping_entry.pop('pending', None):
+                mapping_entry.pop('synced_tracks', None)
+                self.save_playlist_mapping()
+            
+            # Marquer comme synchronisé
+            self.synced_playlists.add(source_playlist['id'])
+            synchronized_playlists += 1
+            with self.counters_lock:
                 self.session_synced_playlists += 1  # Compter pour cette session
-                
-                self.logger.info(f"Playlist '{source_playlist['name']}' synchronisée avec succès ({len(track_ids)} tracks)")
-                
-                # Pause entre les playlists
-                time.sleep(1)
             
-            self.logger.info(f"Synchronisation des playlists terminée: {synchronized_playlists} playlists synchronisées")
-            return True
+            self.logger.info(f"Playlist '{source_playlist['name']}' synchronisée avec succès ({len(track_ids)} tracks)")
             
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la synchronisation des playlists: {e}")
-            return False
-    
-    def full_sync(self) -> bool:
-        """Effectue une synchronisation complète (chansons likées + playlists)"""
-        self.logger.info("Début de la synchronisation complète")
-        
-        start_time = get_french_datetime()
-        
-        # Synchroniser les chansons likées
-        liked_songs_success = self.sync_liked_songs()
-        
-        # Synchroniser les playlists
-        playlists_success = self.sync_playlists()
+            # Pause entre les playlists
+            self.pace(self.target_client, 'user_playlist_create', 1)
+        
+        return synchronized_playlists
+    
+    def sync_playlists(self) -> bool:
+        """Synchronise toutes les playlists du compte source vers le compte destination"""
+        if not self.config['sync_settings']['sync_playlists']:
+            self.logger.info("Synchronisation des playlists désactivée")
+            return True
+        
+        try:
+            self.logger.info("Début de la synchronisation des playlists")
+            
+            playlists_to_copy = self.plan_playlists()
+            synchronized_playlists = self.apply_playlists(playlists_to_copy)
+            
+            self.logger.info(f"Synchronisation des playlists terminée: {synchronized_playlists} playlists synchronisées")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la synchronisation des playlists: {e}")
+            return False
+    
+    def get_collection(self, client: spotipy.Spotify, kind: str) -> List[Dict]:
+        """Récupère tous les items d'une collection (ID et date d'ajout), du plus ancien au plus récent
+        
+        Les artistes suivis ne sont pas datés par l'API: ils restent dans l'ordre de lecture.
+        """
+        collection = LIBRARY_COLLECTIONS[kind]
+        items = []
+        
+        self.logger.info(f"Récupération des {collection['label']}...")
+        
+        if collection['item_key'] is None:
+            pages = self.iter_followed_artists(client, collection['page_size'])
+        else:
+            pages = self.iter_pages(client, collection['read'], collection['page_size'])
+        
+        for results in pages:
+            for item in results['items']:
+                entry = collection_item(collection, item)
+                if entry:
+                    items.append(entry)
+        
+        # L'API retourne les ajouts les plus récents en premier
+        if collection['ordered']:
+            items.reverse()
+        
+        self.logger.info(f"Récupéré {len(items)} {collection['label']}")
+        return items
+    
+    def iter_followed_artists(self, client: spotipy.Spotify, limit: int) -> Iterator[Dict]:
+        """Parcourt les artistes suivis page par page (pagination par curseur)"""
+        after = None
+        
+        while True:
+            page_size = self.batch_size(client, 'current_user_followed_artists', limit)
+            results = client.current_user_followed_artists(limit=page_size, after=after)['artists']
+            
+            if not results['items']:
+                break
+            
+            yield results
+            
+            after = (results.get('cursors') or {}).get('after')
+            if not results.get('next') or not after:
+                break
+            
+            self.pace(client, 'current_user_followed_artists', 0.1)
+    
+    def plan_collection(self, kind: str) -> Dict:
+        """Calcule les items d'une collection à sauvegarder sur la destination sans rien modifier
+        
+        Comme pour les likes, la vérification la moins coûteuse est choisie: aucune si la
+        destination est vide, endpoint contains par lots si les candidates sont peu nombreuses,
+        lecture complète de la destination sinon.
+        """
+        collection = LIBRARY_COLLECTIONS[kind]
+        
+        with self.phase('fetch_source'):
+            source_items = self.get_collection(self.source_client, kind)
+        
+        candidates = list(dict.fromkeys(item['id'] for item in source_items
+                                        if item['id'] not in self.synced_collections[kind]))
+        
+        with self.phase('fetch_target'):
+            # Une requête d'un item pour connaître la taille de la collection destination
+            target_count = collection_total(collection, getattr(self.target_client, collection['read'])(limit=1))
+            
+            contains_cost = math.ceil(len(candidates) / collection['batch_size'])
+            fetch_cost = math.ceil(target_count / collection['page_size'])
+            
+            if not candidates or target_count == 0:
+                target_check = 'none'
+                ids_to_save = candidates
+            elif contains_cost < fetch_cost:
+                target_check = 'contains'
+                ids_to_save = self.filter_saved_items(kind, candidates)
+            else:
+                target_check = 'full_fetch'
+                target_ids = {item['id'] for item in self.get_collection(self.target_client, kind)}
+                ids_to_save = [item_id for item_id in candidates if item_id not in target_ids]
+            
+            # Les items déjà présents sur la destination ne sont plus vérifiés aux cycles suivants
+            with self.counters_lock:
+                self.synced_collections[kind].update(set(candidates) - set(ids_to_save))
+        
+        self.logger.info(f"Vérification de la destination ({target_count} {collection['label']}): {target_check}, "
+                         f"{len(ids_to_save)} à synchroniser sur {len(source_items)}")
+        return {
+            'source_count': len(source_items),
+            'target_count': target_count,
+            'target_check': target_check,
+            'ids_to_save': ids_to_save
+        }
+    
+    def filter_saved_items(self, kind: str, item_ids: List[str]) -> List[str]:
+        """Retourne, dans l'ordre, les items absents d'une collection de la destination (endpoint contains)"""
+        collection = LIBRARY_COLLECTIONS[kind]
+        missing = []
+        i = 0
+        
+        while i < len(item_ids):
+            batch_size = self.batch_size(self.target_client, collection['contains'], collection['batch_size'])
+            batch = item_ids[i:i + batch_size]
+            i += len(batch)
+            
+            saved = getattr(self.target_client, collection['contains'])(batch)
+            missing.extend(item_id for item_id, is_saved in zip(batch, saved) if not is_saved)
+            
+            if i < len(item_ids):
+                self.pace(self.target_client, collection['contains'], 0.1)
+        
+        return missing
+    
+    def apply_collection(self, kind: str, item_ids: List[str], max_items: Optional[int] = None) -> int:
+        """Sauvegarde les items donnés d'une collection sur le compte destination, dans l'ordre
+        
+        Si max_items est fourni, seuls les max_items premiers items sont sauvegardés; les
+        suivants sont retrouvés par le diff du cycle suivant.
+        """
+        if max_items is not None and max_items < len(item_ids):
+            self.logger.info(f"Budget du cycle: {len(item_ids) - max_items} {LIBRARY_COLLECTIONS[kind]['label']} "
+                             f"reportés au prochain cycle")
+            item_ids = item_ids[:max_items]
+        
+        with self.phase(f'write_{kind}'):
+            return self.write_collection(kind, item_ids)
+    
+    def write_collection(self, kind: str, item_ids: List[str]) -> int:
+        """Écrit les items par lots (une requête par lot), du plus ancien au plus récent
+        
+        Pour les collections datées, au moins une seconde sépare deux lots: added_at est à la
+        seconde près, l'ordre chronologique est donc préservé d'un lot à l'autre.
+        """
+        collection = LIBRARY_COLLECTIONS[kind]
+        saved = 0
+        i = 0
+        
+        self.logger.info(f"Synchronisation de {len(item_ids)} {collection['label']} "
+                         f"(lots de {collection['batch_size']} au plus)")
+        
+        while i < len(item_ids):
+            if self.budget_exhausted():
+                self.logger.info(f"Budget du cycle atteint, {len(item_ids) - i} {collection['label']} "
+                                 f"reportés au prochain cycle")
+                break
+            
+            batch_size = self.batch_size(self.target_client, collection['save'], collection['batch_size'])
+            batch = item_ids[i:i + batch_size]
+            i += len(batch)
+            
+            try:
+                getattr(self.target_client, collection['save'])(batch)
+            except Exception as e:
+                # Les lots suivants attendent: sauvegardés avant celui-ci, ils seraient datés avant lui
+                self.logger.error(f"Échec définitif d'un lot de {collection['label']} (position {i - len(batch)}), "
+                                  f"suite au prochain cycle: {e}")
+                break
+            
+            self.synced_collections[kind].update(batch)
+            saved += len(batch)
+            with self.counters_lock:
+                self.session_synced_collections[kind] += len(batch)
+            if self.budget:
+                self.budget.consume_tracks(len(batch))
+            
+            if i < len(item_ids):
+                self.pace(self.target_client, collection['save'], 1, minimum=1 if collection['ordered'] else 0)
+        
+        self.logger.info(f"Synchronisation des {collection['label']} terminée: {saved}/{len(item_ids)}")
+        return saved
+    
+    def full_sync(self, liked_songs: Optional[bool] = None, playlists: Optional[bool] = None,
+                  playlist_ids: Optional[Set[str]] = None, collections: Optional[bool] = None) -> bool:
+        """Effectue une synchronisation complète (chansons likées + playlists + albums, artistes et podcasts)
+        
+        Le travail du cycle est limité par le budget configuré (max_tracks_per_sync,
+        max_requests_per_sync, max_sync_duration_minutes), réparti équitablement entre
+        chansons likées, playlists et collections. Le reste est reporté au cycle suivant.
+        
+        liked_songs et playlists remplacent les réglages sync_liked_songs et sync_playlists,
+        collections les réglages sync_saved_albums, sync_followed_artists et sync_saved_shows;
+        playlist_ids restreint la synchronisation des playlists à ces playlists source.
+        """
+        self.logger.info("Début de la synchronisation complète")
+        self.start_trace_cycle()
+        
+        # État de la destination avant toute écriture, pour pouvoir revenir en arrière
+        if self.config.get('rollback', {}).get('snapshot_before_sync'):
+            try:
+                self.capture_rollback_snapshot()
+            except Exception as e:
+                self.logger.error(f"Snapshot de la destination impossible, synchronisation annulée: {e}")
+                return False
+        
+        start_time = get_french_datetime()
+        sync_settings = dict(self.config['sync_settings'])
+        if liked_songs is not None:
+            sync_settings['sync_liked_songs'] = liked_songs
+        if playlists is not None:
+            sync_settings['sync_playlists'] = playlists
+        for kind in LIBRARY_COLLECTIONS:
+            sync_settings[f'sync_{kind}'] = bool(sync_settings.get(f'sync_{kind}')) if collections is None else collections
+        self.budget = SyncBudget.from_config(sync_settings)
+        self.budget_threads = {threading.get_ident()}
+        self.playable_tracks = set()
+        
+        # Quota quotidien: la réserve est gardée pour la propagation des nouveaux likes
+        self.deferred_work = []
+        quota_remaining = self.quota.remaining()
+        if quota_remaining is not None:
+            low_priority = ['playlists'] + list(LIBRARY_COLLECTIONS)
+            if quota_remaining <= 0:
+                self.deferred_work = [phase for phase in ['liked_songs'] + low_priority if sync_settings[f'sync_{phase}']]
+            elif quota_remaining <= self.quota.headroom:
+                self.deferred_work = [phase for phase in low_priority if sync_settings[f'sync_{phase}']]
+            
+            for phase in self.deferred_work:
+                sync_settings[f'sync_{phase}'] = False
+            if self.deferred_work:
+                self.logger.warning(f"Quota API quotidien presque atteint ({quota_remaining} requêtes restantes): "
+                                    f"{', '.join(self.deferred_work)} reporté(es)")
+        
+        def plan_liked():
+            if not sync_settings['sync_liked_songs']:
+                self.logger.info("Synchronisation des chansons likées désactivée")
+                return [], True
+            try:
+                self.logger.info("Début de la synchronisation des chansons likées")
+                return self.plan_liked_songs()['tracks_to_like'], True
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la synchronisation des chansons likées: {e}")
+                return [], False
+        
+        def plan_playlists():
+            if not sync_settings['sync_playlists']:
+                self.logger.info("Synchronisation des playlists désactivée")
+                return [], True
+            try:
+                self.logger.info("Début de la synchronisation des playlists")
+                return self.plan_playlists(playlist_ids), True
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la synchronisation des playlists: {e}")
+                return [], False
+        
+        def apply_liked(max_tracks: Optional[int]) -> bool:
+            if not tracks_to_like:
+                if liked_songs_success and sync_settings['sync_liked_songs']:
+                    self.logger.info("Aucune nouvelle chanson à synchroniser")
+                return liked_songs_success
+            try:
+                return self.apply_liked_songs(tracks_to_like if max_tracks is None else tracks_to_like[:max_tracks])
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la synchronisation des chansons likées: {e}")
+                return False
+        
+        def apply_playlists(max_tracks: Optional[int]) -> bool:
+            if not playlists_to_copy:
+                return playlists_success
+            # Travail de faible priorité: il s'arrête avant d'entamer la réserve du quota
+            self.quota_floor = self.quota.headroom
+            try:
+                synchronized_playlists = self.apply_playlists(playlists_to_copy, max_tracks)
+                self.logger.info(f"Synchronisation des playlists terminée: {synchronized_playlists} playlists synchronisées")
+                return playlists_success
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la synchronisation des playlists: {e}")
+                return False
+            finally:
+                self.quota_floor = 0
+        
+        def plan_collections():
+            collection_plans = {}
+            success = True
+            for kind in LIBRARY_COLLECTIONS:
+                if not sync_settings[f'sync_{kind}']:
+                    continue
+                try:
+                    self.logger.info(f"Début de la synchronisation des {LIBRARY_COLLECTIONS[kind]['label']}")
+                    collection_plans[kind] = self.plan_collection(kind)['ids_to_save']
+                except Exception as e:
+                    self.logger.error(f"Erreur lors de la synchronisation des {LIBRARY_COLLECTIONS[kind]['label']}: {e}")
+                    success = False
+            return collection_plans, success
+        
+        def apply_collections(max_items: Optional[int]) -> bool:
+            success = collections_success
+            # Travail de faible priorité, comme les playlists
+            self.quota_floor = self.quota.headroom
+            try:
+                for kind, item_ids in collection_plans.items():
+                    if not item_ids:
+                        continue
+                    if max_items is not None and max_items <= 0:
+                        self.logger.info(f"Budget du cycle atteint, {len(item_ids)} {LIBRARY_COLLECTIONS[kind]['label']} "
+                                         f"reportés au prochain cycle")
+                        continue
+                    try:
+                        saved = self.apply_collection(kind, item_ids, max_items)
+                        if max_items is not None:
+                            max_items -= saved
+                    except Exception as e:
+                        self.logger.error(f"Erreur lors de la synchronisation des {LIBRARY_COLLECTIONS[kind]['label']}: {e}")
+                        success = False
+            finally:
+                self.quota_floor = 0
+            return success
+        
+        concurrent = self.concurrent_phases()
+        
+        try:
+            # Lectures et diff des deux phases avant toute écriture (en parallèle en mode concurrent_phases)
+            if concurrent:
+                liked_plan, playlists_plan, collections_plan = self.run_concurrently((plan_liked,), (plan_playlists,),
+                                                                                     (plan_collections,))
+                tracks_to_like, liked_songs_success = liked_plan
+                playlists_to_copy, playlists_success = playlists_plan
+                collection_plans, collections_success = collections_plan
+            else:
+                tracks_to_like, liked_songs_success = plan_liked()
+                playlists_to_copy, playlists_success = plan_playlists()
+                collection_plans, collections_success = plan_collections()
+            
+            # Répartir équitablement le budget de tracks entre les phases (un item de collection compte pour une track)
+            playlist_tracks_count = sum(len(playlist['track_ids']) for playlist in playlists_to_copy)
+            collection_items_count = sum(len(item_ids) for item_ids in collection_plans.values())
+            liked_share, playlists_share, collections_share = self.budget.fair_shares(
+                [len(tracks_to_like), playlist_tracks_count, collection_items_count])
+            
+            synced_before = self.session_synced_tracks
+            collections_before = sum(self.session_synced_collections.values())
+            
+            if concurrent:
+                # Les phases écrivent en même temps, chacune dans sa part du budget
+                liked_songs_success, playlists_success, collections_success = self.run_concurrently(
+                    (apply_liked, liked_share), (apply_playlists, playlists_share),
+                    (apply_collections, collections_share))
+            else:
+                liked_songs_success = apply_liked(liked_share)
+                # Les playlists disposent de leur part et du reliquat des likes, sans entamer celle des collections
+                remaining = self.budget.remaining_tracks()
+                playlists_success = apply_playlists(None if remaining is None else remaining - collections_share)
+                # Les collections disposent du budget restant (part équitable + reliquats)
+                collections_success = apply_collections(self.budget.remaining_tracks())
+            
+            # Travail reporté au prochain cycle
+            liked_pending = len(tracks_to_like) - (self.session_synced_tracks - synced_before)
+            liked_pending -= sum(1 for track_id in tracks_to_like if track_id in self.unavailable_tracks)
+            playlists_pending = sum(1 for entry in (self.playlist_mapping or {}).values() if entry.get('pending'))
+            playlists_pending += sum(1 for playlist in playlists_to_copy
+                                     if playlist['id'] not in (self.playlist_mapping or {}))
+            library_items_pending = sum(len(item_ids) for item_ids in collection_plans.values())
+            library_items_pending -= sum(self.session_synced_collections.values()) - collections_before
+            self.pending_work = {
+                'tracks_to_like': max(0, liked_pending),
+                'playlists': playlists_pending,
+                'library_items': max(0, library_items_pending)
+            }
+            if liked_pending > 0 or playlists_pending > 0 or library_items_pending > 0:
+                self.logger.info(f"Budget du cycle atteint: {max(0, liked_pending)} chansons, "
+                                 f"{playlists_pending} playlists et {max(0, library_items_pending)} albums, "
+                                 f"artistes ou podcasts reportés au prochain cycle")
+            
+            self.last_budget_summary = self.budget.get_summary()
+            
+        finally:
+            self.budget = None
+            self.quota.save()
         
         end_time = get_french_datetime()
         duration = end_time - start_time
         
-        success = liked_songs_success and playlists_success
+        success = liked_songs_success and playlists_success and collections_success
         
         if success:
             self.logger.info(f"Synchronisation complète terminée avec succès en {duration}")
@@ -344,17 +1394,770 @@ class SpotifySyncManager:
         
         return success
     
+    def sync_scope(self, scope: Dict) -> bool:
+        """Synchronise une portée demandée à la volée ({'liked_songs', 'playlists', 'playlist_ids'})"""
+        playlist_ids = None if scope['playlists'] else set(scope['playlist_ids'])
+        return self.full_sync(liked_songs=scope['liked_songs'],
+                              playlists=scope['playlists'] or bool(playlist_ids),
+                              playlist_ids=playlist_ids,
+                              collections=None if scope['liked_songs'] and scope['playlists'] else False)
+    
+    def on_api_request(self, event: Dict):
+        """Écouteur des clients API: comptabilise chaque requête dans le budget du cycle en cours"""
+        if not self.budget:
+            return
+        
+        # Source partagée (fan-out): seules les lectures faites par ce cycle (et ses threads de travail) lui sont imputées
+        if self.source_library and threading.get_ident() not in self.budget_threads:
+            return
+        
+        self.budget.consume_requests(1)
+    
+    def set_profiler(self, profiler: Optional[SyncProfiler]):
+        """Active le profilage par phase des synchronisations suivantes"""
+        self.profiler = profiler
+        if profiler:
+            profiler.attach(self.source_client)
+            profiler.attach(self.target_client)
+    
+    def set_tracer(self, tracer):
+        """Active le traçage structuré des appels API des deux comptes"""
+        self.tracer = tracer
+        if tracer:
+            tracer.attach(self.source_client)
+            tracer.attach(self.target_client)
+    
+    def start_trace_cycle(self):
+        """Démarre un cycle de traçage (identifiant commun à tous les spans du cycle)"""
+        if self.tracer:
+            self.trace_cycle_id = self.tracer.start_cycle(self.target_name)
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Délimite une phase de synchronisation pour le profileur et le traceur (s'ils sont activés)"""
+        with self.profiler.phase(name) if self.profiler else nullcontext():
+            with self.tracer.phase(name) if self.tracer else nullcontext():
+                yield
+    
+    def pause(self, seconds: float):
+        """Pause de rythme entre deux appels API, comptabilisée par le profileur"""
+        if self.profiler:
+            self.profiler.record_sleep(seconds)
+        time.sleep(seconds)
+    
+    def batch_size(self, client: ResilientSpotifyClient, endpoint: str, maximum: int) -> int:
+        """Taille de lot (ou de page) pour un endpoint, ajustée par le contrôleur adaptatif du compte"""
+        controller = getattr(client, 'controller', None)
+        if controller:
+            return controller.batch_size(endpoint, maximum)
+        return maximum
+    
+    def pace(self, client: ResilientSpotifyClient, endpoint: str, base: float, minimum: float = 0.0):
+        """Pause après un appel d'un endpoint, ajustée par le contrôleur adaptatif du compte"""
+        controller = getattr(client, 'controller', None)
+        if controller:
+            self.pause(controller.delay(endpoint, base, minimum))
+        else:
+            self.pause(base)
+    
+    def budget_exhausted(self) -> bool:
+        """Indique si le budget du cycle en cours (ou le quota quotidien) est épuisé"""
+        if self.budget is None:
+            return False
+        if self.budget.exhausted():
+            return True
+        
+        quota_remaining = self.quota.remaining()
+        return quota_remaining is not None and quota_remaining <= self.quota_floor
+    
+    def compute_sync_plan(self) -> Dict:
+        """Effectue toutes les lectures et calcule le plan complet de synchronisation"""
+        self.logger.info("Calcul du plan de synchronisation")
+        self.start_trace_cycle()
+        
+        sync_settings = self.config['sync_settings']
+        
+        liked_plan = {'source_count': 0, 'target_count': 0, 'tracks_to_like': []}
+        if sync_settings['sync_liked_songs']:
+            liked_plan = self.plan_liked_songs()
+        
+        # Calcul en lecture seule: la correspondance n'est écrite qu'à l'application du plan
+        playlists_to_copy = []
+        if sync_settings['sync_playlists']:
+            playlists_to_copy = self.plan_playlists(persist=False)
+        
+        collections = {kind: self.plan_collection(kind) for kind in LIBRARY_COLLECTIONS
+                       if sync_settings.get(f'sync_{kind}')}
+        
+        plan = {
+            'version': PLAN_FORMAT_VERSION,
+            'created_at': get_french_datetime().isoformat(),
+            'liked_songs': liked_plan,
+            'playlists': playlists_to_copy,
+            'collections': collections,
+            'playlist_mapping': self.playlist_mapping if self.playlist_mapping_unsaved else None
+        }
+        plan['estimate'] = self.estimate_plan(plan)
+        
+        self.logger.info(f"Plan calculé: {len(liked_plan['tracks_to_like'])} chansons, "
+                         f"{len(playlists_to_copy)} playlists, ~{plan['estimate']['requests']} requêtes")
+        return plan
+    
+    def estimate_plan(self, plan: Dict) -> Dict:
+        """Estime le nombre de requêtes et la durée d'exécution d'un plan"""
+        tracks_count = len(plan['liked_songs']['tracks_to_like'])
+        
+        # Une requête et une pause d'une seconde par chanson likée
+        requests_count = tracks_count
+        sleep_seconds = tracks_count * 1.0
+        
+        playlist_tracks_count = 0
+        followed_count = 0
+        for playlist in plan['playlists']:
+            # Une seule requête pour suivre une playlist
+            if playlist.get('follow'):
+                followed_count += 1
+                requests_count += 1
+                sleep_seconds += 0.5
+                continue
+            
+            batches = (len(playlist['track_ids']) + 99) // 100
+            # current_user + création + ajout des lots
+            requests_count += 2 + batches
+            sleep_seconds += batches * 0.5 + 1.0
+            playlist_tracks_count += len(playlist['track_ids'])
+        
+        # Vérification de disponibilité par lots de 50 avant écriture
+        if self.config['sync_settings'].get('preflight_check', True):
+            lookups = tracks_count + playlist_tracks_count
+            requests_count += (lookups + CATALOG_LOOKUP_BATCH_SIZE - 1) // CATALOG_LOOKUP_BATCH_SIZE
+        
+        # Albums, artistes et podcasts: une requête par lot, une seconde entre deux lots
+        library_items = {}
+        for kind, collection_plan in plan.get('collections', {}).items():
+            library_items[kind] = len(collection_plan['ids_to_save'])
+            batches = math.ceil(library_items[kind] / LIBRARY_COLLECTIONS[kind]['batch_size'])
+            requests_count += batches
+            sleep_seconds += max(0, batches - 1) * 1.0
+        
+        return {
+            'tracks_to_like': tracks_count,
+            'playlists_to_create': len(plan['playlists']) - followed_count,
+            'playlists_to_follow': followed_count,
+            'playlist_tracks_to_add': playlist_tracks_count,
+            'library_items_to_save': library_items,
+            'requests': requests_count,
+            'duration_seconds': round(sleep_seconds + requests_count * ESTIMATED_REQUEST_LATENCY, 1)
+        }
+    
+    def save_plan(self, plan: Dict, plan_path: str):
+        """Écrit un plan de synchronisation dans un fichier JSON compact"""
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, separators=(',', ':'), ensure_ascii=False)
+        self.logger.info(f"Plan de synchronisation écrit dans {plan_path}")
+    
+    def load_plan(self, plan_path: str) -> Dict:
+        """Charge un plan de synchronisation depuis un fichier"""
+        with open(plan_path, 'r', encoding='utf-8') as f:
+            plan = json.load(f)
+        
+        if plan.get('version') != PLAN_FORMAT_VERSION:
+            raise ValueError(f"Version de plan non supportée: {plan.get('version')}")
+        
+        return plan
+    
+    def apply_sync_plan(self, plan: Dict) -> bool:
+        """Exécute un plan calculé au préalable, sans relire les bibliothèques"""
+        self.logger.info(f"Application du plan de synchronisation du {plan['created_at']}")
+        self.start_trace_cycle()
+        
+        start_time = get_french_datetime()
+        success = True
+        
+        tracks_to_like = plan['liked_songs']['tracks_to_like']
+        if tracks_to_like:
+            try:
+                success = self.apply_liked_songs(tracks_to_like) and success
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la synchronisation des chansons likées: {e}")
+                success = False
+        
+        # Correspondance initiale retrouvée par nom au calcul du plan: elle est écrite maintenant
+        if plan.get('playlist_mapping') is not None and self.load_playlist_mapping() is None:
+            self.playlist_mapping = plan['playlist_mapping']
+            self.save_playlist_mapping()
+        
+        if plan['playlists']:
+            try:
+                synchronized_playlists = self.apply_playlists(plan['playlists'])
+                self.logger.info(f"Synchronisation des playlists terminée: {synchronized_playlists} playlists synchronisées")
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la synchronisation des playlists: {e}")
+                success = False
+        
+        for kind, collection_plan in plan.get('collections', {}).items():
+            if not collection_plan['ids_to_save']:
+                continue
+            try:
+                self.apply_collection(kind, collection_plan['ids_to_save'])
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la synchronisation des {LIBRARY_COLLECTIONS[kind]['label']}: {e}")
+                success = False
+        
+        duration = get_french_datetime() - start_time
+        
+        if success:
+            self.logger.info(f"Plan appliqué avec succès en {duration}")
+        else:
+            self.logger.error(f"Plan appliqué avec des erreurs en {duration}")
+        
+        return success
+    
+    def repair_liked_order(self, dry_run: bool = False) -> Dict:
+        """Répare l'ordre des titres likés de la destination par rapport à la source
+        
+        Seuls les titres hors de la plus longue sous-suite correctement ordonnée sont
+        unlikés puis re-likés (par lots, avec une date d'ajout qui les remet à leur place).
+        """
+        self.logger.info("Analyse de l'ordre des titres likés")
+        self.start_trace_cycle()
+        
+        with self.phase('fetch_source'):
+            source_liked = self.get_liked_songs(self.source_client, id_only=True)
+        
+        with self.phase('fetch_target'):
+            target_liked = self.get_liked_songs(self.target_client, id_only=True)
+        
+        with self.phase('diff'):
+            repair = compute_order_repair(source_liked, target_liked)
+        
+        relikes = repair['relikes']
+        self.logger.info(f"{repair['kept_count']}/{repair['common_count']} titres communs bien placés, "
+                         f"{len(relikes)} à re-liker")
+        
+        result = {
+            'common_count': repair['common_count'],
+            'kept_count': repair['kept_count'],
+            'to_repair': len(relikes),
+            'requests': 2 * ((len(relikes) + SAVED_TRACKS_BATCH_SIZE - 1) // SAVED_TRACKS_BATCH_SIZE),
+            'repaired': 0,
+            'failed': []
+        }
+        
+        if dry_run or not relikes:
+            return result
+        
+        with self.phase('write_likes'):
+            applied = apply_order_repair(self.target_client, relikes)
+        
+        result['repaired'] = applied['repaired']
+        result['failed'] = applied['failed']
+        
+        if applied['failed']:
+            self.logger.error(f"{len(applied['failed'])} titres re-likés sans date (ordre non réparé)")
+        else:
+            self.logger.info(f"Ordre réparé: {applied['repaired']} titres re-likés")
+        
+        return result
+    
+    def capture_snapshot(self, client: spotipy.Spotify, snapshot_path: str) -> Dict:
+        """Écrit un snapshot de la bibliothèque d'un compte (titres likés et toutes ses playlists)"""
+        user_id = client.current_user()['id']
+        
+        liked_songs = self.get_liked_songs(client, id_only=True)
+        
+        playlists = []
+        for playlist in self.get_playlists(client, apply_filters=False):
+            playlists.append({
+                'id': playlist['id'],
+                'name': playlist['name'],
+                'public': playlist.get('public'),
+                'description': playlist.get('description'),
+                'track_ids': self.get_playlist_tracks(client, playlist['id'])
+            })
+        
+        write_snapshot(snapshot_path, user_id, liked_songs, playlists)
+        self.logger.info(f"Snapshot écrit: {snapshot_path} ({len(liked_songs)} likes, {len(playlists)} playlists)")
+        
+        return {
+            'user_id': user_id,
+            'liked_count': len(liked_songs),
+            'playlist_count': len(playlists),
+            'item_count': sum(len(playlist['track_ids']) for playlist in playlists)
+        }
+    
+    def get_rollback_directory(self) -> str:
+        """Retourne le dossier des snapshots de retour arrière"""
+        return self.config.get('rollback', {}).get('directory', DEFAULT_ROLLBACK_DIRECTORY)
+    
+    def list_rollback_snapshots(self) -> List[str]:
+        """Snapshots de retour arrière du compte destination, du plus ancien au plus récent"""
+        directory = self.get_rollback_directory()
+        if not os.path.isdir(directory):
+            return []
+        
+        pattern = re.compile(rf"{re.escape(self.target_name)}-\d{{8}}-\d{{6}}\.snap")
+        return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if pattern.fullmatch(name)]
+    
+    def capture_rollback_snapshot(self) -> str:
+        """Capture la destination (snapshot et correspondance des playlists) avant un cycle
+        
+        Seuls les keep_snapshots derniers snapshots sont conservés.
+        """
+        rollback_settings = self.config.get('rollback', {})
+        directory = self.get_rollback_directory()
+        os.makedirs(directory, exist_ok=True)
+        
+        snapshot_path = os.path.join(directory, f"{self.target_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.snap")
+        with self.phase('fetch_target'):
+            self.capture_snapshot(self.target_client, snapshot_path)
+        
+        # La correspondance des playlists est restaurée avec le snapshot
+        with open(f"{snapshot_path}.mapping.json", 'w', encoding='utf-8') as f:
+            json.dump(self.load_playlist_mapping(), f, indent=2, ensure_ascii=False)
+        
+        keep = rollback_settings.get('keep_snapshots', 10)
+        snapshots = self.list_rollback_snapshots()
+        for old_snapshot in snapshots[:max(0, len(snapshots) - keep)]:
+            for path in (old_snapshot, f"{old_snapshot}.mapping.json"):
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        return snapshot_path
+    
+    def rollback_target(self, snapshot_path: Optional[str] = None, dry_run: bool = False) -> Dict:
+        """Ramène le compte destination à l'état d'un snapshot (par défaut le plus récent)
+        
+        Seules les différences sont écrites: unlikes, re-likes horodatés, suppressions,
+        recréations et modifications de playlists, par lots.
+        """
+        if snapshot_path is None:
+            snapshots = self.list_rollback_snapshots()
+            if not snapshots:
+                raise FileNotFoundError(f"Aucun snapshot de retour arrière dans {self.get_rollback_directory()}")
+            snapshot_path = snapshots[-1]
+        
+        self.logger.info(f"Calcul du retour arrière vers {snapshot_path}")
+        self.start_trace_cycle()
+        user_id = self.get_target_user_id()
+        
+        with LibrarySnapshot(snapshot_path) as snapshot:
+            if snapshot.user_id != user_id:
+                raise ValueError(f"Le snapshot {snapshot_path} appartient au compte {snapshot.user_id}, pas à {user_id}")
+            
+            snapshot_playlist_ids = {playlist['id'] for playlist in snapshot.playlists()}
+            
+            with self.phase('fetch_target'):
+                current_liked = self.get_liked_songs(self.target_client, id_only=True)
+                
+                # Le contenu n'est lu que pour les playlists à comparer (celles du snapshot)
+                current_playlists = []
+                for playlist in self.get_playlists(self.target_client, apply_filters=False):
+                    track_ids = []
+                    if playlist['id'] in snapshot_playlist_ids:
+                        track_ids = self.get_playlist_tracks(self.target_client, playlist['id'])
+                    current_playlists.append(dict(playlist, track_ids=track_ids))
+            
+            with self.phase('diff'):
+                rollback = compute_rollback(snapshot, current_liked, current_playlists)
+        
+        result = {
+            'snapshot': snapshot_path,
+            'snapshot_created_at': rollback['snapshot_created_at'],
+            'unlikes': len(rollback['unlikes']),
+            'relikes': len(rollback['relikes']),
+            'delete_playlists': [playlist['name'] for playlist in rollback['delete_playlists']],
+            'recreate_playlists': [playlist['name'] for playlist in rollback['recreate_playlists']],
+            'edit_playlists': [{'name': edit['name'], 'action': edit['action'], 'items': len(edit['items'])}
+                               for edit in rollback['edit_playlists']],
+            'requests': rollback['requests'],
+            'errors': []
+        }
+        self.logger.info(f"Retour arrière: {result['unlikes']} unlikes, {result['relikes']} re-likes, "
+                         f"{len(result['delete_playlists'])} playlists à supprimer, "
+                         f"{len(result['recreate_playlists'])} à recréer, {len(result['edit_playlists'])} à modifier "
+                         f"(~{result['requests']} requêtes)")
+        
+        if dry_run:
+            return result
+        
+        with self.phase('rollback'):
+            applied = apply_rollback(self.target_client, rollback, user_id)
+        result['errors'] = applied['errors']
+        
+        # Restaurer la correspondance des playlists (les playlists recréées ont un nouvel ID)
+        mapping_path = f"{snapshot_path}.mapping.json"
+        if os.path.exists(mapping_path):
+            with open(mapping_path, 'r', encoding='utf-8') as f:
+                mapping = json.load(f)
+            for entry in (mapping or {}).values():
+                entry['target_id'] = applied['recreated_playlists'].get(entry['target_id'], entry['target_id'])
+            self.playlist_mapping = mapping
+            self.save_playlist_mapping()
+        
+        # Les caches de la session ne reflètent plus la destination
+        self.synced_tracks = set()
+        self.synced_playlists = set()
+        self.target_liked_ids = None
+        
+        for error in applied['errors']:
+            self.logger.error(f"Échec du retour arrière: {error}")
+        self.logger.info(f"Retour arrière terminé: {applied['unliked']} unlikes, {applied['reliked']} re-likes, "
+                         f"{applied['deleted_playlists']} playlists supprimées, "
+                         f"{len(applied['recreated_playlists'])} recréées, {applied['edited_playlists']} modifiées")
+        return result
+    
+    def verify_sync(self, liked_samples: Optional[int] = None, playlist_samples: Optional[int] = None,
+                    reconcile: bool = False) -> Dict:
+        """Vérifie par échantillonnage que la destination reflète la source
+        
+        Quelques pages de likes tirées au hasard sont recherchées dans la destination
+        (/me/tracks/contains) et quelques playlists copiées sont comparées sur une page.
+        Avec reconcile=True, seules les parties où une divergence a été détectée sont
+        réconciliées intégralement.
+        """
+        settings = self.config.get('verification', {})
+        liked_samples = settings.get('liked_samples', 5) if liked_samples is None else liked_samples
+        playlist_samples = settings.get('playlist_samples', 5) if playlist_samples is None else playlist_samples
+        confidence = settings.get('confidence', 0.95)
+        rng = random.Random(settings.get('seed'))
+        
+        self.logger.info("Vérification de la synchronisation par échantillonnage")
+        self.start_trace_cycle()
+        
+        requests_count = 0
+        
+        def count_request(event: Dict):
+            nonlocal requests_count
+            requests_count += 1
+        
+        self.source_client.add_listener(count_request)
+        self.target_client.add_listener(count_request)
+        try:
+            with self.phase('verify'):
+                liked = self.verify_liked_sample(rng, liked_samples) if liked_samples else None
+                playlists = self.verify_playlists_sample(rng, playlist_samples) if playlist_samples else []
+        finally:
+            self.source_client.remove_listener(count_request)
+            self.target_client.remove_listener(count_request)
+        
+        result = summarize_verification(liked, playlists, confidence)
+        result.update({'liked': liked, 'playlists': playlists, 'requests': requests_count, 'reconciled': None})
+        
+        if result['consistent']:
+            self.logger.info(f"Aucune divergence sur {result['sampled_items']} éléments échantillonnés "
+                             f"({requests_count} requêtes)")
+        else:
+            self.logger.warning(f"{result['drifted_items']} divergences sur {result['sampled_items']} éléments "
+                                f"échantillonnés ({requests_count} requêtes)")
+            if reconcile:
+                result['reconciled'] = self.reconcile_drift(liked, playlists)
+        
+        return result
+    
+    def verify_liked_sample(self, rng: random.Random, samples: int) -> Dict:
+        """Recherche quelques pages de likes source dans la destination
+        
+        Si les deux bibliothèques ont la même taille, la destination est un miroir de la
+        source et la page de même position doit être identique (vérification de l'ordre).
+        """
+        page_size = 50
+        source_total = self.source_client.current_user_saved_tracks(limit=1)['total']
+        target_total = self.target_client.current_user_saved_tracks(limit=1)['total']
+        order_checked = source_total == target_total
+        
+        check = {
+            'source_total': source_total,
+            'target_total': target_total,
+            'order_checked': order_checked,
+            'sampled': 0,
+            'drifted': 0,
+            'missing': [],
+            'misordered_ranges': 0,
+            'drift_ranges': [],
+            'drift': False
+        }
+        
+        for offset in sample_offsets(rng, source_total, page_size, samples):
+            source_ids = page_ids(self.source_client.current_user_saved_tracks(limit=page_size, offset=offset))
+            if not source_ids:
+                continue
+            check['sampled'] += len(source_ids)
+            
+            contained = self.target_client.current_user_saved_tracks_contains(tracks=source_ids)
+            missing = [track_id for track_id, found in zip(source_ids, contained) if not found]
+            
+            # Les tracks injouables sur la destination n'y sont jamais copiées
+            if missing:
+                self.check_playability(missing)
+                missing = [track_id for track_id in missing if track_id not in self.unavailable_tracks]
+            
+            misordered = False
+            if order_checked and not missing:
+                target_ids = page_ids(self.target_client.current_user_saved_tracks(limit=page_size, offset=offset))
+                misordered = target_ids != source_ids
+            
+            if missing or misordered:
+                check['missing'].extend(missing)
+                check['misordered_ranges'] += misordered
+                check['drifted'] += len(source_ids) if misordered else len(missing)
+                check['drift_ranges'].append({'offset': offset, 'missing': len(missing), 'misordered': misordered})
+        
+        check['drift'] = bool(check['drift_ranges'])
+        return check
+    
+    def verify_playlists_sample(self, rng: random.Random, samples: int) -> List[Dict]:
+        """Compare une page de quelques playlists copiées (tirées au hasard) avec leur source"""
+        mapping = self.load_playlist_mapping() or {}
+        
+        # Les copies en cours sont incomplètes par construction
+        candidates = [(source_id, entry) for source_id, entry in mapping.items() if not entry.get('pending')]
+        return [self.verify_playlist_sample(rng, source_id, entry)
+                for source_id, entry in rng.sample(candidates, min(samples, len(candidates)))]
+    
+    def verify_playlist_sample(self, rng: random.Random, source_id: str, entry: Dict) -> Dict:
+        """Compare la taille et une page tirée au hasard d'une playlist et de sa copie"""
+        page_size = 100
+        check = {
+            'source_id': source_id,
+            'target_id': entry['target_id'],
+            'name': entry.get('source_name'),
+            'sampled': 0,
+            'drifted': 0,
+            'drift': False,
+            'error': None
+        }
+        
+        try:
+            source_total = self.source_client.playlist_tracks(source_id, limit=1, fields='total')['total']
+            offsets = sample_offsets(rng, source_total, page_size, 1)
+            offset = offsets[0] if offsets else 0
+            
+            source_page = self.source_client.playlist_tracks(source_id, limit=page_size, offset=offset,
+                                                             fields=PLAYLIST_TRACKS_FIELDS, additional_types=('track',))
+            target_page = self.target_client.playlist_tracks(entry['target_id'], limit=page_size, offset=offset,
+                                                             fields=PLAYLIST_TRACKS_FIELDS, additional_types=('track',))
+        except Exception as e:
+            # Playlist source ou copie supprimée: la correspondance est à réconcilier
+            check.update({'drift': True, 'error': str(e)})
+            return check
+        
+        source_ids = page_ids(source_page)
+        target_ids = page_ids(target_page)
+        check['sampled'] = len(source_ids)
+        
+        if target_page['total'] != source_total or target_ids != source_ids:
+            check['drifted'] = max(1, sum(1 for source_item, target_item in zip_longest(source_ids, target_ids)
+                                          if source_item != target_item))
+            check['drift'] = True
+        
+        return check
+    
+    def reconcile_drift(self, liked: Optional[Dict], playlists: List[Dict]) -> Dict:
+        """Réconcilie intégralement les seules parties où une divergence a été détectée"""
+        reconciled = {'liked_songs': None, 'liked_order': None, 'playlists': {}}
+        
+        if liked and liked['missing']:
+            self.logger.info("Divergence des likes: réconciliation complète des chansons likées")
+            # Les caches de session masqueraient les likes perdus depuis leur synchronisation
+            self.synced_tracks = set()
+            self.target_liked_ids = None
+            reconciled['liked_songs'] = self.full_sync(liked_songs=True, playlists=False, collections=False)
+        
+        if liked and liked['misordered_ranges']:
+            self.logger.info("Ordre des likes divergent: réparation de l'ordre")
+            reconciled['liked_order'] = self.repair_liked_order()['repaired']
+        
+        for check in playlists:
+            if not check['drift']:
+                continue
+            try:
+                reconciled['playlists'][check['source_id']] = self.reconcile_playlist(check['source_id'],
+                                                                                      check['target_id'])
+            except Exception as e:
+                self.logger.error(f"Réconciliation impossible de la playlist '{check['name']}': {e}")
+                reconciled['playlists'][check['source_id']] = f"erreur: {e}"
+        
+        return reconciled
+    
+    def reconcile_playlist(self, source_id: str, target_id: str) -> Optional[str]:
+        """Remet une copie de playlist en phase avec sa source (modification minimale)
+        
+        Retourne l'action appliquée (truncate, append, replace, ou recreate pour une copie supprimée
+        sur la destination) ou None si la copie était à jour.
+        """
+        with self.phase('fetch_source'):
+            source_ids = self.get_playlist_tracks(self.source_client, source_id)
+        with self.phase('fetch_target'):
+            try:
+                target_ids = self.get_playlist_tracks(self.target_client, target_id)
+            except Exception as e:
+                if not self.drop_missing_playlist_copy(source_id, e):
+                    raise
+                target_ids = None
+        
+        # Copie supprimée sur la destination: elle est recréée comme une nouvelle copie
+        if target_ids is None:
+            self.full_sync(liked_songs=False, playlists=True, playlist_ids={source_id}, collections=False)
+            return 'recreate'
+        
+        # Les tracks injouables sont absentes de la copie par construction
+        self.check_playability(source_ids)
+        expected = [track_id for track_id in source_ids if track_id not in self.unavailable_tracks]
+        
+        edit = plan_playlist_edit(expected, target_ids)
+        if not edit:
+            return None
+        
+        edit['id'] = target_id
+        with self.phase('write_playlists'):
+            apply_playlist_edit(self.target_client, edit)
+        self.logger.info(f"Copie {target_id} réconciliée ({edit['action']}, {len(edit['items'])} tracks)")
+        return edit['action']
+    
+    def backup_account(self, client: spotipy.Spotify, backup_path: str) -> Dict:
+        """Sauvegarde en flux les likes (avec added_at) et les playlists d'un compte (NDJSON gzip)
+        
+        Chaque page est écrite dès sa réception: la mémoire utilisée ne dépend pas de la
+        taille de la bibliothèque.
+        """
+        user_id = client.current_user()['id']
+        self.logger.info(f"Sauvegarde du compte {user_id} dans {backup_path}")
+        writer = BackupWriter(backup_path, user_id)
+        
+        try:
+            with self.phase('backup'):
+                for results in self.iter_pages(client, 'current_user_saved_tracks', 50):
+                    for item in results['items']:
+                        if item['track'] and item['track']['id']:
+                            writer.write_liked(item['track']['id'], item['added_at'])
+                
+                for results in self.iter_pages(client, 'current_user_playlists', 50):
+                    for playlist in results['items']:
+                        if not playlist:
+                            continue
+                        
+                        writer.write_playlist(dict(playlist, owner_id=(playlist.get('owner') or {}).get('id')))
+                        for page in self.iter_pages(client, 'playlist_tracks', 100, playlist['id'],
+                                                    fields=PLAYLIST_TRACKS_FIELDS, additional_types=('track',)):
+                            writer.write_items(playlist['id'], [item['track']['id'] for item in page['items']
+                                                                if item['track'] and item['track']['id']])
+        except Exception as e:
+            writer.abort()
+            self.logger.error(f"Sauvegarde interrompue: {e}")
+            raise
+        
+        writer.close()
+        self.logger.info(f"Sauvegarde terminée: {writer.counts['liked']} likes, {writer.counts['playlists']} playlists "
+                         f"({writer.counts['items']} tracks)")
+        return dict(writer.counts, user_id=user_id)
+    
+    def restore_account(self, client: spotipy.Spotify, backup_path: str, playlists: bool = True) -> Dict:
+        """Rejoue une sauvegarde dans un compte, en flux et par lots
+        
+        Les likes sont réécrits avec leur date d'ajout d'origine (l'ordre chronologique est
+        conservé); les playlists possédées sont recréées dans l'ordre de leurs items, celles
+        d'autres utilisateurs sont suivies.
+        """
+        # Une sauvegarde tronquée est refusée avant toute écriture
+        summary = inspect_backup(backup_path)
+        user_id = client.current_user()['id']
+        self.logger.info(f"Restauration de {backup_path} ({summary['liked']} likes, {summary['playlists']} playlists) "
+                         f"dans le compte {user_id}")
+        
+        result = {'liked': 0, 'playlists': 0, 'followed_playlists': 0, 'items': 0, 'errors': []}
+        liked_batch = []
+        items_batch = []
+        target_playlist_id = None
+        
+        def flush_liked():
+            try:
+                client.save_tracks_with_timestamps(liked_batch)
+                result['liked'] += len(liked_batch)
+            except Exception as e:
+                result['errors'].append(f"like de {len(liked_batch)} titres: {e}")
+            liked_batch.clear()
+            self.pace(client, 'current_user_saved_tracks_add', 0.2)
+        
+        def flush_items():
+            batch = items_batch[:100]
+            del items_batch[:100]
+            try:
+                client.playlist_add_items(target_playlist_id, batch)
+                result['items'] += len(batch)
+            except Exception as e:
+                result['errors'].append(f"ajout de {len(batch)} tracks à {target_playlist_id}: {e}")
+            self.pace(client, 'playlist_add_items', 0.5)
+        
+        with self.phase('restore'):
+            for record in read_backup(backup_path):
+                if record['type'] == 'liked':
+                    liked_batch.append({'id': record['id'], 'added_at': record['added_at']})
+                    if len(liked_batch) >= SAVED_TRACKS_BATCH_SIZE:
+                        flush_liked()
+                        
+                elif record['type'] == 'playlist' and playlists:
+                    while items_batch:
+                        flush_items()
+                    target_playlist_id = None
+                    
+                    try:
+                        if record.get('owner_id') not in (None, summary['user_id']):
+                            client.current_user_follow_playlist(record['id'])
+                            result['followed_playlists'] += 1
+                            continue
+                        
+                        new_playlist = client.user_playlist_create(
+                            user=user_id,
+                            name=record['name'],
+                            public=bool(record.get('public')),
+                            collaborative=False,
+                            description=record.get('description') or ''
+                        )
+                        target_playlist_id = new_playlist['id']
+                        result['playlists'] += 1
+                    except Exception as e:
+                        result['errors'].append(f"playlist '{record['name']}': {e}")
+                        
+                elif record['type'] == 'items' and target_playlist_id:
+                    items_batch.extend(record['ids'])
+                    while len(items_batch) >= 100:
+                        flush_items()
+            
+            if liked_batch:
+                flush_liked()
+            while items_batch:
+                flush_items()
+        
+        for error in result['errors']:
+            self.logger.error(f"Échec de la restauration: {error}")
+        self.logger.info(f"Restauration terminée: {result['liked']} likes, {result['playlists']} playlists recréées, "
+                         f"{result['followed_playlists']} suivies ({result['items']} tracks)")
+        return result
+    
     def reset_session_counters(self):
         """Remet à zéro les compteurs de la session actuelle"""
         self.session_synced_tracks = 0
         self.session_synced_playlists = 0
+        self.session_synced_collections = {kind: 0 for kind in LIBRARY_COLLECTIONS}
+        self.session_unavailable_tracks = set()
     
     def get_sync_stats(self) -> Dict:
         """Retourne des statistiques sur la dernière synchronisation"""
         return {
             'synced_tracks_count': self.session_synced_tracks,  # Nombre de cette session
             'synced_playlists_count': self.session_synced_playlists,  # Nombre de cette session
+            'synced_library_items': dict(self.session_synced_collections),  # Albums, artistes, podcasts de cette session
             'total_synced_tracks': len(self.synced_tracks),  # Total depuis le début
             'total_synced_playlists': len(self.synced_playlists),  # Total depuis le début
+            'pending_tracks_count': self.pending_work['tracks_to_like'],  # Reportées au prochain cycle
+            'pending_playlists_count': self.pending_work['playlists'],  # Reportées au prochain cycle
+            'pending_library_items_count': self.pending_work['library_items'],  # Reportés au prochain cycle
+            'unavailable_tracks_count': len(self.session_unavailable_tracks),  # Injouables, ignorées cette session
+            'last_budget': self.last_budget_summary,
+            'api_quota': self.quota.get_summary(),
+            'deferred_work': self.deferred_work,  # Phases reportées faute de quota
+            'adaptive_control': {client.account: client.controller.get_summary()
+                                 for client in (self.source_client, self.target_client) if client.controller},
             'last_sync_time': get_french_datetime().strftime('%d/%m/%Y à %H:%M:%S')
         }
@@ -0,0 +1,114 @@
+"""
+Profilage d'une synchronisation par phase (temps, requêtes, octets, pauses)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+import requests
+
+# Phases d'un cycle de synchronisation, dans l'ordre d'affichage
+SYNC_PHASES = ['fetch_source', 'fetch_target', 'diff', 'preflight', 'write_likes', 'write_playlists']
+
+class SyncProfiler:
+    """Collecte, pour chaque phase, la durée, le nombre de requêtes, les octets reçus et le temps de pause
+    
+    La phase courante est propre à chaque thread; une requête ou une pause hors de toute
+    phase est comptée dans 'other'.
+    """
+    
+    def __init__(self):
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.start_time = time.monotonic()
+        
+        for name in SYNC_PHASES:
+            self.get_stats(name)
+    
+    def get_stats(self, name: str) -> Dict:
+        """Retourne (en la créant si besoin) l'entrée de statistiques d'une phase"""
+        if name not in self.stats:
+            self.stats[name] = {
+                'wall_time': 0.0,
+                'requests': 0,
+                'errors': 0,
+                'api_time': 0.0,
+                'bytes': 0,
+                'sleep_time': 0.0
+            }
+        return self.stats[name]
+    
+    def current_phase(self) -> str:
+        """Phase en cours pour le thread appelant"""
+        return getattr(self.local, 'phase', None) or 'other'
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Délimite une phase; le temps d'une phase imbriquée est compté dans la phase interne seulement"""
+        previous = getattr(self.local, 'phase', None)
+        self.local.phase = name
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self.lock:
+                self.get_stats(name)['wall_time'] += elapsed
+                if previous:
+                    self.get_stats(previous)['wall_time'] -= elapsed
+            self.local.phase = previous
+    
+    def on_api_request(self, event: Dict):
+        """Écouteur des clients API: une entrée par requête tentée"""
+        with self.lock:
+            stats = self.get_stats(self.current_phase())
+            stats['requests'] += 1
+            stats['api_time'] += event['duration']
+            if event['error'] is not None:
+                stats['errors'] += 1
+    
+    def record_bytes(self, response, *args, **kwargs):
+        """Hook de réponse requests: comptabilise la taille du corps reçu"""
+        with self.lock:
+            self.get_stats(self.current_phase())['bytes'] += len(response.content or b'')
+    
+    def record_sleep(self, seconds: float):
+        """Comptabilise une pause volontaire (rythme ou backoff)"""
+        with self.lock:
+            self.get_stats(self.current_phase())['sleep_time'] += seconds
+    
+    def attach(self, client):
+        """Branche le profileur sur un client enveloppé (requêtes, octets et pauses de retry)"""
+        client.add_listener(self.on_api_request)
+        
+        # Octets reçus: hook sur la session HTTP du client spotipy sous-jacent
+        session = getattr(client.client, '_session', None)
+        if isinstance(session, requests.Session) and self.record_bytes not in session.hooks['response']:
+            session.hooks['response'].append(self.record_bytes)
+        
+        # Pauses de backoff de la couche de retry (un client partagé n'est branché qu'une fois)
+        original_sleep = client.sleep
+        if getattr(original_sleep, 'profiler', None) is self:
+            return
+        
+        def profiled_sleep(seconds):
+            self.record_sleep(seconds)
+            original_sleep(seconds)
+        
+        profiled_sleep.profiler = self
+        client.sleep = profiled_sleep
+    
+    def get_report(self) -> Dict:
+        """Retourne le rapport par phase et les totaux"""
+        with self.lock:
+            phases = {name: dict(stats) for name, stats in self.stats.items()
+                      if name in SYNC_PHASES or stats['requests'] or stats['wall_time']}
+        
+        totals = {key: sum(stats[key] for stats in phases.values())
+                  for key in ('requests', 'errors', 'api_time', 'bytes', 'sleep_time')}
+        totals['wall_time'] = time.monotonic() - self.start_time
+        
+        return {'phases': phases, 'totals': totals}
@@ -0,0 +1,187 @@
+"""
+Traçage structuré des appels API: un span JSON par requête, écrit en arrière-plan (JSON lines)
+"""
+
+import json
+import math
+import logging
+import queue
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+def get_batch_size(args: tuple, kwargs: Dict) -> Optional[int]:
+    """Déduit la taille du lot d'un appel: paramètre limit, ou longueur de la liste d'IDs envoyée"""
+    if isinstance(kwargs.get('limit'), int):
+        return kwargs['limit']
+    
+    for value in list(args) + list(kwargs.values()):
+        if isinstance(value, dict):
+            value = next((item for item in value.values() if isinstance(item, list)), None)
+        if isinstance(value, list):
+            return len(value)
+    return None
+
+class SyncTracer:
+    """Écrit un span par requête API (cycle, phase, endpoint, compte, lot, statut, retry, durée)
+    
+    Les écouteurs des clients ne font que mettre le span en file; un thread dédié
+    l'écrit par paquets toutes les flush_interval secondes.
+    """
+    
+    def __init__(self, path: str, flush_interval: float = 1.0, max_queue_size: int = 10000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+        
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.local = threading.local()
+        self.dropped = 0
+        self.written = 0
+        
+        self.stopped = threading.Event()
+        self.writer = threading.Thread(target=self.run_writer, name='sync-tracer', daemon=True)
+        self.writer.start()
+    
+    @classmethod
+    def from_config(cls, tracing: Dict, path: Optional[str] = None) -> 'SyncTracer':
+        """Construit le traceur à partir de la section tracing de la configuration"""
+        return cls(path or tracing.get('file', 'api_trace.jsonl'),
+                   flush_interval=tracing.get('flush_interval_seconds', 1.0))
+    
+    def start_cycle(self, label: Optional[str] = None) -> str:
+        """Démarre un cycle pour le thread appelant et retourne son identifiant"""
+        cycle_id = uuid.uuid4().hex[:12]
+        self.local.cycle_id = cycle_id
+        self.local.cycle_label = label
+        return cycle_id
+    
+    def join_cycle(self, cycle_id: Optional[str], label: Optional[str] = None):
+        """Rattache le thread appelant (thread de travail d'un cycle) à un cycle déjà démarré"""
+        self.local.cycle_id = cycle_id
+        self.local.cycle_label = label
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Délimite une phase pour le thread appelant"""
+        previous = getattr(self.local, 'phase', None)
+        self.local.phase = name
+        try:
+            yield
+        finally:
+            self.local.phase = previous
+    
+    def on_api_request(self, event: Dict):
+        """Écouteur des clients API: construit le span et le met en file (jamais bloquant)"""
+        error = event['error']
+        span = {
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'cycle_id': getattr(self.local, 'cycle_id', None),
+            'cycle': getattr(self.local, 'cycle_label', None),
+            'phase': getattr(self.local, 'phase', None),
+            'account': event['account'],
+            'endpoint': event['endpoint'],
+            'batch_size': get_batch_size(event['args'], event['kwargs']),
+            'status': event['status'],
+            'retry': event['attempt'] - 1,
+            'duration_ms': round(event['duration'] * 1000, 2),
+            'error': f"{type(error).__name__}: {error}" if error is not None else None
+        }
+        
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+    
+    def attach(self, client):
+        """Branche le traceur sur un client enveloppé"""
+        client.add_listener(self.on_api_request)
+    
+    def drain(self) -> List[Dict]:
+        """Retire tous les spans en attente"""
+        spans = []
+        while True:
+            try:
+                spans.append(self.queue.get_nowait())
+            except queue.Empty:
+                return spans
+    
+    def write(self, spans: List[Dict]):
+        """Ajoute des spans au fichier de trace"""
+        if not spans:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(span, ensure_ascii=False, default=str) + '\n' for span in spans)
+            self.written += len(spans)
+        except OSError as e:
+            self.logger.error(f"Impossible d'écrire la trace {self.path}: {e}")
+    
+    def run_writer(self):
+        """Thread d'écriture: vide la file à intervalle régulier"""
+        while not self.stopped.wait(self.flush_interval):
+            self.write(self.drain())
+        self.write(self.drain())
+    
+    def close(self):
+        """Arrête le thread d'écriture après avoir écrit les derniers spans"""
+        self.stopped.set()
+        self.writer.join()
+        if self.dropped:
+            self.logger.warning(f"{self.dropped} spans perdus (file de trace pleine)")
+
+def load_trace(path: str) -> List[Dict]:
+    """Charge un fichier de trace JSON lines (les lignes illisibles sont ignorées)"""
+    spans = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentile par rang le plus proche d'une liste triée"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+def summarize_trace(spans: List[Dict], slowest: int = 10) -> Dict:
+    """Distribution des latences par compte et endpoint, et appels les plus lents"""
+    groups = defaultdict(list)
+    errors = defaultdict(int)
+    retries = defaultdict(int)
+    
+    for span in spans:
+        key = f"{span['account']} {span['endpoint']}"
+        groups[key].append(span['duration_ms'])
+        if span.get('error'):
+            errors[key] += 1
+        if span.get('retry'):
+            retries[key] += 1
+    
+    endpoints = {}
+    for key, durations in groups.items():
+        durations.sort()
+        endpoints[key] = {
+            'requests': len(durations),
+            'errors': errors[key],
+            'retries': retries[key],
+            'p50_ms': percentile(durations, 0.5),
+            'p95_ms': percentile(durations, 0.95),
+            'p99_ms': percentile(durations, 0.99),
+            'max_ms': durations[-1],
+            'total_ms': round(sum(durations), 2)
+        }
+    
+    return {
+        'spans': len(spans),
+        'cycles': len({span.get('cycle_id') for span in spans if span.get('cycle_id')}),
+        'endpoints': endpoints,
+        'slowest': sorted(spans, key=lambda span: span['duration_ms'], reverse=True)[:slowest]
+    }
@@ -0,0 +1,213 @@
+"""
+Déclenchement de synchronisations à la demande: API HTTP locale, regroupement des demandes et cycles exclusifs
+"""
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Portées acceptées par l'API de déclenchement
+TRIGGER_SCOPES = ('all', 'liked', 'playlists', 'playlist')
+
+def make_scope(kind: str = 'all', playlist_id: Optional[str] = None) -> Dict:
+    """Construit une portée de synchronisation ({'liked_songs', 'playlists', 'playlist_ids'})"""
+    if kind not in TRIGGER_SCOPES:
+        raise ValueError(f"Portée inconnue: {kind} (valeurs possibles: {', '.join(TRIGGER_SCOPES)})")
+    if kind == 'playlist' and not playlist_id:
+        raise ValueError("La portée 'playlist' nécessite un playlist_id")
+    
+    return {
+        'liked_songs': kind in ('all', 'liked'),
+        'playlists': kind in ('all', 'playlists'),
+        'playlist_ids': [playlist_id] if kind == 'playlist' else []
+    }
+
+def merge_scopes(first: Optional[Dict], second: Dict) -> Dict:
+    """Fusionne deux portées: le cycle suivant couvre l'union des demandes"""
+    if first is None:
+        return second
+    
+    playlists = first['playlists'] or second['playlists']
+    playlist_ids = [] if playlists else sorted(set(first['playlist_ids']) | set(second['playlist_ids']))
+    return {
+        'liked_songs': first['liked_songs'] or second['liked_songs'],
+        'playlists': playlists,
+        'playlist_ids': playlist_ids
+    }
+
+class SyncTrigger:
+    """File de déclenchements: regroupe les rafales de demandes et n'exécute jamais deux cycles à la fois
+    
+    Une demande arme un délai de debounce; chaque nouvelle demande pendant ce délai le
+    repousse et élargit la portée du cycle. Les demandes reçues pendant un cycle sont
+    regroupées dans le cycle suivant.
+    """
+    
+    def __init__(self, run_sync: Callable[[Dict], bool], debounce_seconds: float = 5.0):
+        self.run_sync = run_sync
+        self.debounce_seconds = debounce_seconds
+        self.logger = logging.getLogger(__name__)
+        
+        # Un seul cycle à la fois, qu'il vienne du minuteur ou d'une demande
+        self.cycle_lock = threading.Lock()
+        
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.pending = None
+        self.last_request_at = 0.0
+        self.requests_count = 0
+        self.cycles_count = 0
+        self.last_result = None
+        
+        self.worker = None
+        self.server = None
+        self.server_thread = None
+    
+    def request(self, scope: Dict) -> Dict:
+        """Enregistre une demande de synchronisation (exécutée après le délai de debounce)"""
+        with self.lock:
+            coalesced = self.pending is not None
+            self.pending = merge_scopes(self.pending, scope)
+            self.last_request_at = time.monotonic()
+            self.requests_count += 1
+            self.wakeup.set()
+        
+        self.logger.info(f"Synchronisation demandée ({'regroupée' if coalesced else 'planifiée'}): {scope}")
+        return {'accepted': True, 'coalesced': coalesced, 'debounce_seconds': self.debounce_seconds}
+    
+    def run_now(self, scope: Dict) -> Optional[bool]:
+        """Exécute un cycle immédiatement (minuteur); s'il y en a déjà un, la demande est regroupée"""
+        if not self.cycle_lock.acquire(blocking=False):
+            self.logger.info("Cycle déjà en cours, synchronisation regroupée avec le cycle suivant")
+            self.request(scope)
+            return None
+        
+        try:
+            return self.execute(scope)
+        finally:
+            self.cycle_lock.release()
+    
+    def execute(self, scope: Dict) -> bool:
+        """Exécute un cycle (le verrou de cycle doit être détenu)"""
+        self.cycles_count += 1
+        try:
+            success = self.run_sync(scope)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la synchronisation déclenchée: {e}")
+            success = False
+        
+        self.last_result = {'scope': scope, 'success': success, 'finished_at': time.time()}
+        return success
+    
+    def run_pending(self):
+        """Boucle du thread de travail: attend les demandes, applique le debounce, exécute"""
+        while not self.stopped.is_set():
+            self.wakeup.wait()
+            if self.stopped.is_set():
+                break
+            
+            # Attendre que les demandes cessent pendant debounce_seconds
+            while True:
+                with self.lock:
+                    remaining = self.last_request_at + self.debounce_seconds - time.monotonic()
+                if remaining <= 0 or self.stopped.wait(remaining):
+                    break
+            
+            with self.cycle_lock:
+                with self.lock:
+                    scope = self.pending
+                    self.pending = None
+                    self.wakeup.clear()
+                
+                if scope and not self.stopped.is_set():
+                    self.execute(scope)
+    
+    def get_status(self) -> Dict:
+        """État de la file de déclenchement"""
+        with self.lock:
+            return {
+                'running': self.cycle_lock.locked(),
+                'pending': self.pending,
+                'requests': self.requests_count,
+                'cycles': self.cycles_count,
+                'last_result': self.last_result
+            }
+    
+    def start(self, host: str = '127.0.0.1', port: int = 8765, token: Optional[str] = None):
+        """Démarre le thread de travail et le serveur HTTP local"""
+        self.worker = threading.Thread(target=self.run_pending, name='sync-trigger', daemon=True)
+        self.worker.start()
+        
+        self.server = ThreadingHTTPServer((host, port), make_handler(self, token))
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name='sync-trigger-http', daemon=True)
+        self.server_thread.start()
+        self.logger.info(f"API de déclenchement à l'écoute sur http://{host}:{self.server.server_address[1]}")
+    
+    def stop(self):
+        """Arrête le serveur et le thread de travail (un cycle en cours se termine normalement)"""
+        self.stopped.set()
+        self.wakeup.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+def make_handler(trigger: SyncTrigger, token: Optional[str] = None):
+    """Construit le gestionnaire HTTP de l'API de déclenchement
+    
+    POST /sync?scope=all|liked|playlists|playlist&playlist_id=... (ou corps JSON équivalent)
+    GET /status
+    """
+    
+    class TriggerHandler(BaseHTTPRequestHandler):
+        def send_json(self, status: int, payload: Dict):
+            """Envoie une réponse JSON"""
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def authorized(self) -> bool:
+            """Vérifie le jeton X-Sync-Token (si un jeton est configuré)"""
+            return not token or self.headers.get('X-Sync-Token') == token
+        
+        def do_GET(self):
+            if not self.authorized():
+                return self.send_json(401, {'error': 'Jeton invalide'})
+            if urlparse(self.path).path != '/status':
+                return self.send_json(404, {'error': 'Route inconnue'})
+            self.send_json(200, trigger.get_status())
+        
+        def do_POST(self):
+            if not self.authorized():
+                return self.send_json(401, {'error': 'Jeton invalide'})
+            
+            url = urlparse(self.path)
+            if url.path != '/sync':
+                return self.send_json(404, {'error': 'Route inconnue'})
+            
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                try:
+                    params.update(json.loads(self.rfile.read(length)))
+                except (ValueError, AttributeError):
+                    return self.send_json(400, {'error': 'Corps JSON invalide'})
+            
+            try:
+                scope = make_scope(params.get('scope', 'all'), params.get('playlist_id'))
+            except ValueError as e:
+                return self.send_json(400, {'error': str(e)})
+            
+            self.send_json(202, trigger.request(scope))
+        
+        def log_message(self, format, *args):
+            trigger.logger.debug(f"API de déclenchement: {format % args}")
+    
+    return TriggerHandler
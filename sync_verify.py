@@ -0,0 +1,49 @@
+"""
+Vérification par échantillonnage de la cohérence source/destination (quelques pages au lieu de toute la bibliothèque)
+"""
+
+import random
+from typing import Dict, List, Optional
+
+def sample_offsets(rng: random.Random, total: int, page_size: int, count: int) -> List[int]:
+    """Tire au plus count débuts de page distincts dans une collection de total éléments"""
+    if total <= 0 or count <= 0:
+        return []
+    
+    last_offset = max(0, total - page_size)
+    pages = last_offset // page_size + 1
+    if pages <= count:
+        return sorted({min(i * page_size, last_offset) for i in range(pages)})
+    return sorted(min(page * page_size, last_offset) for page in rng.sample(range(pages), count))
+
+def page_ids(results: Dict) -> List[str]:
+    """IDs des tracks d'une page de likes ou de playlist"""
+    return [item['track']['id'] for item in results.get('items') or []
+            if item.get('track') and item['track'].get('id')]
+
+def max_drift_rate(sampled: int, confidence: float) -> Optional[float]:
+    """Taux de divergence maximal compatible avec un échantillon sans divergence
+    
+    Si une fraction p des éléments divergeait, un échantillon de n éléments n'en
+    contiendrait aucun avec une probabilité (1 - p)^n: au niveau de confiance donné,
+    p < 1 - (1 - confiance)^(1/n).
+    """
+    if sampled <= 0:
+        return None
+    return 1 - (1 - confidence) ** (1 / sampled)
+
+def summarize_verification(liked: Optional[Dict], playlists: List[Dict], confidence: float) -> Dict:
+    """Résultat global: éléments échantillonnés, divergences et borne statistique"""
+    checks = ([liked] if liked else []) + playlists
+    sampled = sum(check['sampled'] for check in checks)
+    drifted = sum(check['drifted'] for check in checks)
+    
+    return {
+        'sampled_items': sampled,
+        'drifted_items': drifted,
+        'consistent': not any(check['drift'] for check in checks),
+        'confidence': confidence,
+        # Sans divergence observée: borne supérieure du taux de divergence; sinon taux observé
+        'max_drift_rate': max_drift_rate(sampled, confidence) if not drifted else None,
+        'observed_drift_rate': drifted / sampled if sampled else None
+    }
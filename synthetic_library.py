@@ -0,0 +1,152 @@
+"""
+Génération de bibliothèques Spotify synthétiques réalistes (tests de montée en charge)
+
+Une bibliothèque générée est un dictionnaire JSON servi tel quel par FakeSpotify:
+    {"user_id", "liked": {track_id: added_at}, "playlists": [{"id", "name", "public", "owner", "tracks"}],
+     "unavailable": [track_id], "parameters": {...}}
+"""
+
+import gzip
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fake_spotify import ADDED_AT_FORMAT, FakeSpotify, random_id
+
+# Répartitions des dates d'ajout des likes
+ADDED_AT_DISTRIBUTIONS = ['uniform', 'bursty', 'recent']
+
+# Profils de taille prédéfinis (paramètres de generate_library)
+SCALE_PROFILES = {
+    'small': {'liked_count': 1000, 'playlists_count': 20, 'playlist_size': 50},
+    'medium': {'liked_count': 10000, 'playlists_count': 200, 'playlist_size': 100, 'max_playlist_size': 2000,
+               'unavailable_ratio': 0.02, 'duplicate_ratio': 0.01},
+    'large': {'liked_count': 50000, 'playlists_count': 2000, 'playlist_size': 150, 'max_playlist_size': 10000,
+              'huge_playlists': 2, 'unavailable_ratio': 0.05, 'duplicate_ratio': 0.02,
+              'foreign_playlist_ratio': 0.1, 'distribution': 'bursty'}
+}
+
+def generate_added_at(rng: random.Random, count: int, distribution: str, start: datetime, end: datetime) -> list:
+    """Dates d'ajout croissantes et distinctes (à la seconde), du plus ancien au plus récent
+    
+    uniform: étalées régulièrement; bursty: par sessions de quelques minutes séparées de
+    plusieurs jours; recent: de plus en plus fréquentes vers la fin de la période.
+    """
+    if distribution not in ADDED_AT_DISTRIBUTIONS:
+        raise ValueError(f"Répartition inconnue: {distribution} ({', '.join(ADDED_AT_DISTRIBUTIONS)})")
+    
+    span = max(1, int((end - start).total_seconds()))
+    if distribution == 'uniform':
+        offsets = [rng.randrange(span) for _ in range(count)]
+    elif distribution == 'recent':
+        # Densité exponentielle croissante: la moitié des likes dans le dernier sixième de la période
+        offsets = [int(span * (1 - min(1.0, rng.expovariate(4.0)))) for _ in range(count)]
+    else:
+        offsets = []
+        while len(offsets) < count:
+            session_start = rng.randrange(span)
+            for _ in range(min(count - len(offsets), max(1, int(rng.expovariate(1 / 25))))):
+                offsets.append(min(span - 1, session_start + rng.randrange(900)))
+    
+    # Deux likes n'ont jamais la même seconde (l'ordre chronologique en dépend)
+    offsets.sort()
+    for i in range(1, len(offsets)):
+        if offsets[i] <= offsets[i - 1]:
+            offsets[i] = offsets[i - 1] + 1
+    
+    return [(start + timedelta(seconds=offset)).strftime(ADDED_AT_FORMAT) for offset in offsets]
+
+def generate_library(user_id: str, liked_count: int, playlists_count: int = 0, playlist_size: int = 100,
+                     max_playlist_size: int = 10000, huge_playlists: int = 0, duplicate_ratio: float = 0.0,
+                     unavailable_ratio: float = 0.0, foreign_playlist_ratio: float = 0.0, distribution: str = 'uniform',
+                     start: Optional[datetime] = None, end: Optional[datetime] = None, seed: int = 0) -> Dict:
+    """Génère une bibliothèque synthétique reproductible (même graine, même bibliothèque)
+    
+    Les tailles de playlists suivent une loi log-normale de moyenne playlist_size, bornée
+    par max_playlist_size (les huge_playlists premières ont exactement cette taille);
+    duplicate_ratio est la part d'items répétés dans une playlist, unavailable_ratio la part
+    des tracks injouables, foreign_playlist_ratio la part des playlists publiques appartenant
+    à d'autres utilisateurs.
+    """
+    rng = random.Random(seed)
+    start = start or datetime(2015, 1, 1, tzinfo=timezone.utc)
+    end = end or datetime(2025, 1, 1, tzinfo=timezone.utc)
+    
+    # Catalogue: les likes et des tracks jamais likées qui n'apparaissent que dans les playlists
+    catalog = [random_id(rng) for _ in range(max(liked_count + liked_count // 4, playlist_size, 1))]
+    liked = dict(zip(catalog[:liked_count], generate_added_at(rng, liked_count, distribution, start, end)))
+    unavailable = rng.sample(catalog, int(len(catalog) * unavailable_ratio))
+    
+    # Paramètres de la loi log-normale pour une moyenne de playlist_size
+    sigma = 0.8
+    mu = math.log(max(1, playlist_size)) - sigma ** 2 / 2
+    
+    playlists = []
+    for i in range(playlists_count):
+        size = max(1, min(max_playlist_size, int(rng.lognormvariate(mu, sigma))))
+        if i < huge_playlists:
+            size = max_playlist_size
+        unique_size = min(len(catalog), max(1, int(size * (1 - duplicate_ratio))))
+        tracks = rng.sample(catalog, unique_size)
+        for _ in range(size - unique_size):
+            tracks.insert(rng.randrange(len(tracks) + 1), rng.choice(tracks))
+        
+        foreign = rng.random() < foreign_playlist_ratio
+        playlists.append({
+            'id': random_id(rng),
+            'name': f"Playlist {i + 1}",
+            'public': True if foreign else rng.random() < 0.5,
+            'owner': f"curator-{rng.randrange(100)}" if foreign else user_id,
+            'tracks': tracks
+        })
+    
+    return {
+        'user_id': user_id,
+        'liked': liked,
+        'playlists': playlists,
+        'unavailable': unavailable,
+        'parameters': {
+            'liked_count': liked_count, 'playlists_count': playlists_count, 'playlist_size': playlist_size,
+            'max_playlist_size': max_playlist_size, 'huge_playlists': huge_playlists,
+            'duplicate_ratio': duplicate_ratio, 'unavailable_ratio': unavailable_ratio, 'foreign_playlist_ratio': foreign_playlist_ratio,
+            'distribution': distribution, 'seed': seed
+        }
+    }
+
+def generate_profile(user_id: str, profile: str, seed: int = 0, **overrides) -> Dict:
+    """Génère une bibliothèque d'un profil prédéfini (paramètres remplaçables)"""
+    if profile not in SCALE_PROFILES:
+        raise ValueError(f"Profil inconnu: {profile} ({', '.join(SCALE_PROFILES)})")
+    parameters = dict(SCALE_PROFILES[profile], **overrides)
+    return generate_library(user_id, seed=seed, **parameters)
+
+def save_library(library: Dict, path: str):
+    """Écrit une bibliothèque générée (JSON compressé si le chemin finit par .gz)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        json.dump(library, f, separators=(',', ':'))
+
+def load_library(path: str) -> Dict:
+    """Relit une bibliothèque générée"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def library_to_fake(library: Dict, latency: float = 0.0) -> FakeSpotify:
+    """Client hors ligne qui sert une bibliothèque générée"""
+    return FakeSpotify(library['user_id'], library['liked'], library['playlists'],
+                       unavailable=library.get('unavailable', ()), latency=latency)
+
+def describe_library(library: Dict) -> Dict:
+    """Tailles effectives d'une bibliothèque générée"""
+    sizes = [len(playlist['tracks']) for playlist in library['playlists']]
+    return {
+        'liked': len(library['liked']),
+        'playlists': len(sizes),
+        'playlist_items': sum(sizes),
+        'largest_playlist': max(sizes, default=0),
+        'unavailable': len(library.get('unavailable', [])),
+        'foreign_playlists': sum(1 for playlist in library['playlists'] if playlist['owner'] != library['user_id'])
+    }
@@ -0,0 +1,186 @@
+"""
+Tests de robustesse face aux erreurs de l'API
+
+Un serveur HTTP local répond à la place de l'API Spotify: les codes HTTP et l'en-tête
+Retry-After doivent parvenir intacts à ResilientSpotifyClient. Les écritures par lots
+sont vérifiées hors ligne (client simulé) quand un lot échoue.
+    
+    python test_resilience.py
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from spotipy.exceptions import SpotifyException
+
+from adaptive_control import OUTCOME_ERROR, OUTCOME_OK, OUTCOME_THROTTLED, AdaptiveController
+from api_client import ResilientSpotifyClient, RetryPolicy, create_spotify
+from benchmark import BenchmarkSyncManager
+from fake_spotify import FakeSpotify, make_account
+from sync_tracer import SyncTracer
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Répond aux requêtes dans l'ordre des réponses (code, en-têtes, corps) du serveur"""
+    
+    def do_GET(self):
+        status, headers, body = self.server.responses.pop(0) if self.server.responses else (200, {}, {})
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+    
+    def log_message(self, format, *args):
+        pass
+
+def scripted_client(responses: List, max_attempts: int = 2) -> tuple:
+    """Client enveloppé servi par un serveur local; les attentes sont enregistrées au lieu d'être faites"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+    server.responses = list(responses)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    spotify = create_spotify(auth='test')
+    spotify.prefix = f"http://127.0.0.1:{server.server_address[1]}/v1/"
+    client = ResilientSpotifyClient(spotify, 'test', policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.01))
+    
+    sleeps = []
+    events = []
+    client.sleep = sleeps.append
+    client.add_listener(events.append)
+    return server, client, sleeps, events
+
+def check_retry_after() -> List[str]:
+    """Un 429 avec Retry-After: 7 doit faire attendre au moins 7 s avant le nouvel essai"""
+    server, client, sleeps, events = scripted_client([(429, {'Retry-After': '7'}, {}), (200, {}, {'id': 'user'})])
+    try:
+        result = client.current_user()
+    finally:
+        server.shutdown()
+    
+    errors = []
+    if result.get('id') != 'user':
+        errors.append(f"réponse inattendue après le retry: {result}")
+    if not sleeps or sleeps[0] < 7:
+        errors.append(f"Retry-After ignoré (attentes: {sleeps})")
+    if [event['status'] for event in events] != [429, 200]:
+        errors.append(f"codes remontés: {[event['status'] for event in events]}")
+    return errors
+
+def check_server_error_status() -> List[str]:
+    """Un 503 doit rester un 503 (et non devenir un 429 sans en-têtes)"""
+    server, client, sleeps, events = scripted_client([(503, {}, {}), (503, {}, {})])
+    try:
+        client.current_user()
+        error = None
+    except SpotifyException as e:
+        error = e
+    finally:
+        server.shutdown()
+    
+    errors = []
+    if error is None or error.http_status != 503:
+        errors.append(f"erreur remontée: {error!r}")
+    if [event['status'] for event in events] != [503, 503]:
+        errors.append(f"codes remontés: {[event['status'] for event in events]}")
+    return errors
+
+def check_adaptive_outcomes() -> List[str]:
+    """Le contrôleur AIMD et les spans de trace voient le code réel: 503 = erreur, 429 = limitation"""
+    server, client, sleeps, events = scripted_client([(503, {}, {}), (429, {'Retry-After': '1'}, {}),
+                                                      (200, {}, {'id': 'user'})], max_attempts=3)
+    controller = AdaptiveController('test')
+    client.set_controller(controller)
+    outcomes = []
+    client.add_listener(lambda event: outcomes.append(controller.classify(event)))
+    
+    with tempfile.TemporaryDirectory(prefix='spotify-sync-resilience-') as workdir:
+        tracer = SyncTracer(os.path.join(workdir, 'trace.jsonl'), flush_interval=60)
+        tracer.attach(client)
+        try:
+            client.current_user()
+        finally:
+            server.shutdown()
+            spans = tracer.drain()
+            tracer.close()
+    
+    errors = []
+    if outcomes != [OUTCOME_ERROR, OUTCOME_THROTTLED, OUTCOME_OK]:
+        errors.append(f"issues du contrôleur: {outcomes}")
+    if [span['status'] for span in spans] != [503, 429, 200]:
+        errors.append(f"codes des spans: {[span['status'] for span in spans]}")
+    return errors
+
+def check_collection_failed_batch() -> List[str]:
+    """Un lot d'albums en échec arrête la collection: le lot suivant n'est pas écrit avant lui"""
+    # Albums datés comme des likes synthétiques: 45 albums, soit 3 lots de 20 au plus
+    source = FakeSpotify('resilience-source', albums=make_account('resilience-albums', 45).liked)
+    target = FakeSpotify('resilience-target')
+    source_order = sorted(source.albums, key=source.albums.get)
+    
+    calls = []
+    save_albums = target.current_user_saved_albums_add
+    
+    def flaky_save_albums(albums=None):
+        calls.append(list(albums))
+        # Lot 2 sur 3 refusé au premier cycle (erreur définitive, sans retry)
+        if len(calls) == 2:
+            raise SpotifyException(400, -1, "Lot refusé")
+        return save_albums(albums)
+    
+    target.current_user_saved_albums_add = flaky_save_albums
+    
+    errors = []
+    with tempfile.TemporaryDirectory(prefix='spotify-sync-resilience-') as workdir:
+        manager = BenchmarkSyncManager(source, target, workdir)
+        manager.config['sync_settings']['sync_saved_albums'] = True
+        
+        manager.full_sync(liked_songs=False, playlists=False)
+        if len(calls) != 2 or set(target.albums) != set(source_order[:20]):
+            errors.append(f"premier cycle: {len(calls)} lots envoyés, {len(target.albums)} albums sauvegardés")
+        if manager.pending_work['library_items'] != 25:
+            errors.append(f"albums reportés: {manager.pending_work['library_items']} au lieu de 25")
+        
+        manager.full_sync(liked_songs=False, playlists=False)
+    
+    dates = [target.albums.get(album_id) for album_id in source_order]
+    if None in dates or dates != sorted(dates):
+        errors.append("albums absents ou dans le désordre après le second cycle")
+    return errors
+
+CHECKS: Dict = {
+    'retry_after_429': check_retry_after,
+    'status_503': check_server_error_status,
+    'adaptive_outcomes': check_adaptive_outcomes,
+    'collection_failed_batch': check_collection_failed_batch
+}
+
+def main() -> bool:
+    """Exécute les vérifications et affiche les résultats; retourne False en cas d'échec"""
+    print("=== TESTS DE ROBUSTESSE FACE AUX ERREURS DE L'API ===\n")
+    logging.disable(logging.CRITICAL)
+    
+    success = True
+    try:
+        for name, check in CHECKS.items():
+            errors = check()
+            status = "✅" if not errors else "❌"
+            print(f"   {status} {name}" + (f" - {'; '.join(errors)}" if errors else ""))
+            success = success and not errors
+    finally:
+        logging.disable(logging.NOTSET)
+    
+    print()
+    print("✅ Toutes les vérifications sont passées" if success else "❌ Des vérifications ont échoué")
+    return success
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
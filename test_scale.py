@@ -0,0 +1,127 @@
+"""
+Tests de montée en charge des chemins de synchronisation sur des bibliothèques synthétiques
+
+Chaque profil (voir synthetic_library.SCALE_PROFILES) est généré puis synchronisé vers un
+compte vide hors ligne; le nombre de requêtes et la durée de chaque chemin doivent rester
+sous les bornes attendues, et la destination doit refléter la source.
+    
+    python test_scale.py --profiles small,medium
+"""
+
+import argparse
+import logging
+import math
+import sys
+import tempfile
+from typing import Dict, List
+
+from benchmark import BenchmarkSyncManager, measure
+from fake_spotify import FakeSpotify
+from synthetic_library import SCALE_PROFILES, describe_library, generate_profile, library_to_fake
+
+# Durée maximale de chaque chemin par profil (secondes, mesure tracemalloc comprise)
+MAX_SECONDS = {'small': 10, 'medium': 60, 'large': 600}
+
+def liked_requests_bound(library: Dict) -> int:
+    """Requêtes attendues au plus pour une première synchronisation des likes"""
+    liked = len(library['liked'])
+    unavailable = len(set(library['unavailable']) & set(library['liked']))
+    pages = math.ceil(liked / 50)
+    # Pages source + sonde de la destination + un like par titre jouable + vérification par lots de 50
+    return pages + 1 + (liked - unavailable) + pages + 2
+
+def playlists_requests_bound(library: Dict) -> int:
+    """Requêtes attendues au plus pour une première copie des playlists"""
+    bound = math.ceil(len(library['playlists']) / 50) + 3
+    for playlist in library['playlists']:
+        size = len(playlist['tracks'])
+        # Lecture par pages de 100, création, vérification par lots de 50, ajout par lots de 100
+        bound += 2 * math.ceil(size / 100) + math.ceil(size / 50) + 1
+    return bound
+
+def resync_requests_bound(library: Dict) -> int:
+    """Requêtes attendues au plus pour un cycle sans changement (lecture de la source seulement)"""
+    return math.ceil(len(library['liked']) / 50) + math.ceil(len(library['playlists']) / 50) + 5
+
+def check_target(library: Dict, target: FakeSpotify, copy_suffix: str) -> List[str]:
+    """Vérifie que la destination reflète la source (titres injouables exclus)"""
+    errors = []
+    unavailable = set(library['unavailable'])
+    
+    expected_liked = [track_id for track_id in sorted(library['liked'], key=library['liked'].get)
+                      if track_id not in unavailable]
+    if list(reversed(target.get_liked_order())) != expected_liked:
+        errors.append("likes de la destination différents de la source ou dans le désordre")
+    
+    copies = {playlist['name']: playlist['tracks'] for playlist in target.playlists.values()}
+    different = [playlist['name'] for playlist in library['playlists']
+                 if copies.get(playlist['name'] + copy_suffix) != [track_id for track_id in playlist['tracks']
+                                                                   if track_id not in unavailable]]
+    if different:
+        errors.append(f"{len(different)} copies de playlists différentes de la source ({', '.join(different[:3])}...)")
+    
+    return errors
+
+def run_profile(profile: str, seed: int = 42) -> List[Dict]:
+    """Synchronise un profil vers un compte vide et contrôle les bornes de chaque chemin"""
+    library = generate_profile('scale-source', profile, seed=seed)
+    source = library_to_fake(library)
+    # Les titres injouables le sont sur le marché de la destination
+    target = FakeSpotify('scale-target', unavailable=library['unavailable'])
+    size = len(library['liked'])
+    playlist_items = describe_library(library)['playlist_items']
+    
+    with tempfile.TemporaryDirectory(prefix='spotify-sync-scale-') as workdir:
+        manager = BenchmarkSyncManager(source, target, workdir)
+        results = [
+            dict(measure('sync_liked_songs', size, size, manager.sync_liked_songs, source, target, manager),
+                 max_requests=liked_requests_bound(library)),
+            dict(measure('sync_playlists', size, playlist_items, manager.sync_playlists, source, target, manager),
+                 max_requests=playlists_requests_bound(library)),
+            dict(measure('resync', size, size + playlist_items, manager.full_sync, source, target, manager),
+                 max_requests=resync_requests_bound(library))
+        ]
+    
+    target_errors = check_target(library, target, manager.config['playlist_settings']['create_copy_suffix'])
+    for result in results:
+        result['profile'] = profile
+        result['max_seconds'] = MAX_SECONDS.get(profile, MAX_SECONDS['large'])
+        result['errors'] = []
+        if result['requests'] > result['max_requests']:
+            result['errors'].append(f"{result['requests']} requêtes (borne {result['max_requests']})")
+        if result['wall_seconds'] > result['max_seconds']:
+            result['errors'].append(f"{result['wall_seconds']} s (borne {result['max_seconds']} s)")
+    results[-1]['errors'] += target_errors
+    
+    return results
+
+def main(profiles: List[str], seed: int) -> bool:
+    """Exécute les profils demandés et affiche les résultats; retourne False si une borne est dépassée"""
+    print("=== TESTS DE MONTÉE EN CHARGE ===\n")
+    logging.disable(logging.CRITICAL)
+    
+    success = True
+    try:
+        for profile in profiles:
+            print(f"Profil {profile}: {describe_library(generate_profile('scale-source', profile, seed=seed))}")
+            for result in run_profile(profile, seed):
+                status = "✅" if not result['errors'] else "❌"
+                print(f"   {status} {result['benchmark']:<18} {result['wall_seconds']:>8.2f}s "
+                      f"{result['requests']:>7} req. (borne {result['max_requests']})"
+                      + (f" - {'; '.join(result['errors'])}" if result['errors'] else ""))
+                success = success and not result['errors']
+            print()
+    finally:
+        logging.disable(logging.NOTSET)
+    
+    print("✅ Toutes les bornes sont respectées" if success else "❌ Des bornes sont dépassées")
+    return success
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tests de montée en charge sur des bibliothèques synthétiques")
+    parser.add_argument('--profiles', default='small,medium',
+                        help=f"Profils à exécuter, séparés par des virgules ({', '.join(SCALE_PROFILES)})")
+    parser.add_argument('--seed', type=int, default=42, help="Graine des bibliothèques générées")
+    args = parser.parse_args()
+    
+    sys.exit(0 if main([profile.strip() for profile in args.profiles.split(',') if profile.strip()], args.seed) else 1)
@@ -114,7 +114,12 @@ class ConfigManager:
                 "sync_playlists": True,
                 "sync_interval_minutes": 30,
                 "max_tracks_per_sync": 1000,
-                "batch_size": 50
+                "batch_size": 50,
+                "preflight_check": True,
+                "concurrent_phases": False,
+                "sync_saved_albums": False,
+                "sync_followed_artists": False,
+                "sync_saved_shows": False
             },
             "playlist_settings": {
                 "excluded_playlists": [
@@ -128,8 +133,10 @@ class ConfigManager:
                     "Daily Mix 6"
                 ],
                 "create_copy_suffix": " (Sync)",
+                "mapping_file": ".playlist_mapping.json",
                 "preserve_playlist_order": True,
                 "sync_collaborative_playlists": False,
+                "follow_non_owned_playlists": False,
                 "update_existing_playlists": True
             },
             "authentication": {
@@ -145,8 +152,50 @@ class ConfigManager:
             },
             "rate_limiting": {
                 "requests_per_second": 10,
-                "retry_attempts": 3,
-                "retry_delay_seconds": 1
+                "retry_attempts": 5,
+                "retry_base_delay_seconds": 1,
+                "retry_max_delay_seconds": 60,
+                "circuit_breaker_threshold": 5,
+                "circuit_breaker_reset_seconds": 60
+            },
+            "adaptive_control": {
+                "enabled": True,
+                "latency_target_seconds": 2.0,
+                "max_concurrency": 4
+            },
+            "verification": {
+                "liked_samples": 5,
+                "playlist_samples": 5,
+                "confidence": 0.95
+            },
+            "rollback": {
+                "snapshot_before_sync": False,
+                "directory": "snapshots",
+                "keep_snapshots": 10
+            },
+            "quota": {
+                "file": ".api_quota.json",
+                "daily_request_budget": None,
+                "headroom_requests": 500
+            },
+            "trigger_settings": {
+                "enabled": False,
+                "host": "127.0.0.1",
+                "port": 8765,
+                "debounce_seconds": 5,
+                "token": None
+            },
+            "tracing": {
+                "enabled": False,
+                "file": "api_trace.jsonl",
+                "flush_interval_seconds": 1.0
+            },
+            "fanout_settings": {
+                "targets": ["target"],
+                "max_workers": 4
+            },
+            "merge_settings": {
+                "sources": ["source"]
             }
         }
         